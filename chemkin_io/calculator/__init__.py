@@ -2,13 +2,21 @@
 calculates derived quantities from the strings of the species
 """
 
+from chemkin_io.calculator import kernel
+from chemkin_io.calculator import ktp
+from chemkin_io.calculator import records
 from chemkin_io.calculator import rates
+from chemkin_io.calculator import sensitivity
 from chemkin_io.calculator import thermo
 from chemkin_io.calculator import combine
 
 
 __all__ = [
+    'kernel',
+    'ktp',
+    'records',
     'rates',
+    'sensitivity',
     'thermo',
     'combine'
 ]
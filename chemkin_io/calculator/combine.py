@@ -2,15 +2,26 @@
   Take data dictionaries from mechanisms and combine them under a common index
 """
 
-import itertools
+import warnings
+import functools
+import collections
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-import ratefit
-from ioformat import remove_whitespace
 from ioformat import phycon
 from chemkin_io.parser import mechanism as mech_parser
+from chemkin_io.parser import cache
 from chemkin_io.calculator import thermo
 from chemkin_io.calculator import rates
-from chemkin_io.parser.mechanism import reaction_units
+from chemkin_io.calculator import ktp
+
+
+StoichiometryMatrix = collections.namedtuple(
+    'StoichiometryMatrix', ('species', 'rows', 'cols', 'values', 'nrxn'))
+RatesComparison = collections.namedtuple(
+    'RatesComparison',
+    ('values', 'mechanisms', 'reactions', 'pressures', 'temps'))
+ThermoComparison = collections.namedtuple(
+    'ThermoComparison', ('values', 'mechanisms', 'species'))
 
 
 def mechanism_thermo(mech1_thermo_dct, mech2_thermo_dct):
@@ -70,31 +81,37 @@ def mechanism_rates(mech1_ktp_dct, mech2_ktp_dct, temps,
 
     total_ktp_dct = {}
 
-    print('\nFinding Reaction Matches to Combine Dictionaries')
+    # Check what (if/any) combination of mech2 matches with mech1
+    mech2_idx = reaction_index(mech2_ktp_dct)
+    matches = {mech1_name: _assess_reaction_match(
+                   mech1_name, mech2_ktp_dct, mech2_idx=mech2_idx)
+               for mech1_name in mech1_ktp_dct}
+
+    # Reverse all of the reactions matched in the reverse direction at once
+    rev_rxns = [mech2_name_match
+                for mech2_name_match, reverse_rxn in matches.values()
+                if mech2_name_match and reverse_rxn]
+    if rev_rxns and not ignore_reverse:
+        assert mech2_thermo_dct is not None
+        rev_ktp_dct = reverse_rates(
+            mech2_ktp_dct, mech2_thermo_dct, temps, rxns=rev_rxns).to_dct()
+    else:
+        rev_ktp_dct = {}
+
     # Build full rates dictionary with common index
     # First loop through mech1: add common and mech1-unique species
     for mech1_name, mech1_ktp in mech1_ktp_dct.items():
 
-        print('---------')
-        print('- M1 RCTS', '+'.join(mech1_name[0]))
-        print('- M1 PRDS', '+'.join(mech1_name[1]))
-        # Check what (if/any) combination of mech2 matches with mech1
-        mech2_name_match, reverse_rates = _assess_reaction_match(
-            mech1_name, mech2_ktp_dct)
+        mech2_name_match, reverse_rxn = matches[mech1_name]
 
         # Calculate reaction rates, reverse if needed
         if mech2_name_match:
-            if not reverse_rates:
-                print('\n - Match in forward direction')
+            if not reverse_rxn:
                 mech2_ktp = mech2_ktp_dct[mech2_name_match]
                 # mech2_ktp = mech2_ktp_dct[mech1_name]
             else:
                 if not ignore_reverse:
-                    print('\n - Match in reverse direction, rev k(T) w/ therm')
-                    assert mech2_thermo_dct is not None
-                    mech2_ktp = _reverse_reaction_rates(
-                        mech2_ktp_dct, mech2_thermo_dct,
-                        mech2_name_match, temps)
+                    mech2_ktp = rev_ktp_dct[mech2_name_match]
                 else:
                     continue
         else:
@@ -115,8 +132,193 @@ def mechanism_rates(mech1_ktp_dct, mech2_ktp_dct, temps,
     return total_ktp_dct
 
 
+# Functions to combine any number of mechanisms
+def combine_rates(mech_ktp_dcts, temps, pressures=None, mech_thermo_dcts=None,
+                  ignore_reverse=False):
+    """ Combines the rate constants of any number of mechanisms under one
+        canonical index of reactions, into one (nmech, nrxn, npres, ntemps)
+        array. The ratio of the rate constants of any two mechanisms is
+        then a slice of the array, e.g. values[0] / values[1].
+
+        The reactions are matched by their direction-independent keys, and
+        are written in the direction of the first mechanism that has them.
+        Reactions that a mechanism has in the other direction are reversed
+        with its thermochemistry; without it (or with ignore_reverse),
+        they are NaN, as are the reactions a mechanism does not have.
+
+        :param mech_ktp_dcts: rate constants of each mechanism, labelled by
+            the names of the mechanisms (default: 'mech1', 'mech2', ...)
+        :type mech_ktp_dcts: dict[mech: dict[reaction: dict[pressure: ktps]]]
+            or list (each entry can also be a KTPTensor)
+        :param temps: Temperatures the k(T,P) values were calculated for (K)
+        :type temps: list(float)
+        :param pressures: pressures of the array (default: all pressures of
+            the mechanisms, in the order they are found)
+        :type pressures: list(float or str)
+        :param mech_thermo_dcts: thermo dicts of the mechanisms (or None),
+            in the same order; to reverse rxns
+        :type mech_thermo_dcts: list(dict[spc: [[H(t)], [Cp(T)], [S(T)],
+            [G(T)]]])
+        :param ignore_reverse: don't include any reverse reactions
+        :type ignore_reverse: bool
+        :rtype: RatesComparison
+    """
+
+    mechs, mech_ktp_dcts = _labelled(mech_ktp_dcts)
+    if mech_thermo_dcts is None:
+        mech_thermo_dcts = [None] * len(mechs)
+    mech_tensors = [
+        ktp_dct if isinstance(ktp_dct, ktp.KTPTensor)
+        else ktp.KTPTensor.from_dct(ktp_dct, temps=temps)
+        for ktp_dct in mech_ktp_dcts]
+
+    if pressures is None:
+        pressures = list(dict.fromkeys(
+            pressure for mech_tensor in mech_tensors
+            for pressure in mech_tensor.pressures))
+
+    # Canonical index: all reactions of the first mechanism, then the
+    # reactions of each other mechanism that none of the previous ones have
+    rxns, keys = [], set()
+    for mech_tensor in mech_tensors:
+        new_rxns = [rxn for rxn in mech_tensor.reactions
+                    if reaction_key(rxn) not in keys]
+        rxns.extend(new_rxns)
+        keys.update(map(reaction_key, new_rxns))
+
+    temps = np.asarray(temps, dtype=float)
+    values = np.full(
+        (len(mechs), len(rxns), len(pressures), len(temps)), np.nan)
+    for mech_idx, (mech_tensor, thermo_dct) in enumerate(
+            zip(mech_tensors, mech_thermo_dcts)):
+
+        # Matches of the canonical reactions, in the same direction or not
+        mech_key_idx = reaction_index(mech_tensor.reactions)
+        fwd_rxns, fwd_idxs, rev_rxns, rev_idxs = [], [], [], []
+        for idx, rxn in enumerate(rxns):
+            if rxn in mech_tensor.reaction_index:
+                fwd_rxns.append(rxn)
+                fwd_idxs.append(idx)
+                continue
+            mech_rxn, flip_rxn = _assess_reaction_match(
+                rxn, mech_tensor.reaction_index, mech_key_idx)
+            if flip_rxn is False:
+                fwd_rxns.append(mech_rxn)
+                fwd_idxs.append(idx)
+            elif flip_rxn:
+                rev_rxns.append(mech_rxn)
+                rev_idxs.append(idx)
+
+        # Only the pressures of the mechanism are filled in
+        pres_idxs = [idx for idx, pressure in enumerate(pressures)
+                     if pressure in mech_tensor.pressure_index]
+        mech_pressures = [pressures[idx] for idx in pres_idxs]
+
+        values[mech_idx, np.array(fwd_idxs, dtype=int)[:, None],
+               pres_idxs] = mech_tensor.sel(
+                   reactions=fwd_rxns, pressures=mech_pressures).values
+        if rev_rxns and not ignore_reverse and thermo_dct is not None:
+            rev_tensor = reverse_rates(
+                mech_tensor.sel(pressures=mech_pressures), thermo_dct,
+                temps, rxns=rev_rxns)
+            values[mech_idx, np.array(rev_idxs, dtype=int)[:, None],
+                   pres_idxs] = rev_tensor.values
+
+    return RatesComparison(
+        values=values, mechanisms=tuple(mechs),
+        reactions=tuple(rxns), pressures=tuple(pressures),
+        temps=temps)
+
+
+def combine_thermo(mech_thermo_dcts):
+    """ Combines the thermochemistry of any number of mechanisms under one
+        index of species, into one (nmech, nspc, 4, ntemps) array of
+        H(T), Cp(T), S(T) and G(T). Species that a mechanism does not
+        have are NaN.
+
+        :param mech_thermo_dcts: thermo dicts of each mechanism, labelled
+            by the names of the mechanisms (default: 'mech1', 'mech2', ...)
+        :type mech_thermo_dcts: dict[mech: dict[spc: [[H(t)], [Cp(T)],
+            [S(T)], [G(T)]]]] or list
+        :rtype: ThermoComparison
+    """
+
+    mechs, mech_thermo_dcts = _labelled(mech_thermo_dcts)
+    mech_thermo_dcts = [thermo_dct if thermo_dct is not None else {}
+                        for thermo_dct in mech_thermo_dcts]
+    spc_idxs = {}
+    for thermo_dct in mech_thermo_dcts:
+        for name in thermo_dct:
+            spc_idxs.setdefault(name, len(spc_idxs))
+
+    ntemps = next((len(thm_vals[0]) for thermo_dct in mech_thermo_dcts
+                   for thm_vals in thermo_dct.values()), 0)
+    values = np.full((len(mechs), len(spc_idxs), 4, ntemps), np.nan)
+    for mech_idx, thermo_dct in enumerate(mech_thermo_dcts):
+        if thermo_dct:
+            values[mech_idx, [spc_idxs[name] for name in thermo_dct]] = list(
+                thermo_dct.values())
+
+    return ThermoComparison(
+        values=values, mechanisms=tuple(mechs), species=tuple(spc_idxs))
+
+
+def build_comparison(mech_strs, t_ref, temps, pressures,
+                     ignore_reverse=False, remove_bad_fits=False,
+                     cache_dir=None):
+    """ Parses and evaluates each of any number of mechanisms only once,
+        and combines their rate constants and thermochemistry under
+        common indices of the reactions and species.
+
+        :param mech_strs: strings of the mechanism input files, labelled by
+            the names of the mechanisms (default: 'mech1', 'mech2', ...)
+        :type mech_strs: dict[mech: str] or list(str)
+        :param t_ref: Reference temperature (K)
+        :type t_ref: float
+        :param temps: List of Temperatures (K)
+        :type temps: numpy.ndarray
+        :param pressures: Pressures used to calculate k(T,P)s
+        :type pressures: list(float)
+        :param ignore_reverse: don't include any reverse reactions
+        :type ignore_reverse: bool
+        :param cache_dir: directory of the parser cache; no caching if None
+        :type cache_dir: str
+        :rtype: (RatesComparison, ThermoComparison)
+    """
+
+    mechs, mech_strs = _labelled(mech_strs)
+    mech_tensors, mech_thermo_dcts = [], []
+    for mech_str in mech_strs:
+        rxn_dct, units = cache.reaction_data(
+            mech_str, remove_bad_fits=remove_bad_fits, cache_dir=cache_dir)
+        mech_tensors.append(rates.mechanism_tensor(
+            rxn_dct, units, t_ref, temps, pressures))
+        thm_tbl = cache.thermo_data(mech_str, cache_dir=cache_dir)
+        mech_thermo_dcts.append(
+            thermo.mechanism_from_table(thm_tbl, temps)
+            if thm_tbl is not None else {})
+
+    rate_cmp = combine_rates(
+        dict(zip(mechs, mech_tensors)), temps, pressures=pressures,
+        mech_thermo_dcts=mech_thermo_dcts, ignore_reverse=ignore_reverse)
+    thermo_cmp = combine_thermo(dict(zip(mechs, mech_thermo_dcts)))
+
+    return rate_cmp, thermo_cmp
+
+
+def _labelled(mech_objs):
+    """ Names of the mechanisms and their objects, from a dictionary or
+        from a list (named 'mech1', 'mech2', ...).
+    """
+    if not isinstance(mech_objs, dict):
+        mech_objs = {f'mech{idx+1}': obj
+                     for idx, obj in enumerate(mech_objs)}
+    return list(mech_objs), list(mech_objs.values())
+
+
 # Thermo functions
-def build_thermo_name_dcts(mech1_str, mech2_str, temps):
+def build_thermo_name_dcts(mech1_str, mech2_str, temps, cache_dir=None,
+                           executor=None, workers=None):
     """ Builds the thermo dictionaries indexed by names.
 
         :param mech1_str: string of mechanism 1 input file
@@ -125,48 +327,60 @@ def build_thermo_name_dcts(mech1_str, mech2_str, temps):
         :type mech2_str: str
         :param temps: Temperatures to calculate thermochemistry (K)
         :type temps: list(float)
-        :return: mech1_thermo_dct
-        :rtype: dict[name: [thermo]]
-        :return: mech2_thermo_dct
-        :rtype: dict[name: [thermo]]
+        :param cache_dir: directory of the parser cache; no caching if None
+        :type cache_dir: str
+        :param executor: executor used to parse the mechanisms concurrently
+        :type executor: concurrent.futures.Executor
+        :param workers: number of processes used to parse the mechanisms
+            concurrently, if no executor is given
+        :type workers: int
+        :return: mech1_thermo_dct, evaluated when a species is accessed
+        :rtype: chemkin_io.calculator.thermo.ThermoTable
+        :return: mech2_thermo_dct, evaluated when a species is accessed
+        :rtype: chemkin_io.calculator.thermo.ThermoTable
     """
 
-    mech1_thermo_block = mech_parser.thermo_block(mech1_str)
-    if mech1_thermo_block is not None:
-        mech1_thermo_block = remove_whitespace(
-            mech1_thermo_block)
-        mech1_thermo_dct = thermo.mechanism(
-            mech1_thermo_block, temps)
-    else:
-        mech1_thermo_dct = None
-
-    mech2_thermo_block = mech_parser.thermo_block(mech2_str)
-    if mech2_thermo_block is not None:
-        mech2_thermo_block = remove_whitespace(
-            mech2_thermo_block)
-        mech2_thermo_dct = thermo.mechanism(
-            mech2_thermo_block, temps)
-    else:
-        mech2_thermo_dct = None
+    mech1_thermo_dct, mech2_thermo_dct = _map_mechanisms(
+        functools.partial(_thermo_name_dct, temps=temps, cache_dir=cache_dir),
+        [(mech1_str,), (mech2_str,)], executor=executor, workers=workers)
 
     return mech1_thermo_dct, mech2_thermo_dct
 
 
+def _thermo_name_dct(mech_str, temps, cache_dir=None):
+    """ thermo dictionary of a mechanism, from the cached thermo block
+    """
+    thm_tbl = cache.thermo_data(mech_str, cache_dir=cache_dir)
+    if thm_tbl is not None:
+        thermo_dct = thermo.ThermoTable(thm_tbl, temps)
+    else:
+        thermo_dct = None
+    return thermo_dct
+
+
 def build_thermo_inchi_dcts(mech1_str, mech2_str,
-                            mech1_csv_str, mech2_csv_str,
-                            temps):
+                            mech1_spc_tbl, mech2_spc_tbl,
+                            temps, cache_dir=None, executor=None,
+                            workers=None):
     """ Builds the thermo dictionaries indexed by InChI strings.
 
         :param mech1_str: string of mechanism 1 input file
         :type mech1_str: str
         :param mech2_str: string of mechanism 2 input file
         :type mech2_str: str
-        :param mech1_csv_str: species.csv file string for mechanism 1
-        :type mech1_csv_str: str
-        :param mech2_csv_str: species.csv file string for mechanism 2
-        :type mech2_csv_str: str
+        :param mech1_spc_tbl: species of mechanism 1 (or species.csv string)
+        :type mech1_spc_tbl: chemkin_io.parser.mechanism.SpeciesTable
+        :param mech2_spc_tbl: species of mechanism 2 (or species.csv string)
+        :type mech2_spc_tbl: chemkin_io.parser.mechanism.SpeciesTable
         :param temps: Temperatures to calculate thermochemistry (K)
         :type temps: list(float)
+        :param cache_dir: directory of the parser cache; no caching if None
+        :type cache_dir: str
+        :param executor: executor used to parse the mechanisms concurrently
+        :type executor: concurrent.futures.Executor
+        :param workers: number of processes used to parse the mechanisms
+            concurrently, if no executor is given
+        :type workers: int
         :return: mech1_thermo_dct
         :rtype: dict[name: [thermo]]
         :return: mech2_thermo_dct
@@ -175,14 +389,15 @@ def build_thermo_inchi_dcts(mech1_str, mech2_str,
 
     # Get dicts: dict[name] = thm_dstr
     mech1_thermo_dct, mech2_thermo_dct = build_thermo_name_dcts(
-        mech1_str, mech2_str, temps)
+        mech1_str, mech2_str, temps, cache_dir=cache_dir,
+        executor=executor, workers=workers)
 
     # Build the inchi dicts where:
     # Get dicts: dict[name] = inchi
     # Convert name dict to get: dict[inchi] = name
     if mech1_thermo_dct is not None:
-        mech1_name_inchi_dct = mech_parser.spc_name_dct(
-            mech1_csv_str, 'inchi')
+        mech1_name_inchi_dct = species_table(
+            mech1_spc_tbl, cache_dir=cache_dir).name_dct('inchi')
         mech1_thermo_ich_dct = {}
         for name, data in mech1_thermo_dct.items():
             ich = mech1_name_inchi_dct[name]
@@ -191,8 +406,8 @@ def build_thermo_inchi_dcts(mech1_str, mech2_str,
         mech1_thermo_ich_dct = None
 
     if mech2_thermo_dct is not None:
-        mech2_name_inchi_dct = mech_parser.spc_name_dct(
-            mech2_csv_str, 'inchi')
+        mech2_name_inchi_dct = species_table(
+            mech2_spc_tbl, cache_dir=cache_dir).name_dct('inchi')
         mech2_thermo_ich_dct = {}
         for name, data in mech2_thermo_dct.items():
             ich = mech2_name_inchi_dct[name]
@@ -203,155 +418,233 @@ def build_thermo_inchi_dcts(mech1_str, mech2_str,
     return mech1_thermo_ich_dct, mech2_thermo_ich_dct
 
 
-def spc_name_from_inchi(mech1_csv_str, mech2_csv_str, ich):
+def spc_name_from_inchi(mech1_spc_tbl, mech2_spc_tbl, ich):
     """ uses dict[inchi]=name dicts to get
         the mechanism name for a given InChI string
-    """
 
-    mech1_inchi_dct = mech_parser.spc_inchi_dct(mech1_csv_str)
-    mech2_inchi_dct = mech_parser.spc_inchi_dct(mech2_csv_str)
+        :param mech1_spc_tbl: species of mechanism 1 (or species.csv string)
+        :type mech1_spc_tbl: chemkin_io.parser.mechanism.SpeciesTable
+        :param mech2_spc_tbl: species of mechanism 2 (or species.csv string)
+        :type mech2_spc_tbl: chemkin_io.parser.mechanism.SpeciesTable
+        :param ich: InChI string of the species
+        :type ich: str
+        :return: name in mechanism 1, else in mechanism 2 (None if absent)
+        :rtype: str
+    """
 
-    mech_name = mech1_inchi_dct.get(ich)
-    if mech_name is not None:
-        mech_name = mech2_inchi_dct.get(ich)
+    mech_name = species_table(mech1_spc_tbl).entry_dct('inchi').get(ich)
+    if mech_name is None:
+        mech_name = species_table(mech2_spc_tbl).entry_dct('inchi').get(ich)
 
     return mech_name
 
 
+def species_table(spc_tbl, cache_dir=None):
+    """ Gets the table of the species of a mechanism, reading the
+        species.csv file string (only once, if a cache is used) if the
+        table is not built yet.
+
+        :param spc_tbl: species table or species.csv file string
+        :type spc_tbl: chemkin_io.parser.mechanism.SpeciesTable or str
+        :param cache_dir: directory of the parser cache; no caching if None
+        :type cache_dir: str
+        :rtype: chemkin_io.parser.mechanism.SpeciesTable
+    """
+
+    if not isinstance(spc_tbl, mech_parser.SpeciesTable):
+        spc_tbl = cache.species_table(spc_tbl, cache_dir=cache_dir)
+
+    return spc_tbl
+
+
 # Rate functions
-def _assess_reaction_match(mech1_names, mech2_dct):
+def reaction_key(rxn):
+    """ Builds a key for a reaction that does not depend on the order of
+        its reactants and products nor on its direction: the sorted
+        multisets of the names of both sides, in sorted order.
+
+        :param rxn: reactant-product pair for the reaction
+        :type rxn: tuple(tuple(str), tuple(str))
+        :rtype: tuple(tuple(str), tuple(str))
+    """
+    rcts, prds = tuple(sorted(rxn[0])), tuple(sorted(rxn[1]))
+    return min((rcts, prds), (prds, rcts))
+
+
+def reaction_index(rxns):
+    """ Builds an index of the reactions of a mechanism by their
+        direction-independent keys. If several reactions have the same
+        key, the first one is kept.
+
+        :param rxns: reactant-product pairs of the reactions
+        :type rxns: list(tuple(tuple(str), tuple(str)))
+        :rtype: dict[key: reaction]
+    """
+
+    rxn_idx = {}
+    for rxn in rxns:
+        rxn_idx.setdefault(reaction_key(rxn), rxn)
+
+    return rxn_idx
+
+
+def _assess_reaction_match(mech1_names, mech2_dct, mech2_idx=None):
     """ assess whether the reaction should be flipped
+
+        :param mech1_names: reactant-product pair for the mech1 reaction
+        :type mech1_names: tuple(tuple(str), tuple(str))
+        :param mech2_dct: dictionary of the reactions of mechanism 2
+        :type mech2_dct: dict[reaction: value]
+        :param mech2_idx: index of mech2 built by reaction_index (it is
+            built here if it is not given)
+        :type mech2_idx: dict[key: reaction]
+        :return: matching reaction of mech2 (empty if none), and whether
+            it is written in the reverse direction (None if no match)
+        :rtype: (tuple(tuple(str), tuple(str)), bool)
     """
 
-    # Get all possible orderings of the reactants and products for mech1
-    [mech1_rcts, mech1_prds] = mech1_names
-    mech1_rct_perm = list(itertools.permutations(mech1_rcts, len(mech1_rcts)))
-    mech1_prd_perm = list(itertools.permutations(mech1_prds, len(mech1_prds)))
-    # print('\n\nTEST')
-    # print('m1_rct_perm', mech1_rct_perm)
-    # print('m1_prd_perm', mech1_prd_perm)
-
-    mech2_key = ()
-    flip_rxn = None
-    for rxn in mech2_dct:
-        [mech2_rcts, mech2_prds] = rxn
-        # print('m2', mech2_rcts, mech2_prds)
-        if mech2_rcts in mech1_rct_perm and mech2_prds in mech1_prd_perm:
-            flip_rxn = False
-            mech2_key = rxn
-            break
-        if mech2_rcts in mech1_prd_perm and mech2_prds in mech1_rct_perm:
-            mech2_key = rxn
-            flip_rxn = True
-            break
+    if mech2_idx is None:
+        mech2_idx = reaction_index(mech2_dct)
 
+    mech2_key = mech2_idx.get(reaction_key(mech1_names), ())
     if mech2_key:
-        print('\n- M2 RCTS', '+'.join(mech2_key[0]))
-        print('- M2 PRDS', '+'.join(mech2_key[1]))
+        flip_rxn = sorted(mech2_key[0]) != sorted(mech1_names[0])
     else:
-        print('\n- NO M2 MATCH')
+        flip_rxn = None
 
     return mech2_key, flip_rxn
 
 
-def _reverse_reaction_rates(mech_dct, thermo_dct, rxn, temps):
-    """ For a given reaction, use the thermochemistry values of its
-        constituent species to calculate the equilibrium constant
-        and reverse the rate constants.
+def reverse_rates(mech_ktp_dct, thermo_dct, temps, rxns=None):
+    """ Uses the thermochemistry of the species to calculate the reverse
+        rate constants of many reactions at once, k_rev = k / Kc.
 
-        :param mech_dct:
-        :type mech_dct: dict[pressure: rates]
+        The Gibbs energies of all reactions are obtained as the product
+        of a sparse stoichiometric matrix and the Gibbs energies of the
+        species, and the equilibrium constants in concentration units
+        are Kc = Kp * (P/RT)^dn, with P = 1 atm and dn the change in the
+        number of moles of the reaction.
+
+        :param mech_ktp_dct: rate constants of the mechanism
+        :type mech_ktp_dct: dict[reaction: dict[pressure: k(T,P)s]] or
+            chemkin_io.calculator.ktp.KTPTensor
         :param thermo_dct: thermochemical values of all species in mechanism
         :type thermo_dct: dict[spc name: [thermo vals]]
-        :param rxn: reactant-product pair for the reaction
-        :type rxn: tuple(tuple(str), tuple(str))
-        :return: rev_ktp_dct: reversed rates of the reaction
-        :rtype: dict[pressure: reversed rates]
+        :param temps: Temperatures the k(T,P) values were calculated for (K)
+        :type temps: list(float)
+        :param rxns: reactions to reverse (all of them if None)
+        :type rxns: list(tuple(tuple(str), tuple(str)))
+        :return: reverse rate constants, labelled by the forward reactions
+            (NaN for reactions with species that have no thermochemistry)
+        :rtype: chemkin_io.calculator.ktp.KTPTensor
     """
 
-    [rct_idxs, prd_idxs] = rxn
-    k_equils = _calculate_equilibrium_constant(
-        thermo_dct, rct_idxs, prd_idxs, temps)
-
-    ktp_dct = mech_dct[rxn]
-    rev_ktp_dct = {}
-    for pressure, rate_ks in ktp_dct.items():
-
-        # Calculate density to handle units, if needed
-        if len(rct_idxs) > 1 and len(prd_idxs) == 1:
-            densities = ratefit.calc.p_to_m(1.0, temps)
-            rate_ks *= densities
-            # print('flip1')
-        elif len(rct_idxs) == 1 and len(prd_idxs) > 1:
-            densities = ratefit.calc.p_to_m(1.0, temps)
-            rate_ks /= densities
-            # print('flip2')
-
-        # Calculate the reverse rates with K_equil
-        rev_rates = []
-        for forw_k, k_equil in zip(rate_ks, k_equils):
-            rev_rates.append(forw_k / k_equil)
+    if isinstance(mech_ktp_dct, ktp.KTPTensor):
+        mech_tensor = mech_ktp_dct
+        if rxns is not None:
+            mech_tensor = mech_tensor.sel(reactions=rxns)
+    else:
+        if rxns is not None:
+            mech_ktp_dct = {rxn: mech_ktp_dct[rxn] for rxn in rxns}
+        mech_tensor = ktp.KTPTensor.from_dct(mech_ktp_dct, temps=temps)
 
-        # Add reversed rates to dict
-        rev_ktp_dct[pressure] = rev_rates
+    k_equils = equilibrium_constants(
+        mech_tensor.reactions, thermo_dct, mech_tensor.temps)
 
-    return rev_ktp_dct
+    return ktp.KTPTensor(
+        mech_tensor.values / k_equils[:, np.newaxis, :],
+        mech_tensor.reactions, mech_tensor.pressures, mech_tensor.temps)
 
 
-def _calculate_equilibrium_constant(thermo_dct, rct_idxs, prd_idxs, temps):
-    """ Calculate the equilibrium constant for a given reaction at
-        a set of temperatures using constiutent species' thermochemistry.
+def equilibrium_constants(rxns, thermo_dct, temps):
+    """ Calculates the equilibrium constants in concentration units [Kc]
+        of many reactions at a set of temperatures using the
+        thermochemistry of their species.
 
+        :param rxns: reactant-product pairs of the reactions
+        :type rxns: list(tuple(tuple(str), tuple(str)))
         :param thermo_dct: thermochemical values of all species in mechanism
         :type thermo_dct: dict[spc name: [thermo vals]]
-        :param rct_idxs: name(s) of the reactants
-        :type rct_idxs: tuple(str)
-        :param prd_idxs: name(s) of the products
-        :type prd_idxs: tuple(str)
         :param temps: Temperatures to calculate thermochemistry (K)
         :type temps: list(float)
-        :return: equilibrium constants
-        :rtype: numpy.ndarray
+        :return: equilibrium constants (NaN if any species has no thermo)
+        :rtype: numpy.ndarray (nrxn, ntemps)
     """
 
-    k_equils = []
-    for temp_idx, temp in enumerate(temps):
-        rct_gibbs = 0.0
-        for rct in rct_idxs:
-            rct_gibbs += _grab_gibbs(thermo_dct[rct], temp_idx)
-            # print('idv rct g', _grab_gibbs(thermo_dct[rct], temp_idx))
-        prd_gibbs = 0.0
-        for prd in prd_idxs:
-            prd_gibbs += _grab_gibbs(thermo_dct[prd], temp_idx)
-            # print('idv prd g', _grab_gibbs(thermo_dct[prd], temp_idx))
+    temps = np.asarray(temps, dtype=float)
+    stoich = stoichiometry_matrix(rxns)
+    gibbs = np.array(
+        [thermo_dct[spc][3] if spc in thermo_dct
+         else np.full(len(temps), np.nan)
+         for spc in stoich.species], dtype=float).reshape(-1, len(temps))
 
-        rxn_gibbs = prd_gibbs - rct_gibbs
+    # Gibbs energies and changes in number of moles of the reactions
+    rxn_gibbs = np.zeros((stoich.nrxn, len(temps)))
+    np.add.at(rxn_gibbs, stoich.rows,
+              stoich.values[:, np.newaxis] * gibbs[stoich.cols])
+    mole_changes = np.bincount(
+        stoich.rows, weights=stoich.values, minlength=stoich.nrxn)
 
-        k_equils.append(
-            np.exp(-rxn_gibbs / (phycon.RC * temp)))
-        ktest = np.exp(-rxn_gibbs / (phycon.RC * temp))
+    # Kp from the Gibbs energies, then Kc from the 1 atm concentration
+    k_equils = np.exp(-rxn_gibbs / (phycon.RC * temps))
+    std_concs = 1.0 / (phycon.RC2 * temps)
 
-        print('rct gibbs', rct_gibbs)
-        print('prd gibbs', prd_gibbs)
-        print('rxn gibbs', rxn_gibbs)
-        print('kequil', ktest)
+    return k_equils * std_concs**mole_changes[:, np.newaxis]
 
-    return k_equils
 
+def stoichiometry_matrix(rxns):
+    """ Builds a sparse reaction x species matrix of the stoichiometric
+        coefficients of many reactions (negative for reactants), in
+        coordinate (row, column, value) format.
 
-def _grab_gibbs(thermo_vals, temp_idx):
-    """ calculate the Gibbs Free energy value
+        :param rxns: reactant-product pairs of the reactions
+        :type rxns: list(tuple(tuple(str), tuple(str)))
+        :rtype: StoichiometryMatrix
     """
-    gibbs = thermo_vals[3][temp_idx]
-    return gibbs
+
+    spc_idxs, rows, cols, values = {}, [], [], []
+    for rxn_idx, (rcts, prds) in enumerate(rxns):
+        for names, coeff in ((rcts, -1.0), (prds, 1.0)):
+            for name in names:
+                rows.append(rxn_idx)
+                cols.append(spc_idxs.setdefault(name, len(spc_idxs)))
+                values.append(coeff)
+
+    return StoichiometryMatrix(
+        species=tuple(spc_idxs),
+        rows=np.array(rows, dtype=int), cols=np.array(cols, dtype=int),
+        values=np.array(values, dtype=float), nrxn=len(rxns))
+
+
+def _reverse_reaction_rates(mech_dct, thermo_dct, rxn, temps):
+    """ For a given reaction, use the thermochemistry values of its
+        constituent species to calculate the equilibrium constant
+        and reverse the rate constants.
+
+        :param mech_dct:
+        :type mech_dct: dict[pressure: rates]
+        :param thermo_dct: thermochemical values of all species in mechanism
+        :type thermo_dct: dict[spc name: [thermo vals]]
+        :param rxn: reactant-product pair for the reaction
+        :type rxn: tuple(tuple(str), tuple(str))
+        :return: rev_ktp_dct: reversed rates of the reaction
+        :rtype: dict[pressure: reversed rates]
+    """
+    return reverse_rates(mech_dct, thermo_dct, temps, rxns=[rxn]).to_dct()[rxn]
 
 
 # Functions to build dictionaries
 def build_reaction_name_dcts(mech1_str, mech2_str, t_ref, temps, pressures,
-                             ignore_reverse=True, remove_bad_fits=False):
+                             ignore_reverse=None, remove_bad_fits=False,
+                             cache_dir=None, lazy=False, executor=None,
+                             workers=None):
     """ Parses the strings of two mechanism files and calculates
         rate constants [k(T,P)]s at an input set of temperatures and pressures.
 
+        The two mechanisms are independent, so they can be parsed and
+        evaluated concurrently in separate processes, either by an
+        executor or by a pool of worker processes.
+
         :param mech1_str: string of mechanism 1 input file
         :type mech1_str: str
         :param mech2_str: string of mechanism 2 input file
@@ -360,79 +653,163 @@ def build_reaction_name_dcts(mech1_str, mech2_str, t_ref, temps, pressures,
         :type t_ref: float
         :param temps: List of Temperatures (K)
         :type temps: numpy.ndarray
+        :param ignore_reverse: deprecated and has no effect
+        :type ignore_reverse: bool
+        :param cache_dir: directory of the parser cache; no caching if None
+        :type cache_dir: str
+        :param lazy: only calculate the rate constants of a reaction when
+            it is accessed (returns MechanismRates mappings); the
+            mechanisms are then parsed in this process, so it cannot be
+            combined with an executor or several workers
+        :type lazy: bool
+        :param executor: executor used to evaluate the mechanisms
+            concurrently
+        :type executor: concurrent.futures.Executor
+        :param workers: number of processes used to evaluate the
+            mechanisms concurrently, if no executor is given
+        :type workers: int
         :return mech1_ktp_dct: rate constants for mechanism 1
         :rtype: dict[pressure: rates]
         :return mech2_ktp_dct: rate constants for mechanism 2
         :rtype: dict[pressure: rates]
     """
 
-    mech1_reaction_block = remove_whitespace(
-        mech_parser.reaction_block(mech1_str))
-    mech1_units = reaction_units(mech1_str)
-    mech1_ktp_dct = rates.mechanism(
-        mech1_reaction_block, mech1_units, t_ref, temps, pressures,
-        ignore_reverse=ignore_reverse, remove_bad_fits=remove_bad_fits)
+    if ignore_reverse is not None:
+        warnings.warn('ignore_reverse is deprecated and has no effect',
+                      DeprecationWarning, stacklevel=2)
 
+    if lazy and (executor is not None or (workers or 1) > 1):
+        raise ValueError(
+            'lazy=True cannot be combined with an executor or workers, '
+            'since the rates are only evaluated when they are accessed')
+
+    mech_args = [(mech1_str,)]
     if mech2_str:
-        mech2_reaction_block = remove_whitespace(
-            mech_parser.reaction_block(mech2_str))
-        mech2_units = reaction_units(mech2_str)
-        mech2_ktp_dct = rates.mechanism(
-            mech2_reaction_block, mech2_units, t_ref, temps, pressures,
-            ignore_reverse=ignore_reverse, remove_bad_fits=remove_bad_fits)
-    else:
-        mech2_ktp_dct = {}
+        mech_args.append((mech2_str,))
+
+    ktp_dcts = _map_mechanisms(
+        functools.partial(
+            _reaction_name_dct, t_ref=t_ref, temps=temps,
+            pressures=pressures, remove_bad_fits=remove_bad_fits,
+            cache_dir=cache_dir, lazy=lazy),
+        mech_args, executor=executor, workers=workers)
+    mech1_ktp_dct = ktp_dcts[0]
+    mech2_ktp_dct = ktp_dcts[1] if mech2_str else {}
 
     return mech1_ktp_dct, mech2_ktp_dct
 
 
 def build_reaction_inchi_dcts(mech1_str, mech2_str,
-                              mech1_csv_str, mech2_csv_str,
+                              mech1_spc_tbl, mech2_spc_tbl,
                               t_ref, temps, pressures,
-                              ignore_reverse=True,
-                              remove_bad_fits=False):
+                              ignore_reverse=None,
+                              remove_bad_fits=False,
+                              cache_dir=None, executor=None,
+                              workers=None):
     """ builds new reaction dictionaries indexed by inchis
+
+        :param mech1_spc_tbl: species of mechanism 1 (or species.csv string)
+        :type mech1_spc_tbl: chemkin_io.parser.mechanism.SpeciesTable
+        :param mech2_spc_tbl: species of mechanism 2 (or species.csv string)
+        :type mech2_spc_tbl: chemkin_io.parser.mechanism.SpeciesTable
+        :param ignore_reverse: deprecated and has no effect
+        :type ignore_reverse: bool
+        :param executor: executor used to evaluate the mechanisms (and
+            convert their species) concurrently
+        :type executor: concurrent.futures.Executor
+        :param workers: number of processes used to evaluate the
+            mechanisms concurrently, if no executor is given
+        :type workers: int
+    """
+
+    if ignore_reverse is not None:
+        warnings.warn('ignore_reverse is deprecated and has no effect',
+                      DeprecationWarning, stacklevel=2)
+
+    mech1_reaction_ich_dct, mech2_reaction_ich_dct = _map_mechanisms(
+        functools.partial(
+            _reaction_inchi_dct, t_ref=t_ref, temps=temps,
+            pressures=pressures, remove_bad_fits=remove_bad_fits,
+            cache_dir=cache_dir),
+        [(mech1_str, mech1_spc_tbl), (mech2_str, mech2_spc_tbl)],
+        executor=executor, workers=workers)
+
+    return mech1_reaction_ich_dct, mech2_reaction_ich_dct
+
+
+def _reaction_name_dct(mech_str, t_ref, temps, pressures,
+                       remove_bad_fits=False, cache_dir=None, lazy=False):
+    """ rate constants of a mechanism, from the cached records
+    """
+    rxn_dct, units = cache.reaction_data(
+        mech_str, remove_bad_fits=remove_bad_fits, cache_dir=cache_dir)
+    if lazy:
+        ktp_dct = rates.MechanismRates(
+            rxn_dct, units, t_ref, temps, pressures)
+    else:
+        ktp_dct = rates.mechanism_from_records(
+            rxn_dct, units, t_ref, temps, pressures)
+    return ktp_dct
+
+
+def _reaction_inchi_dct(mech_str, spc_tbl, t_ref, temps, pressures,
+                        remove_bad_fits=False, cache_dir=None):
+    """ rate constants of a mechanism, indexed by the InChI strings
+        of the species
     """
+
     # Get dicts: dict[name] = rxn_dstr
-    mech1_reaction_dct, mech2_reaction_dct = build_reaction_name_dcts(
-        mech1_str, mech2_str, t_ref, temps, pressures,
-        ignore_reverse=ignore_reverse)
+    reaction_dct = (
+        _reaction_name_dct(
+            mech_str, t_ref, temps, pressures,
+            remove_bad_fits=remove_bad_fits, cache_dir=cache_dir)
+        if mech_str else {})
 
     # Get dicts: dict[name] = inchi
-    mech1_name_inchi_dct = mech_parser.spc_name_dct(
-        mech1_csv_str, 'inchi')
-    mech2_name_inchi_dct = mech_parser.spc_name_dct(
-        mech2_csv_str, 'inchi')
+    name_inchi_dct = species_table(
+        spc_tbl, cache_dir=cache_dir).name_dct('inchi')
 
     # Convert name dict to get: dict[inchi] = rxn_data
-    mech1_reaction_ich_dct = {}
-    for names, data in mech1_reaction_dct.items():
+    reaction_ich_dct = {}
+    for names, data in reaction_dct.items():
         [rct_names, prd_names] = names
         rct_ichs, prd_ichs = (), ()
         for rcts in rct_names:
-            rct_ichs += ((mech1_name_inchi_dct[rcts]),)
+            rct_ichs += ((name_inchi_dct[rcts]),)
         for prds in prd_names:
-            prd_ichs += ((mech1_name_inchi_dct[prds]),)
-        mech1_reaction_ich_dct[(rct_ichs, prd_ichs)] = data
+            prd_ichs += ((name_inchi_dct[prds]),)
+        reaction_ich_dct[(rct_ichs, prd_ichs)] = data
 
-    mech2_reaction_ich_dct = {}
-    for names, data in mech2_reaction_dct.items():
-        [rct_names, prd_names] = names
-        rct_ichs, prd_ichs = (), ()
-        for rcts in rct_names:
-            rct_ichs += ((mech2_name_inchi_dct[rcts]),)
-        for prds in prd_names:
-            prd_ichs += ((mech2_name_inchi_dct[prds]),)
-        mech2_reaction_ich_dct[(rct_ichs, prd_ichs)] = data
+    return reaction_ich_dct
 
-    return mech1_reaction_ich_dct, mech2_reaction_ich_dct
 
+def _map_mechanisms(fxn, mech_args, executor=None, workers=None):
+    """ Applies a function to the arguments of each mechanism, concurrently
+        in separate processes if an executor is given or if workers > 1.
+        The results are in the order of the mechanisms.
+    """
+
+    if executor is not None:
+        futures = [executor.submit(fxn, *args) for args in mech_args]
+        results = [future.result() for future in futures]
+    elif workers is not None and workers > 1 and len(mech_args) > 1:
+        with ProcessPoolExecutor(
+                max_workers=min(workers, len(mech_args))) as pool:
+            results = _map_mechanisms(fxn, mech_args, executor=pool)
+    else:
+        results = [fxn(*args) for args in mech_args]
+
+    return results
 
-def conv_ich_to_name_ktp_dct(ktp_ich_dct, csv_str):
+
+def conv_ich_to_name_ktp_dct(ktp_ich_dct, spc_tbl):
     """ convert ktp dct from using ichs to using names
+
+        :param spc_tbl: species of the mechanism (or species.csv string)
+        :type spc_tbl: chemkin_io.parser.mechanism.SpeciesTable
     """
-    # Get dicts: dict[name] = inchi
-    mech1_inchi_name_dct = mech_parser.spc_inchi_dct(csv_str)
+    # Get dicts: dict[inchi] = name
+    mech1_inchi_name_dct = species_table(spc_tbl).entry_dct('inchi')
 
     # Convert name dict to get: dict[inchi] = rxn_data
     ktp_name_dct = {}
@@ -0,0 +1,523 @@
+""" Rate kernels: the fitting parameters of many reactions packed into
+    contiguous arrays, so that rate constants of a whole mechanism are
+    evaluated with a few broadcast NumPy expressions
+"""
+
+import collections
+import numpy as np
+from ioformat import phycon
+
+
+ArrheniusKernel = collections.namedtuple(
+    'ArrheniusKernel', ('sign', 'ln_a', 'n', 'ea', 'offsets', 't_ref'))
+PlogKernel = collections.namedtuple(
+    'PlogKernel', ('arrhenius', 'level_pressures', 'level_offsets',
+                   'nlevels'))
+PlogBrackets = collections.namedtuple(
+    'PlogBrackets', ('lower', 'upper', 'weights', 'exact', 'valid'))
+ChebyshevKernel = collections.namedtuple(
+    'ChebyshevKernel', ('alphas', 'limits', 'indices', 'nrxn'))
+EfficiencyMatrix = collections.namedtuple(
+    'EfficiencyMatrix', ('species', 'rows', 'cols', 'values', 'nrxn'))
+FalloffKernel = collections.namedtuple(
+    'FalloffKernel', ('highp', 'lowp', 'troe', 'is_troe', 'efficiencies'))
+
+
+# Arrhenius kernel
+def arrhenius_kernel(params_lst, rxn_units=None, t_ref=1.0):
+    """ Packs the Arrhenius fitting parameters of many reactions into
+        contiguous arrays. Each reaction can have several parameter sets
+        (e.g., duplicates), which are stored next to each other; their
+        first rows are given by the offsets.
+
+        The units of A and Ea are converted to mol and kcal/mol, unless
+        rxn_units is None (parameters that were already normalized), and
+        ln|A| and the sign of A are stored so that negative A factors of
+        duplicate sets are supported.
+
+        :param params_lst: parameter sets [A, n, Ea] of each reaction
+        :type params_lst: list(numpy.ndarray)
+        :param rxn_units: units for parameters specifies
+        :type rxn_units: str
+        :param t_ref: Reference temperature (K)
+        :type t_ref: float
+        :rtype: ArrheniusKernel
+    """
+
+    params_lst = [np.asarray(params, dtype=float).reshape(-1, 3)
+                  for params in params_lst]
+    for idx, params in enumerate(params_lst):
+        if params.size == 0:
+            raise ValueError(
+                f'Reaction {idx} has no Arrhenius parameter sets; '
+                'each reaction needs at least one set [A, n, Ea]')
+
+    nsets = np.array([len(params) for params in params_lst], dtype=int)
+    offsets = np.cumsum(nsets) - nsets
+    params = (np.concatenate(params_lst) if params_lst else
+              np.zeros((0, 3)))
+
+    a_vals, ea_vals = params[:, 0], params[:, 2]
+    if rxn_units is not None:
+        a_conv_factor, ea_conv_factor = unit_factors(rxn_units)
+        a_vals, ea_vals = a_vals * a_conv_factor, ea_vals * ea_conv_factor
+    with np.errstate(divide='ignore'):
+        ln_a = np.log(np.abs(a_vals))
+
+    return ArrheniusKernel(
+        sign=np.sign(a_vals), ln_a=ln_a, n=params[:, 1],
+        ea=ea_vals, offsets=offsets, t_ref=t_ref)
+
+
+def arrhenius(krn, temps):
+    """ Evaluates the Arrhenius expressions of all of the reactions in
+        a kernel at all of the temperatures, summing the parameter sets
+        of each reaction.
+
+        :param krn: packed Arrhenius parameters
+        :type krn: ArrheniusKernel
+        :param temps: temperatures (K)
+        :type temps: numpy.ndarray
+        :return: k(T)s of every reaction
+        :rtype: numpy.ndarray (nrxn, ntemps)
+    """
+
+    temps = np.asarray(temps, dtype=float)
+    set_kts = krn.sign[:, np.newaxis] * np.exp(
+        krn.ln_a[:, np.newaxis] +
+        krn.n[:, np.newaxis] * np.log(temps / krn.t_ref)[np.newaxis, :] -
+        krn.ea[:, np.newaxis] / (phycon.RC * temps)[np.newaxis, :])
+
+    if len(krn.offsets):
+        kts = np.add.reduceat(set_kts, krn.offsets, axis=0)
+    else:
+        kts = np.zeros((0, len(temps)))
+
+    return kts
+
+
+# PLOG kernel
+def plog_kernel(plog_lst, rxn_units=None, t_ref=1.0):
+    """ Packs the PLOG fitting parameters of many reactions into an
+        Arrhenius kernel with one entry per (reaction, pressure) level.
+        All of the parameter sets given at the same pressure of a
+        reaction are summed into the rate constant of that level.
+
+        :param plog_lst: PLOG parameters [P, A, n, Ea] of each reaction
+        :type plog_lst: list(numpy.ndarray)
+        :param rxn_units: units for parameters specifies
+        :type rxn_units: str
+        :param t_ref: Reference temperature (K)
+        :type t_ref: float
+        :rtype: PlogKernel
+    """
+
+    params_lst, level_pressures, nlevels = [], [], []
+    for plog_params in plog_lst:
+        plog_params = np.asarray(plog_params, dtype=float).reshape(-1, 4)
+        plog_params = plog_params[
+            np.argsort(plog_params[:, 0], kind='stable')]
+        pressures, starts = np.unique(plog_params[:, 0], return_index=True)
+        ends = np.append(starts[1:], len(plog_params))
+        params_lst.extend(plog_params[start:end, 1:]
+                          for start, end in zip(starts, ends))
+        level_pressures.append(pressures)
+        nlevels.append(len(pressures))
+
+    nlevels = np.array(nlevels, dtype=int)
+    level_offsets = np.cumsum(nlevels) - nlevels
+
+    return PlogKernel(
+        arrhenius=arrhenius_kernel(params_lst, rxn_units, t_ref=t_ref),
+        level_pressures=(np.concatenate(level_pressures)
+                         if level_pressures else np.zeros(0)),
+        level_offsets=level_offsets,
+        nlevels=nlevels)
+
+
+def plog_brackets(krn, pressures):
+    """ Finds, for every reaction of a PLOG kernel and every requested
+        pressure, the two pressure levels that bracket the pressure and
+        the weight of the upper level in the interpolation of ln k over
+        ln P. Pressures that match a level exactly use that level alone.
+        Pressures outside of the levels of a reaction (and 'high') are
+        flagged as not valid.
+
+        :param krn: packed PLOG parameters
+        :type krn: PlogKernel
+        :param pressures: Pressures used to calculate k(T,P)s
+        :type pressures: list(float)
+        :rtype: PlogBrackets
+    """
+
+    num_pressures = np.array(
+        [pressure if pressure != 'high' else np.nan
+         for pressure in pressures], dtype=float)
+
+    # Levels of each reaction, padded with inf: (nrxn, max nlevels)
+    nrxn = len(krn.nlevels)
+    max_levels = max(krn.nlevels.max(initial=0), 1)
+    level_idxs = np.arange(max_levels)
+    padded = np.full((nrxn, max_levels), np.inf)
+    has_level = level_idxs[np.newaxis, :] < krn.nlevels[:, np.newaxis]
+    padded[has_level] = krn.level_pressures
+
+    # Count levels below, and find levels equal to each pressure
+    below = padded[:, :, np.newaxis] < num_pressures
+    count = below.sum(axis=1)
+    equal = padded[:, :, np.newaxis] == num_pressures
+    exact = equal.any(axis=1)
+
+    upper = np.where(exact, equal.argmax(axis=1), count)
+    lower = np.where(exact, upper, count - 1)
+    valid = exact | ((count > 0) & (count < krn.nlevels[:, np.newaxis]))
+
+    # Interpolation weights from the logarithms of the pressures
+    lower = np.clip(lower, 0, np.maximum(krn.nlevels - 1, 0)[:, np.newaxis])
+    upper = np.clip(upper, 0, np.maximum(krn.nlevels - 1, 0)[:, np.newaxis])
+    lower = lower + krn.level_offsets[:, np.newaxis]
+    upper = upper + krn.level_offsets[:, np.newaxis]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ln_lower = np.log(krn.level_pressures[lower])
+        ln_upper = np.log(krn.level_pressures[upper])
+        weights = np.where(
+            valid & ~exact,
+            (np.log(num_pressures) - ln_lower) / (ln_upper - ln_lower),
+            0.0)
+
+    return PlogBrackets(
+        lower=lower, upper=upper, weights=weights, exact=exact, valid=valid)
+
+
+def plog(krn, temps, pressures, brackets=None):
+    """ Evaluates the PLOG expressions of all of the reactions in a
+        kernel at all of the temperatures and pressures, interpolating
+        ln k linearly in ln P between the bracketing pressure levels.
+
+        :param krn: packed PLOG parameters
+        :type krn: PlogKernel
+        :param temps: temperatures (K)
+        :type temps: numpy.ndarray
+        :param pressures: Pressures used to calculate k(T,P)s
+        :type pressures: list(float)
+        :param brackets: precomputed brackets of the pressures
+        :type brackets: PlogBrackets
+        :return: k(T,P)s of every reaction, NaN outside the levels
+        :rtype: numpy.ndarray (nrxn, npres, ntemps)
+    """
+
+    if brackets is None:
+        brackets = plog_brackets(krn, pressures)
+
+    level_kts = arrhenius(krn.arrhenius, temps)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        level_ln_kts = np.log(level_kts)
+
+    lower_kts = level_kts[brackets.lower]
+    ln_lower_kts = level_ln_kts[brackets.lower]
+    ln_upper_kts = level_ln_kts[brackets.upper]
+    weights = brackets.weights[..., np.newaxis]
+    with np.errstate(invalid='ignore', over='ignore'):
+        interp_kts = np.exp(
+            ln_lower_kts + weights * (ln_upper_kts - ln_lower_kts))
+
+    ktps = np.where(brackets.exact[..., np.newaxis], lower_kts, interp_kts)
+    ktps[~brackets.valid] = np.nan
+
+    return ktps
+
+
+# Chebyshev kernel
+def chebyshev_kernel(alpha_lst, limits_lst):
+    """ Packs the Chebyshev coefficient matrices of many reactions into
+        one stacked array per matrix shape (alpha_dim), along with the
+        temperature and pressure limits and the position of each reaction.
+
+        :param alpha_lst: Chebyshev coefficient matrix of each reaction
+        :type alpha_lst: list(numpy.ndarray)
+        :param limits_lst: limits [Tmin, Tmax, Pmin, Pmax] of each reaction
+        :type limits_lst: list(numpy.ndarray)
+        :rtype: ChebyshevKernel
+    """
+
+    alpha_lst = [np.asarray(alpha, dtype=float) for alpha in alpha_lst]
+    limits_lst = [np.asarray(limits, dtype=float) for limits in limits_lst]
+
+    dim_idxs = {}
+    for idx, alpha in enumerate(alpha_lst):
+        dim_idxs.setdefault(alpha.shape, []).append(idx)
+
+    alphas, limits, indices = [], [], []
+    for idxs in dim_idxs.values():
+        alphas.append(np.stack([alpha_lst[idx] for idx in idxs]))
+        limits.append(np.stack([limits_lst[idx] for idx in idxs]))
+        indices.append(np.array(idxs, dtype=int))
+
+    return ChebyshevKernel(
+        alphas=tuple(alphas), limits=tuple(limits), indices=tuple(indices),
+        nrxn=len(alpha_lst))
+
+
+def chebyshev_basis(red_vals, ndim):
+    """ Evaluates the first Chebyshev polynomials of the first kind at
+        reduced coordinates, using the three-term recurrence relation.
+
+        :param red_vals: reduced temperatures or pressures
+        :type red_vals: numpy.ndarray
+        :param ndim: number of polynomials
+        :type ndim: int
+        :return: T_0 to T_(ndim-1) at all of the reduced coordinates
+        :rtype: numpy.ndarray (ndim, *red_vals.shape)
+    """
+
+    red_vals = np.asarray(red_vals, dtype=float)
+    basis = np.empty((ndim,) + red_vals.shape)
+    basis[0] = 1.0
+    if ndim > 1:
+        basis[1] = red_vals
+    for idx in range(2, ndim):
+        basis[idx] = 2.0 * red_vals * basis[idx-1] - basis[idx-2]
+
+    return basis
+
+
+def chebyshev(krn, temps, pressures):
+    """ Evaluates the Chebyshev expressions of all of the reactions in a
+        kernel at all of the temperatures and pressures. The polynomial
+        basis is computed once for each distinct set of limits of a
+        matrix shape, and contracted with the stacked coefficient matrices.
+
+        :param krn: packed Chebyshev parameters
+        :type krn: ChebyshevKernel
+        :param temps: temperatures (K)
+        :type temps: numpy.ndarray
+        :param pressures: Pressures used to calculate k(T,P)s
+        :type pressures: list(float)
+        :return: k(T,P)s of every reaction, NaN at the 'high' pressure
+        :rtype: numpy.ndarray (nrxn, npres, ntemps)
+    """
+
+    temps = np.asarray(temps, dtype=float)
+    num_pressures = np.array(
+        [pressure if pressure != 'high' else np.nan
+         for pressure in pressures], dtype=float)
+    inv_temps = 1.0 / temps
+    log_pressures = np.log10(num_pressures)
+
+    ktps = np.empty((krn.nrxn, len(num_pressures), len(temps)))
+    for alphas, limits, indices in zip(krn.alphas, krn.limits, krn.indices):
+        uniq_limits, limit_idxs = np.unique(
+            limits, axis=0, return_inverse=True)
+        limit_idxs = limit_idxs.reshape(-1)
+        tmin, tmax, pmin, pmax = (uniq_limits[:, idx, np.newaxis]
+                                  for idx in range(4))
+
+        # Reduced coordinates and bases for each distinct set of limits
+        red_temps = (
+            (2.0 * inv_temps - 1.0 / tmin - 1.0 / tmax) /
+            (1.0 / tmax - 1.0 / tmin))
+        red_pressures = (
+            (2.0 * log_pressures - np.log10(pmin) - np.log10(pmax)) /
+            (np.log10(pmax) - np.log10(pmin)))
+        temp_basis = chebyshev_basis(red_temps, alphas.shape[1])
+        pressure_basis = chebyshev_basis(red_pressures, alphas.shape[2])
+
+        log_ktps = np.einsum(
+            'rij,irt,jrp->rpt', alphas,
+            temp_basis[:, limit_idxs], pressure_basis[:, limit_idxs],
+            optimize=True)
+        ktps[indices] = 10.0**log_ktps
+
+    return ktps
+
+
+# Falloff kernel
+def falloff_kernel(highp_lst, lowp_lst, troe_lst, colliders_lst,
+                   rxn_units=None, t_ref=1.0):
+    """ Packs the high- and low-pressure Arrhenius parameters, the Troe
+        parameters and the collision efficiencies of many falloff
+        reactions. Reactions without Troe parameters use the Lindemann
+        expression.
+
+        :param highp_lst: high-pressure parameter sets [A, n, Ea] of each rxn
+        :type highp_lst: list(numpy.ndarray)
+        :param lowp_lst: low-pressure parameter sets [A, n, Ea] of each rxn
+        :type lowp_lst: list(numpy.ndarray)
+        :param troe_lst: Troe parameters [alpha, T***, T*, T**] of each rxn
+            (None for Lindemann; T** is NaN if absent)
+        :type troe_lst: list(numpy.ndarray)
+        :param colliders_lst: collision efficiencies of the bath gases
+        :type colliders_lst: list(dict[str: float])
+        :param rxn_units: units for parameters specifies
+        :type rxn_units: str
+        :param t_ref: Reference temperature (K)
+        :type t_ref: float
+        :rtype: FalloffKernel
+    """
+
+    troe = np.full((len(troe_lst), 4), np.nan)
+    is_troe = np.array([params is not None for params in troe_lst],
+                       dtype=bool)
+    for idx, params in enumerate(troe_lst):
+        if params is not None:
+            params = np.asarray(params, dtype=float)
+            troe[idx, :len(params)] = params
+
+    return FalloffKernel(
+        highp=arrhenius_kernel(highp_lst, rxn_units, t_ref=t_ref),
+        lowp=arrhenius_kernel(lowp_lst, rxn_units, t_ref=t_ref),
+        troe=troe, is_troe=is_troe,
+        efficiencies=efficiency_matrix(colliders_lst))
+
+
+def efficiency_matrix(colliders_lst):
+    """ Builds a sparse species x reaction matrix of the collision
+        efficiencies of many reactions. Only the bath gases listed for
+        a reaction are stored, as their deviation from the default
+        efficiency of one, in coordinate (row, column, value) format.
+
+        :param colliders_lst: collision efficiencies of the bath gases
+        :type colliders_lst: list(dict[str: float])
+        :rtype: EfficiencyMatrix
+    """
+
+    spc_idxs, rows, cols, values = {}, [], [], []
+    for rxn_idx, colliders in enumerate(colliders_lst):
+        for name, factor in colliders.items():
+            rows.append(spc_idxs.setdefault(name, len(spc_idxs)))
+            cols.append(rxn_idx)
+            values.append(factor - 1.0)
+
+    return EfficiencyMatrix(
+        species=tuple(spc_idxs),
+        rows=np.array(rows, dtype=int), cols=np.array(cols, dtype=int),
+        values=np.array(values, dtype=float), nrxn=len(colliders_lst))
+
+
+def collision_efficiencies(eff_mat, mixture=None):
+    """ Calculates the effective collision efficiency of a bath-gas
+        mixture for every reaction, sum_s x_s * eff_s, where bath gases
+        without a listed efficiency count with an efficiency of one.
+
+        :param eff_mat: sparse collision efficiency matrix
+        :type eff_mat: EfficiencyMatrix
+        :param mixture: mole fractions of the bath gases (normalized here);
+            if None, all reactions have an efficiency of one
+        :type mixture: dict[str: float]
+        :rtype: numpy.ndarray (nrxn,)
+    """
+
+    effs = np.ones(eff_mat.nrxn)
+    if mixture:
+        total = float(sum(mixture.values()))
+        fracs = np.array([mixture.get(name, 0.0) / total
+                          for name in eff_mat.species], dtype=float)
+        effs += np.bincount(
+            eff_mat.cols, weights=fracs[eff_mat.rows] * eff_mat.values,
+            minlength=eff_mat.nrxn)
+
+    return effs
+
+
+def third_body_concentrations(eff_mat, temps, pressures, mixture=None):
+    """ Calculates the effective concentrations of the third body [M] of
+        every reaction in a bath-gas mixture, using the ideal gas law.
+
+        :param eff_mat: sparse collision efficiency matrix
+        :type eff_mat: EfficiencyMatrix
+        :param temps: temperatures (K)
+        :type temps: numpy.ndarray
+        :param pressures: pressures (atm)
+        :type pressures: list(float)
+        :param mixture: mole fractions of the bath gases
+        :type mixture: dict[str: float]
+        :return: [M] of every reaction (mol/cm^3)
+        :rtype: numpy.ndarray (nrxn, npres, ntemps)
+    """
+
+    temps = np.asarray(temps, dtype=float)
+    num_pressures = np.asarray(pressures, dtype=float)
+    effs = collision_efficiencies(eff_mat, mixture=mixture)
+    mconcs = num_pressures[:, np.newaxis] / (phycon.RC2 * temps)
+
+    return effs[:, np.newaxis, np.newaxis] * mconcs[np.newaxis]
+
+
+def falloff(krn, temps, pressures, mixture=None):
+    """ Evaluates the Lindemann and Troe expressions of all of the
+        reactions in a kernel at all of the temperatures and pressures,
+        in a bath-gas mixture.
+
+        :param krn: packed falloff parameters
+        :type krn: FalloffKernel
+        :param temps: temperatures (K)
+        :type temps: numpy.ndarray
+        :param pressures: Pressures used to calculate k(T,P)s
+        :type pressures: list(float)
+        :param mixture: mole fractions of the bath gases
+        :type mixture: dict[str: float]
+        :return: k(T,P)s of every reaction, NaN at the 'high' pressure
+        :rtype: numpy.ndarray (nrxn, npres, ntemps)
+    """
+
+    temps = np.asarray(temps, dtype=float)
+    num_pressures = np.array(
+        [pressure if pressure != 'high' else np.nan
+         for pressure in pressures], dtype=float)
+
+    highp_kts = arrhenius(krn.highp, temps)[:, np.newaxis, :]
+    lowp_kts = arrhenius(krn.lowp, temps)[:, np.newaxis, :]
+    mconcs = third_body_concentrations(
+        krn.efficiencies, temps, num_pressures, mixture=mixture)
+    red_pressures = lowp_kts * mconcs / highp_kts
+    ktps = highp_kts * red_pressures / (1.0 + red_pressures)
+
+    # Troe broadening factor F for the reactions with Troe parameters
+    if krn.is_troe.any():
+        alpha, ts3, ts1, ts2 = (krn.troe[krn.is_troe, idx, np.newaxis]
+                                for idx in range(4))
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            fcents = ((1.0 - alpha) * np.exp(-temps / ts3) +
+                      alpha * np.exp(-temps / ts1) +
+                      np.where(np.isnan(ts2), 0.0, np.exp(-ts2 / temps)))
+            log_fcents = np.log10(fcents)[:, np.newaxis, :]
+            log_prs = np.log10(red_pressures[krn.is_troe])
+            cval = -0.4 - 0.67 * log_fcents
+            nval = 0.75 - 1.27 * log_fcents
+            broad = ((log_prs + cval) / (nval - 0.14 * (log_prs + cval)))**2
+            ktps[krn.is_troe] *= 10.0**(log_fcents / (1.0 + broad))
+
+    return ktps
+
+
+# Units
+def unit_factors(rxn_units):
+    """ Conversion factors that bring the A and Ea fitting parameters
+        from the units given in the mechanism file to mol and kcal/mol.
+
+        :param rxn_units: units for parameters specifies
+        :type rxn_units: str
+        :return: conversion factors of A and of Ea
+        :rtype: (float, float)
+    """
+
+    # Determine converstion factor for A parameter units
+    if rxn_units[1] == 'molecules':
+        a_conv_factor = phycon.NAVO
+    else:
+        a_conv_factor = 1.0
+
+    # Determine converstion factor for Ea parameter units
+    ea_units = rxn_units[0]
+    if ea_units == 'cal/mole':
+        ea_conv_factor = phycon.CAL2KCAL
+    elif ea_units == 'joules/mole':
+        ea_conv_factor = phycon.J2KCAL
+    elif ea_units == 'kjoules/mole':
+        ea_conv_factor = phycon.KJ2KCAL
+    elif ea_units == 'kelvin':
+        ea_conv_factor = phycon.KEL2KCAL
+    else:
+        ea_conv_factor = 1.0
+
+    return a_conv_factor, ea_conv_factor
@@ -0,0 +1,238 @@
+""" dense storage of the rate constants [k(T,P)]s of a whole mechanism
+"""
+
+import collections.abc
+import numpy as np
+
+
+class KTPTensor():
+    """ Rate constants [k(T,P)]s of many reactions stored in one contiguous
+        (nrxn, npres, ntemps) array, along with the reactions, pressures
+        (including 'high') and temperatures that label each axis.
+
+        Pressures at which the rate constants of a reaction are not
+        defined hold NaN. The dictionary view, dct, gives the rate
+        constants in the dict[reaction: dict[pressure: temps]] layout
+        used by the rest of the package, leaving these pressures out;
+        its k(T)s are read-only, and to_dct gives copies that can be
+        modified.
+
+        :param values: k(T,P)s of all reactions at all pressures and temps
+        :type values: numpy.ndarray (nrxn, npres, ntemps)
+        :param reactions: labels of the reactions
+        :type reactions: list(tuple)
+        :param pressures: labels of the pressures
+        :type pressures: list(float or str)
+        :param temps: temperatures (K)
+        :type temps: numpy.ndarray
+    """
+
+    def __init__(self, values, reactions, pressures, temps):
+        self.values = np.asarray(values, dtype=float)
+        self.reactions = tuple(reactions)
+        self.pressures = tuple(pressures)
+        self.temps = np.asarray(temps, dtype=float)
+        assert self.values.shape == (
+            len(self.reactions), len(self.pressures), len(self.temps))
+        self.reaction_index = {rxn: idx
+                               for idx, rxn in enumerate(self.reactions)}
+        self.pressure_index = {pressure: idx
+                               for idx, pressure in enumerate(self.pressures)}
+        self._dct = None
+
+    @classmethod
+    def from_dct(cls, mech_dct, temps=None, pressures=None):
+        """ Builds the tensor from the rate constants of a mechanism
+            in the dictionary layout.
+
+            :param mech_dct: k(T,P)s for all reactions in the mechanism
+            :type mech_dct: dict[reaction: dict[pressure: temps]]
+            :param temps: temperatures (K); if None, they are not known
+                and are set to NaN
+            :type temps: numpy.ndarray
+            :param pressures: pressures of the tensor (by default, all
+                pressures of the dictionary, in the order they are found)
+            :type pressures: list(float or str)
+            :rtype: KTPTensor
+        """
+
+        if pressures is None:
+            pressures = list(dict.fromkeys(
+                pressure for ktp_dct in mech_dct.values()
+                for pressure in ktp_dct))
+        if temps is None:
+            ntemps = next((len(ktps) for ktp_dct in mech_dct.values()
+                           for ktps in ktp_dct.values()), 0)
+            temps = np.full(ntemps, np.nan)
+
+        tensor = cls.empty(list(mech_dct), pressures, temps)
+        for rxn_idx, ktp_dct in enumerate(mech_dct.values()):
+            for pressure, ktps in ktp_dct.items():
+                if pressure in tensor.pressure_index:
+                    tensor.values[
+                        rxn_idx, tensor.pressure_index[pressure]] = ktps
+
+        return tensor
+
+    @classmethod
+    def empty(cls, reactions, pressures, temps):
+        """ Builds a tensor where no rate constants are defined yet.
+
+            :param reactions: labels of the reactions
+            :type reactions: list(tuple)
+            :param pressures: labels of the pressures
+            :type pressures: list(float or str)
+            :param temps: temperatures (K)
+            :type temps: numpy.ndarray
+            :rtype: KTPTensor
+        """
+        values = np.full((len(reactions), len(pressures), len(temps)), np.nan)
+        return cls(values, reactions, pressures, temps)
+
+    def __len__(self):
+        return len(self.reactions)
+
+    def __contains__(self, rxn):
+        return rxn in self.reaction_index
+
+    def __repr__(self):
+        return (f'KTPTensor(nrxn={len(self.reactions)}, '
+                f'pressures={list(self.pressures)}, '
+                f'ntemps={len(self.temps)})')
+
+    @property
+    def shape(self):
+        """ Shape of the array of the rate constants.
+
+            :rtype: (int, int, int)
+        """
+        return self.values.shape
+
+    @property
+    def defined(self):
+        """ Mask of the (reaction, pressure) pairs with rate constants;
+            these pairs are the ones that are not NaN at all temperatures.
+
+            :rtype: numpy.ndarray (nrxn, npres)
+        """
+        return ~np.isnan(self.values).all(axis=2)
+
+    @property
+    def dct(self):
+        """ Read-only view of the rate constants in the dictionary layout.
+            The view is built on first access and then reused.
+
+            :rtype: KTPDict
+        """
+        if self._dct is None:
+            self._dct = KTPDict(self)
+        return self._dct
+
+    def masked(self):
+        """ Masked array of the rate constants, where the NaN values
+            are masked out.
+
+            :rtype: numpy.ma.MaskedArray (nrxn, npres, ntemps)
+        """
+        return np.ma.masked_invalid(self.values)
+
+    def isel(self, reactions=None, pressures=None, temps=None):
+        """ Selects a part of the tensor by position along each axis
+            (integers, slices, or integer or boolean arrays). The
+            selected values are copied.
+
+            :param reactions: positions of the reactions to keep
+            :param pressures: positions of the pressures to keep
+            :param temps: positions of the temperatures to keep
+            :rtype: KTPTensor
+        """
+
+        rxn_pos, pressure_pos, temp_pos = (
+            np.arange(size)[_as_index(idx)]
+            for idx, size in zip((reactions, pressures, temps),
+                                 self.values.shape))
+
+        return KTPTensor(
+            self.values[np.ix_(rxn_pos, pressure_pos, temp_pos)],
+            [self.reactions[pos] for pos in rxn_pos],
+            [self.pressures[pos] for pos in pressure_pos],
+            self.temps[temp_pos])
+
+    def sel(self, reactions=None, pressures=None):
+        """ Selects a part of the tensor by the labels of the reactions
+            and pressures.
+
+            :param reactions: labels of the reactions to keep
+            :type reactions: list(tuple)
+            :param pressures: labels of the pressures to keep
+            :type pressures: list(float or str)
+            :rtype: KTPTensor
+        """
+
+        rxn_idxs = (None if reactions is None else
+                    [self.reaction_index[rxn] for rxn in reactions])
+        pressure_idxs = (None if pressures is None else
+                         [self.pressure_index[pressure]
+                          for pressure in pressures])
+
+        return self.isel(reactions=rxn_idxs, pressures=pressure_idxs)
+
+    def to_dct(self):
+        """ Copies the rate constants into the dictionary layout.
+
+            :rtype: dict[reaction: dict[pressure: temps]]
+        """
+        return {rxn: {pressure: ktps.copy() for pressure, ktps
+                      in ktp_dct.items()}
+                for rxn, ktp_dct in self.dct.items()}
+
+
+class KTPDict(collections.abc.Mapping):
+    """ Read-only view of a KTPTensor in the dictionary layout,
+        dict[reaction: dict[pressure: temps]]. The k(T)s are read-only
+        views into the array of the tensor, so they follow any change to
+        the tensor but cannot be used to modify it. Pressures where the
+        rate constants of a reaction are not defined are left out.
+
+        :param tensor: rate constants of the mechanism
+        :type tensor: KTPTensor
+    """
+
+    def __init__(self, tensor):
+        self.tensor = tensor
+
+    def __getitem__(self, rxn):
+        rxn_idx = self.tensor.reaction_index[rxn]
+        rxn_vals = self.tensor.values[rxn_idx]
+        defined = ~np.isnan(rxn_vals).all(axis=1)
+        return {pressure: _read_only(rxn_vals[idx])
+                for idx, pressure in enumerate(self.tensor.pressures)
+                if defined[idx]}
+
+    def __iter__(self):
+        return iter(self.tensor.reactions)
+
+    def __len__(self):
+        return len(self.tensor.reactions)
+
+    def __contains__(self, rxn):
+        return rxn in self.tensor.reaction_index
+
+
+def _read_only(vals):
+    """ Read-only view of an array.
+    """
+    view = vals.view()
+    view.flags.writeable = False
+    return view
+
+
+def _as_index(idx):
+    """ Positions along an axis of the tensor, keeping integers as
+        one-element axes.
+    """
+    if idx is None:
+        idx = slice(None)
+    elif isinstance(idx, (int, np.integer)):
+        idx = [idx]
+    return idx
@@ -0,0 +1,672 @@
+""" rate constants [k(T,P)]s calculated from the parsed Reaction records
+    of the reactions of a mechanism
+"""
+
+import itertools
+import functools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import ratefit
+from chemkin_io.parser import reaction as rxn_parser
+from chemkin_io.calculator import kernel
+from chemkin_io.calculator import ktp
+
+
+def normalize_units(rxn_dct, rxn_units):
+    """ Converts the A and Ea fitting parameters of all of the records of
+        a mechanism (every high-pressure, low-pressure and PLOG parameter
+        set of every duplicate entry) from the units given in the
+        mechanism file to mol and kcal/mol.
+
+        This is done once, when the records are built; the rate constants
+        of the new records are then calculated with rxn_units=None,
+        without any unit conversion. The given records are not modified.
+
+        :param rxn_dct: parsed records for all reactions in the mechanism
+        :type rxn_dct: dict[reaction: list(Reaction)]
+        :param rxn_units: units for parameters specifies
+        :type rxn_units: str
+        :return: records with the parameters in mol and kcal/mol
+        :rtype: dict[reaction: list(Reaction)]
+    """
+
+    rxns = _normalize_records(
+        [rxn for rxn_recs in rxn_dct.values() for rxn in rxn_recs],
+        rxn_units)
+    rxn_iter = iter(rxns)
+
+    return {name: [next(rxn_iter) for _ in rxn_recs]
+            for name, rxn_recs in rxn_dct.items()}
+
+
+def mechanism_tensor(rxn_dct, rxn_units, t_ref, temps, pressures,
+                     collider=None, workers=None, mixture=None):
+    """ Uses the fitting parameters in the already-parsed Reaction records
+        of a mechanism to calculate rate constants [k(T,P)]s, which are
+        written into one dense tensor.
+
+        Arrhenius, PLOG, Chebyshev and falloff reactions are each evaluated
+        together with a rate kernel; the other reactions (e.g., duplicates
+        of different kinds) are evaluated one at a time.
+
+        The units of the records are normalized once, before any rate
+        constant is evaluated; records that were already normalized with
+        normalize_units are passed with rxn_units=None.
+
+        :param rxn_dct: parsed records for all reactions in the mechanism
+        :type rxn_dct: dict[reaction: list(Reaction)]
+        :param rxn_units: units for parameters specifies (None if the
+            records are already in mol and kcal/mol)
+        :type rxn_units: str
+        :param t_ref: Reference temperature (K)
+        :type t_ref: float
+        :param temps: Temps used to calculate high- and low-k(T)s
+        :type temps: numpy.ndarray
+        :param pressures: Pressures used to calculate k(T,P)s
+        :type pressures: list(float)
+        :param collider: bath gas molecule collider
+        :type collider: str
+        :param workers: number of processes used to evaluate the reactions
+        :type workers: int
+        :param mixture: mole fractions of the bath gases (overrides collider)
+        :type mixture: dict[str: float]
+        :return: k(T,P)s for all reactions, NaN where they are not defined
+        :rtype: chemkin_io.calculator.ktp.KTPTensor
+    """
+
+    rxn_dct = normalize_units(rxn_dct, rxn_units)
+    mech_tensor = ktp.KTPTensor.empty(list(rxn_dct), pressures, temps)
+    rxn_idxs = mech_tensor.reaction_index
+    pdep_idxs = [idx for idx, pressure in enumerate(pressures)
+                 if pressure != 'high']
+    pdep_pressures = [pressures[idx] for idx in pdep_idxs]
+
+    # Pressure-independent Arrhenius reactions: one kernel for all of them
+    arr_rxns = [rxn for rxn, rxn_recs in rxn_dct.items()
+                if all(map(_is_arrhenius_only, rxn_recs))]
+    if 'high' in pressures:
+        mech_tensor.values[
+            [rxn_idxs[rxn] for rxn in arr_rxns],
+            mech_tensor.pressure_index['high']] = _arrhenius_mechanism(
+                [rxn_dct[rxn] for rxn in arr_rxns], t_ref, temps)
+    done_rxns = set(arr_rxns)
+
+    # PLOG reactions: one kernel and one set of pressure brackets
+    plog_rxns, plog_lst = [], []
+    for rxn, rxn_recs in rxn_dct.items():
+        if rxn not in done_rxns:
+            stacked_recs = _stack_duplicates(rxn_recs)
+            if len(stacked_recs) == 1 and _is_plog_only(stacked_recs[0]):
+                plog_rxns.append(rxn)
+                plog_lst.append(stacked_recs[0].plog)
+    mech_tensor.values[np.ix_([rxn_idxs[rxn] for rxn in plog_rxns],
+                              pdep_idxs)] = _plog_mechanism(
+        plog_lst, t_ref, temps, pdep_pressures)
+    done_rxns.update(plog_rxns)
+
+    # Chebyshev reactions: one kernel for each coefficient matrix shape
+    cheb_rxns, cheb_recs = [], []
+    for rxn, rxn_recs in rxn_dct.items():
+        if rxn not in done_rxns and len(rxn_recs) == 1:
+            if _is_chebyshev_only(rxn_recs[0]):
+                cheb_rxns.append(rxn)
+                cheb_recs.append(rxn_recs[0])
+    mech_tensor.values[np.ix_([rxn_idxs[rxn] for rxn in cheb_rxns],
+                              pdep_idxs)] = _chebyshev_mechanism(
+        cheb_recs, temps, pdep_pressures)
+    done_rxns.update(cheb_rxns)
+
+    # Falloff reactions: one kernel and one [M] for the bath-gas mixture
+    fall_rxns, fall_recs = [], []
+    for rxn, rxn_recs in rxn_dct.items():
+        if rxn not in done_rxns and len(rxn_recs) == 1:
+            if _is_falloff_only(rxn_recs[0]):
+                fall_rxns.append(rxn)
+                fall_recs.append(rxn_recs[0])
+    mech_tensor.values[np.ix_([rxn_idxs[rxn] for rxn in fall_rxns],
+                              pdep_idxs)] = _falloff_mechanism(
+        fall_recs, t_ref, temps, pdep_pressures,
+        mixture=_bath_mixture(collider, mixture))
+    done_rxns.update(fall_rxns)
+
+    # All other reactions are evaluated one at a time
+    oth_rxns = [rxn for rxn in rxn_dct if rxn not in done_rxns]
+    record_fxn = functools.partial(
+        records, rxn_units=None, t_ref=t_ref, temps=temps,
+        pressures=pressures, collider=collider, mixture=mixture)
+    oth_recs = [rxn_dct[rxn] for rxn in oth_rxns]
+    if workers is not None and workers > 1 and len(oth_recs) > 1:
+        chunksize = max(1, len(oth_recs) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            oth_ktp_dcts = list(executor.map(
+                record_fxn, oth_recs, chunksize=chunksize))
+    else:
+        oth_ktp_dcts = list(map(record_fxn, oth_recs))
+
+    for rxn, ktp_dct in zip(oth_rxns, oth_ktp_dcts):
+        for pressure, ktps in ktp_dct.items():
+            mech_tensor.values[
+                rxn_idxs[rxn], mech_tensor.pressure_index[pressure]] = ktps
+
+    return mech_tensor
+
+
+def records(rxns, rxn_units, t_ref, temps, pressures=None, collider=None,
+            mixture=None):
+    """ Uses the fitting parameters in the parsed Reaction records of all
+        the duplicate entries of a reaction to calculate the total
+        rate constants at input temps and pressures [k(T,P)]s.
+
+        Duplicates of the same kind (Arrhenius-only or PLOG entries with
+        the same pressure region and colliders) have their parameter sets
+        stacked, so they are evaluated together in a single call; any
+        remaining entries are evaluated separately and summed at the
+        pressures where all of them are defined. If pressure-independent
+        entries are mixed with pressure-dependent ones, their k(T)s are
+        added to the k(T,P)s at every pressure.
+
+        :param rxns: records of the duplicate entries of the reaction
+        :type rxns: list(chemkin_io.parser.reaction.Reaction)
+        :param rxn_units: units for parameters specifies (None if the
+            records are already in mol and kcal/mol)
+        :type rxn_units: str
+        :param t_ref: Reference temperature (K)
+        :type t_ref: float
+        :param temps: Temps used to calculate high- and low-k(T)s
+        :type temps: numpy.ndarray
+        :param pressures: Pressures used to calculate k(T,P)s
+        :type pressures: list(float)
+        :param collider: bath gas molecule collider
+        :type collider: str
+        :param mixture: mole fractions of the bath gases (overrides collider)
+        :type mixture: dict[str: float]
+        :return ktp_dct: k(T,P)s at all temps and pressures
+        :rtype: dict[pressure: temps]
+    """
+
+    stacked_rxns = _stack_duplicates(_normalize_records(rxns, rxn_units))
+    is_indep = [_is_arrhenius_only(rxn) for rxn in stacked_rxns]
+    if all(is_indep):
+        is_indep = [False] * len(stacked_rxns)
+
+    ktp_dct = None
+    for rxn, indep in zip(stacked_rxns, is_indep):
+        if not indep:
+            rxn_ktp_dct = record(rxn, None, t_ref, temps,
+                                 pressures=pressures, collider=collider,
+                                 mixture=mixture)
+            if ktp_dct is None:
+                ktp_dct = rxn_ktp_dct
+            else:
+                ktp_dct = _add_rates(ktp_dct, rxn_ktp_dct)
+
+    for rxn in itertools.compress(stacked_rxns, is_indep):
+        indep_ks = _arrhenius(rxn.highp, temps, t_ref)
+        ktp_dct = {pressure: ktps + indep_ks
+                   for pressure, ktps in ktp_dct.items()}
+
+    return ktp_dct
+
+
+def record(rxn, rxn_units, t_ref, temps, pressures=None, collider=None,
+           mixture=None):
+    """ Uses the fitting parameters in a parsed Reaction record
+        to calculate rate constants at input temps and pressures [k(T,P)]s.
+
+        :param rxn: record of the parsed reaction data
+        :type rxn: chemkin_io.parser.reaction.Reaction
+        :param rxn_units: units for parameters specifies (None if the
+            records are already in mol and kcal/mol)
+        :type rxn_units: str
+        :param t_ref: Reference temperature (K)
+        :type t_ref: float
+        :param temps: Temps used to calculate high- and low-k(T)s
+        :type temps: numpy.ndarray
+        :param pressures: Pressures used to calculate k(T,P)s
+        :type pressures: list(float)
+        :param collider: bath gas molecule collider
+        :type collider: str
+        :param mixture: mole fractions of the bath gases (overrides collider)
+        :type mixture: dict[str: float]
+        :return ktp_dct: k(T,P)s at all temps and pressures
+        :rtype: dict[pressure: temps]
+    """
+
+    [rxn] = _normalize_records([rxn], rxn_units)
+
+    # Determine if any pdep params at all are found
+    any_pdep = any(params is not None
+                   for params in (rxn.lowp, rxn.troe,
+                                  rxn.cheb_alpha, rxn.plog))
+
+    # First check the pressure region that is being specified
+    pressure_region = rxn.pressure_region
+
+    # Set the collider efficiency
+    collid_factor = kernel.collision_efficiencies(
+        kernel.efficiency_matrix([rxn.colliders]),
+        mixture=_bath_mixture(collider, mixture))[0]
+
+    # Calculate high_pressure rates
+    highp_ks = _arrhenius(rxn.highp, temps, t_ref)
+    ktp_dct = {}
+    if 'high' in pressures:
+        if not any_pdep and pressure_region == 'indep':
+            if not rxn_parser.are_highp_fake(rxn.highp):
+                ktp_dct['high'] = highp_ks
+
+    # Get a pdep list of pressures
+    pdep_pressures = [pressure for pressure in pressures
+                      if pressure != 'high']
+
+    # Calculate pressure-dependent rate constants based on discovered params
+    # Either linear Pressure dependence, if specified or using
+    # Either (1) Plog, (2) Chebyshev, (3) Lindemann, or (4) Troe
+
+    pdep_dct = {}
+    if pressure_region == 'lowp':
+        pdep_dct = ratefit.calc.lowp_limit(
+            highp_ks, temps, pdep_pressures, collid_factor=collid_factor)
+    else:
+        if rxn.plog is not None:
+            plog_params = {
+                pressure: rxn.plog[rxn.plog[:, 0] == pressure, 1:]
+                for pressure in dict.fromkeys(rxn.plog[:, 0])}
+            pdep_dct = _plog(plog_params, temps, pdep_pressures, t_ref)
+
+        elif rxn.cheb_alpha is not None:
+            pdep_dct = _chebyshev(rxn.cheb_alpha, rxn.cheb_limits,
+                                  temps, pdep_pressures)
+
+        elif rxn.lowp is not None:
+            lowp_ks = _arrhenius(rxn.lowp, temps, t_ref)
+            if rxn.troe is not None:
+                pdep_dct = _troe(rxn.troe, highp_ks, lowp_ks,
+                                 temps, pdep_pressures,
+                                 collid_factor=collid_factor)
+            else:
+                pdep_dct = ratefit.calc.lindemann(
+                    highp_ks, lowp_ks, temps, pdep_pressures,
+                    collid_factor=collid_factor)
+
+    # Build the rate constants dictionary with the pdep dict
+    if pdep_dct:
+        ktp_dct.update(pdep_dct)
+
+    return ktp_dct
+
+
+def _add_rates(ktp_dct1, ktp_dct2):
+    """ Adds the rates of two dictionaries together at the pressures
+        found in both of them.
+
+        :param ktp_dct1: k(T,P)s at all temps and pressures for mechanism 1
+        :type ktp_dct1: dict[pressure: temps]
+        :param ktp_dct2: k(T,P)s at all temps and pressures for mechanism 2
+        :type ktp_dct2: dict[pressure: temps]
+        :return ktp_dct: combined k(T,P)s at all temps and pressures
+        :rtype: dict[pressure: temps]
+    """
+
+    ktp_dct = {pressure: ktp_dct1[pressure] + ktp_dct2[pressure]
+               for pressure in ktp_dct1 if pressure in ktp_dct2}
+
+    return ktp_dct
+
+
+def _arrhenius_mechanism(rxns_lst, t_ref, temps):
+    """ Calculates the high-pressure rate constants [k(T)]s of many
+        pressure-independent reactions at once with an Arrhenius kernel,
+        summing the parameter sets of all their duplicate entries.
+        Reactions with fake high-pressure parameters are set to NaN.
+
+        :param rxns_lst: records of the duplicate entries of each reaction
+        :type rxns_lst: list(list(chemkin_io.parser.reaction.Reaction))
+        :param t_ref: Reference temperature (K)
+        :type t_ref: float
+        :param temps: Temps used to calculate high- and low-k(T)s
+        :type temps: numpy.ndarray
+        :return: k(T)s of each reaction
+        :rtype: numpy.ndarray (nrxn, ntemps)
+    """
+
+    highp_lst = [np.vstack([rxn.highp for rxn in rxns]) for rxns in rxns_lst]
+    krn = kernel.arrhenius_kernel(highp_lst, t_ref=t_ref)
+    kts_arr = kernel.arrhenius(krn, temps)
+    kts_arr[[rxn_parser.are_highp_fake(highp) for highp in highp_lst]] = np.nan
+
+    return kts_arr
+
+
+def _plog_mechanism(plog_lst, t_ref, temps, pressures):
+    """ Calculates the rate constants [k(T,P)]s of many PLOG reactions at
+        once with a PLOG kernel. The pressure brackets are found once for
+        all of the reactions; pressures outside of the PLOG pressures of a
+        reaction are set to NaN.
+
+        :param plog_lst: PLOG parameters [P, A, n, Ea] of each reaction
+        :type plog_lst: list(numpy.ndarray)
+        :param t_ref: Reference temperature (K)
+        :type t_ref: float
+        :param temps: Temps used to calculate high- and low-k(T)s
+        :type temps: numpy.ndarray
+        :param pressures: Pressures used to calculate k(T,P)s
+        :type pressures: list(float)
+        :return: k(T,P)s of each reaction
+        :rtype: numpy.ndarray (nrxn, npres, ntemps)
+    """
+
+    krn = kernel.plog_kernel(plog_lst, t_ref=t_ref)
+
+    return kernel.plog(krn, temps, pressures)
+
+
+def _chebyshev_mechanism(rxns, temps, pressures):
+    """ Calculates the rate constants [k(T,P)]s of many Chebyshev
+        reactions at once with a Chebyshev kernel.
+
+        :param rxns: records of the Chebyshev reactions
+        :type rxns: list(chemkin_io.parser.reaction.Reaction)
+        :param temps: Temps used to calculate high- and low-k(T)s
+        :type temps: numpy.ndarray
+        :param pressures: Pressures used to calculate k(T,P)s
+        :type pressures: list(float)
+        :return: k(T,P)s of each reaction
+        :rtype: numpy.ndarray (nrxn, npres, ntemps)
+    """
+
+    krn = kernel.chebyshev_kernel([rxn.cheb_alpha for rxn in rxns],
+                                  [rxn.cheb_limits for rxn in rxns])
+
+    return kernel.chebyshev(krn, temps, pressures)
+
+
+def _falloff_mechanism(rxns, t_ref, temps, pressures, mixture=None):
+    """ Calculates the rate constants [k(T,P)]s of many Lindemann and
+        Troe falloff reactions at once with a falloff kernel.
+
+        :param rxns: records of the falloff reactions
+        :type rxns: list(chemkin_io.parser.reaction.Reaction)
+        :param t_ref: Reference temperature (K)
+        :type t_ref: float
+        :param temps: Temps used to calculate high- and low-k(T)s
+        :type temps: numpy.ndarray
+        :param pressures: Pressures used to calculate k(T,P)s
+        :type pressures: list(float)
+        :param mixture: mole fractions of the bath gases
+        :type mixture: dict[str: float]
+        :return: k(T,P)s of each reaction
+        :rtype: numpy.ndarray (nrxn, npres, ntemps)
+    """
+
+    krn = kernel.falloff_kernel(
+        [rxn.highp for rxn in rxns], [rxn.lowp for rxn in rxns],
+        [rxn.troe for rxn in rxns], [rxn.colliders for rxn in rxns],
+        t_ref=t_ref)
+
+    return kernel.falloff(krn, temps, pressures, mixture=mixture)
+
+
+def _bath_mixture(collider=None, mixture=None):
+    """ Gets the bath-gas mixture: either the given mole fractions, or
+        a single collider (None if neither are given).
+
+        :param collider: bath gas molecule collider
+        :type collider: str
+        :param mixture: mole fractions of the bath gases
+        :type mixture: dict[str: float]
+        :rtype: dict[str: float]
+    """
+
+    if mixture is None and collider is not None:
+        mixture = {collider: 1.0}
+
+    return mixture
+
+
+def _is_arrhenius_only(rxn):
+    """ Checks if a reaction only has pressure-independent Arrhenius
+        parameters.
+
+        :param rxn: record of the parsed reaction data
+        :type rxn: chemkin_io.parser.reaction.Reaction
+        :rtype: bool
+    """
+    return (rxn.pressure_region == 'indep' and
+            all(params is None
+                for params in (rxn.lowp, rxn.troe, rxn.cheb_alpha, rxn.plog)))
+
+
+def _is_plog_only(rxn):
+    """ Checks if a reaction is only described by PLOG parameters.
+
+        :param rxn: record of the parsed reaction data
+        :type rxn: chemkin_io.parser.reaction.Reaction
+        :rtype: bool
+    """
+    return (rxn.plog is not None and rxn.pressure_region != 'lowp' and
+            rxn.cheb_alpha is None)
+
+
+def _is_chebyshev_only(rxn):
+    """ Checks if a reaction is only described by Chebyshev parameters.
+
+        :param rxn: record of the parsed reaction data
+        :type rxn: chemkin_io.parser.reaction.Reaction
+        :rtype: bool
+    """
+    return (rxn.cheb_alpha is not None and rxn.pressure_region != 'lowp' and
+            rxn.plog is None)
+
+
+def _is_falloff_only(rxn):
+    """ Checks if a reaction is only described by Lindemann or Troe
+        falloff parameters.
+
+        :param rxn: record of the parsed reaction data
+        :type rxn: chemkin_io.parser.reaction.Reaction
+        :rtype: bool
+    """
+    return (rxn.lowp is not None and rxn.pressure_region == 'falloff' and
+            rxn.plog is None and rxn.cheb_alpha is None)
+
+
+def _stack_duplicates(rxns):
+    """ Stacks the Arrhenius and PLOG parameter sets of duplicate
+        entries of a reaction that can be evaluated together.
+
+        :param rxns: records of the duplicate entries of the reaction
+        :type rxns: list(chemkin_io.parser.reaction.Reaction)
+        :return: records with the stacked parameter sets
+        :rtype: list(chemkin_io.parser.reaction.Reaction)
+    """
+
+    def _kind(rxn):
+        """ key of the entries that can be stacked together (None if not)
+        """
+        if any(params is not None
+               for params in (rxn.lowp, rxn.troe, rxn.cheb_alpha)):
+            kind = None
+        else:
+            kind = (rxn.plog is not None, rxn.pressure_region,
+                    tuple(sorted(rxn.colliders.items())))
+        return kind
+
+    grouped_rxns, stacked_rxns = {}, []
+    for rxn in rxns:
+        kind = _kind(rxn)
+        if kind is None:
+            stacked_rxns.append(rxn)
+        elif kind not in grouped_rxns:
+            grouped_rxns[kind] = len(stacked_rxns)
+            stacked_rxns.append(rxn)
+        else:
+            idx = grouped_rxns[kind]
+            rxn0 = stacked_rxns[idx]
+            plog = (np.vstack((rxn0.plog, rxn.plog))
+                    if rxn.plog is not None else None)
+            if plog is not None:
+                plog = plog[np.argsort(plog[:, 0], kind='stable')]
+            stacked_rxns[idx] = rxn0._replace(
+                duplicate=True,
+                highp=np.vstack((rxn0.highp, rxn.highp)),
+                plog=plog)
+
+    return stacked_rxns
+
+
+# Rate calculators
+def _arrhenius(arr_params, temps, t_ref):
+    """ Calculates rate constants [k(T)]s with the Arrhenius expression
+        using the parameters parsed from the reaction string.
+
+        :param arr_params: Arrhenius fitting parameters from string
+        :type arr_params: list(float)
+        :param temps: Temps used to calculate high- and low-k(T)s
+        :type temps: numpy.ndarray
+        :param t_ref: Reference temperature (K)
+        :type t_ref: float
+        :return kts: k(T)s at all temps and pressures
+        :rtype: numpy.ndarray
+    """
+
+    kts = ratefit.calc.arrhenius(arr_params, t_ref, temps)
+
+    return kts
+
+
+def _plog(plog_params, temps, pressures, t_ref):
+    """ Calculates rate constants [k(T,P)]s with the PLOG expression
+        using the parameters parsed from the reaction string.
+
+        :param plog_params: PLOG fitting parameters from string
+        :type plog_params: dict[pressure: params]
+        :param temps: Temps used to calculate high- and low-k(T)s
+        :type temps: numpy.ndarray
+        :param pressures: Pressures used to calculate k(T,P)s
+        :type pressures: list(float)
+        :param t_ref: Reference temperature (K)
+        :type t_ref: float
+        :return ktp_dct: k(T,P)s at all temps and pressures
+        :rtype: dict[pressure: temps]
+    """
+
+    ktp_dct = ratefit.calc.plog(plog_params, t_ref, temps, pressures)
+
+    return ktp_dct
+
+
+def _chebyshev(alpha, limits, temps, pressures):
+    """ Calculates rate constants [k(T,P)]s with the Chebyshev expression
+        using the parameters parsed from the reaction string.
+
+        :param alpha: Chebyshev coefficient matrix
+        :type alpha: numpy.ndarray
+        :param limits: temperature and pressure limits [Tmin, Tmax, Pmin, Pmax]
+        :type limits: numpy.ndarray
+        :param temps: Temps used to calculate high- and low-k(T)s
+        :type temps: numpy.ndarray
+        :param pressures: Pressures used to calculate k(T,P)s
+        :type pressures: list(float)
+        :return ktp_dct: k(T,P)s at all temps and pressures
+        :rtype: dict[pressure: temps]
+    """
+
+    [tmin, tmax, pmin, pmax] = limits
+    ktp_dct = ratefit.calc.chebyshev(
+        alpha, tmin, tmax, pmin, pmax, temps, pressures)
+
+    return ktp_dct
+
+
+def _troe(troe_params, highp_ks, lowp_ks, temps, pressures, collid_factor=1.0):
+    """ Calculates rate constants [k(T,P)]s with the Troe expression
+        using the parameters parsed from the reaction string.
+
+        :param troe_params: Troe fitting parameters (T** is NaN if absent)
+        :type troe_params: numpy.ndarray
+        :param highp_ks: k(T)s determined at high-pressure
+        :type highp_ks: numpy.ndarray
+        :param lowp_ks: k(T)s determined at low-pressure
+        :type lowp_ks: numpy.ndarray
+        :param temps: Temps used to calculate high- and low-k(T)s
+        :type temps: numpy.ndarray
+        :param pressures: Pressures used to calculate k(T,P)s
+        :type pressures: list(float)
+        :return ktp_dct: k(T,P)s at all temps and pressures
+        :rtype: dict[pressure: temps]
+    """
+
+    if len(troe_params) == 4 and not np.isnan(troe_params[3]):
+        ts2 = troe_params[3]
+    else:
+        ts2 = None
+    ktp_dct = ratefit.calc.troe(
+        highp_ks, lowp_ks, temps, pressures,
+        troe_params[0], troe_params[1], troe_params[2], ts2=ts2,
+        collid_factor=collid_factor)
+
+    return ktp_dct
+
+
+def _normalize_records(rxns, rxn_units):
+    """ Converts the A and Ea fitting parameters of a list of records to
+        mol and kcal/mol. Fake high-pressure parameter sets are left as
+        they are, so that they can still be recognized.
+
+        All of the parameter sets of one kind (high-pressure, low-pressure
+        and PLOG) of all of the records are converted together with one
+        broadcast product; new records are returned.
+
+        :param rxns: records of the reactions
+        :type rxns: list(chemkin_io.parser.reaction.Reaction)
+        :param rxn_units: units for parameters specifies
+        :type rxn_units: str
+        :rtype: list(chemkin_io.parser.reaction.Reaction)
+    """
+
+    if rxn_units is None:
+        return list(rxns)
+    a_conv_factor, ea_conv_factor = kernel.unit_factors(rxn_units)
+    if a_conv_factor == 1.0 and ea_conv_factor == 1.0:
+        return list(rxns)
+
+    arr_factors = np.array([a_conv_factor, 1.0, ea_conv_factor])
+    highps = _scale_params([rxn.highp for rxn in rxns], arr_factors,
+                           keep_fake=True)
+    lowps = _scale_params([rxn.lowp for rxn in rxns], arr_factors)
+    plogs = _scale_params([rxn.plog for rxn in rxns],
+                          np.array([1.0, a_conv_factor, 1.0, ea_conv_factor]))
+
+    return [rxn._replace(highp=highp, lowp=lowp, plog=plog)
+            for rxn, highp, lowp, plog in zip(rxns, highps, lowps, plogs)]
+
+
+def _scale_params(params_lst, factors, keep_fake=False):
+    """ Multiplies the columns of many parameter arrays by a set of
+        factors, with a single product over all of their rows.
+
+        :param params_lst: parameter arrays (or None)
+        :type params_lst: list(numpy.ndarray)
+        :param factors: factor of each column
+        :type factors: numpy.ndarray
+        :param keep_fake: leave fake [1.0, 0.0, 0.0] rows unscaled
+        :type keep_fake: bool
+        :rtype: list(numpy.ndarray)
+    """
+
+    arrays = [params for params in params_lst if params is not None]
+    if not arrays:
+        return list(params_lst)
+
+    params = np.concatenate(arrays)
+    scaled = params * factors
+    if keep_fake:
+        fake = np.all(np.isclose(params, [1.0, 0.0, 0.0], rtol=0.0,
+                                 atol=1.0e-7), axis=1)
+        scaled[fake] = params[fake]
+    scaled_arrays = iter(np.split(
+        scaled, np.cumsum([len(array) for array in arrays])[:-1]))
+
+    return [next(scaled_arrays) if params is not None else None
+            for params in params_lst]
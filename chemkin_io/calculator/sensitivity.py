@@ -0,0 +1,133 @@
+""" sensitivities of the branching fractions and total rate constants
+    to the A factors of the reactions of a mechanism
+
+    Scaling "the A factor" of a reaction means scaling all of its rate
+    constants by the same factor at every T and P: the A of every
+    duplicate entry of an Arrhenius reaction, the A at every pressure of
+    a PLOG reaction, both the high-pressure and low-pressure A (A_inf and
+    A_0) of a Lindemann or Troe falloff reaction, and, for a Chebyshev
+    reaction, adding log10 of the factor to the alpha[0, 0] coefficient.
+"""
+
+import collections
+import numpy as np
+from chemkin_io.calculator import ktp
+from chemkin_io.calculator import rates
+
+
+SensitivityPairs = collections.namedtuple(
+    'SensitivityPairs', ('perturbed', 'responding', 'values'))
+
+
+def branching_fraction_sensitivities(mech_tensor):
+    """ Calculates the sensitivities of the branching fractions of every
+        reaction to the A factor of every reaction with the same
+        reactants, d BF_j / d ln A_i = BF_j (delta_ij - BF_i).
+
+        Since the rate constants are linear in A, these derivatives are
+        exact and are obtained from the rate constants alone, without
+        evaluating any rate expression. They are zero for reactions with
+        different reactants, so only the pairs with the same reactants
+        are stored.
+
+        :param mech_tensor: k(T,P)s for all reactions in the mechanism
+        :type mech_tensor: chemkin_io.calculator.ktp.KTPTensor
+        :return: positions of the perturbed (i) and responding (j)
+            reactions, and the sensitivities of each pair
+        :rtype: SensitivityPairs
+    """
+
+    branch_tensor, _ = rates.branching_fraction_tensors(mech_tensor)
+    perturbed, responding = _reaction_pairs(mech_tensor.reactions)
+
+    branch_vals = branch_tensor.values
+    sens_vals = -branch_vals[responding] * branch_vals[perturbed]
+    diag = perturbed == responding
+    sens_vals[diag] += branch_vals[perturbed[diag]]
+
+    return SensitivityPairs(
+        perturbed=perturbed, responding=responding, values=sens_vals)
+
+
+def perturbed_branching_fractions(mech_tensor, factor):
+    """ Calculates the branching fractions of every reaction after the A
+        factor of one reaction with the same reactants is multiplied by a
+        factor, for every such reaction in turn:
+
+            BF_j' = BF_j (1 + (f - 1) delta_ij) / (1 + (f - 1) BF_i)
+
+        :param mech_tensor: k(T,P)s for all reactions in the mechanism
+        :type mech_tensor: chemkin_io.calculator.ktp.KTPTensor
+        :param factor: factor multiplying the A factor
+        :type factor: float
+        :return: positions of the perturbed (i) and responding (j)
+            reactions, and the branching fractions of each pair
+        :rtype: SensitivityPairs
+    """
+
+    branch_tensor, _ = rates.branching_fraction_tensors(mech_tensor)
+    perturbed, responding = _reaction_pairs(mech_tensor.reactions)
+
+    branch_vals = branch_tensor.values
+    pert_vals = branch_vals[responding] / (
+        1.0 + (factor - 1.0) * branch_vals[perturbed])
+    pert_vals[perturbed == responding] *= factor
+
+    return SensitivityPairs(
+        perturbed=perturbed, responding=responding, values=pert_vals)
+
+
+def total_rate_sensitivities(mech_tensor):
+    """ Calculates the sensitivities of the total rate constant of the
+        reactants of every reaction to the A factor of that reaction,
+        d ln k_tot / d ln A_i = BF_i.
+
+        :param mech_tensor: k(T,P)s for all reactions in the mechanism
+        :type mech_tensor: chemkin_io.calculator.ktp.KTPTensor
+        :return: sensitivities labelled by the perturbed reactions
+        :rtype: chemkin_io.calculator.ktp.KTPTensor
+    """
+    branch_tensor, _ = rates.branching_fraction_tensors(mech_tensor)
+    return branch_tensor
+
+
+def sensitivity_tensor(mech_tensor, sens_pairs, rxn):
+    """ Gets the values for all of the reactions responding to the
+        perturbation of one reaction.
+
+        :param mech_tensor: k(T,P)s for all reactions in the mechanism
+        :type mech_tensor: chemkin_io.calculator.ktp.KTPTensor
+        :param sens_pairs: values for the pairs of reactions
+        :type sens_pairs: SensitivityPairs
+        :param rxn: perturbed reaction
+        :type rxn: tuple
+        :return: values labelled by the responding reactions
+        :rtype: chemkin_io.calculator.ktp.KTPTensor
+    """
+
+    pairs = sens_pairs.perturbed == mech_tensor.reaction_index[rxn]
+
+    return ktp.KTPTensor(
+        sens_pairs.values[pairs],
+        [mech_tensor.reactions[idx] for idx in sens_pairs.responding[pairs]],
+        mech_tensor.pressures, mech_tensor.temps)
+
+
+def _reaction_pairs(rxns):
+    """ Positions of all (perturbed, responding) pairs of reactions
+        with the same reactants, grouped by the perturbed reaction.
+    """
+
+    grp_ids, _ = rates.reactant_groups(rxns)
+    order = np.argsort(grp_ids, kind='stable')
+    sizes = np.bincount(grp_ids)
+    starts = np.cumsum(sizes) - sizes
+
+    # Each reaction is paired with all the members of its group
+    nreps = sizes[grp_ids[order]]
+    perturbed = np.repeat(order, nreps)
+    members = np.arange(nreps.sum()) - np.repeat(np.cumsum(nreps) - nreps,
+                                                 nreps)
+    responding = order[np.repeat(starts[grp_ids[order]], nreps) + members]
+
+    return perturbed, responding
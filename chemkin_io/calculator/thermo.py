@@ -2,6 +2,7 @@
 """
 
 
+import collections
 import numpy as np
 from ioformat import phycon
 from chemkin_io.parser import thermo as thm_parser
@@ -21,23 +22,173 @@ def mechanism(block_str, temps, rval=phycon.RC):
         :rtype: dict[spc: [[H(T)], [Cp(T)], [S(T)], [G(T)]]]
     """
 
-    nasa_dct = thm_parser.data_dct(block_str)
+    thm_tbl = thm_parser.coefficient_table(block_str)
 
-    mech_thermo_dct = {}
-    for name, thermo_dstr in nasa_dct.items():
-        # print('dstr\n', thermo_dstr)
-        h_t, cp_t, s_t, g_t, = [], [], [], []
-        for temp in temps:
-            h_t.append(enthalpy(thermo_dstr, temp, rval=rval))
-            cp_t.append(heat_capacity(thermo_dstr, temp, rval=rval))
-            s_t.append(entropy(thermo_dstr, temp, rval=rval))
-            g_t.append(gibbs(thermo_dstr, temp, rval=rval))
+    return mechanism_from_table(thm_tbl, temps, rval=rval)
 
-        mech_thermo_dct[name] = [h_t, cp_t, s_t, g_t]
+
+def mechanism_from_table(thm_tbl, temps, rval=phycon.RC):
+    """ Uses the already-parsed NASA polynomials of all the species in
+        the thermo block of a mechanism file to calculate
+        thermochemical values: H(T), Cp(T), S(T), G(T).
+
+        :param thm_tbl: temperatures and coefficients of all species
+        :type thm_tbl: chemkin_io.parser.thermo.ThermoCoefficients
+        :param temps: temperatures to calculate Thermo quantities (K)
+        :type temps: list(float)
+        :return mech_thermo_dct: dct of thermo data [H(T), Cp(T), S(T), G(T)]
+        :rtype: dict[spc: numpy.ndarray]
+    """
+
+    thm_vals = properties(thm_tbl.cfts, thm_tbl.temps, temps, rval=rval)
+    mech_thermo_dct = dict(zip(thm_tbl.names, thm_vals))
 
     return mech_thermo_dct
 
 
+def properties(cfts, thm_temps, temps, rval=phycon.RC):
+    """ Calculates H(T), Cp(T), S(T) and G(T) of many species at many
+        temperatures at once from the coefficient arrays of their
+        NASA polynomials. The low-temperature coefficients are used
+        up to the common temperature, the high-temperature ones above it,
+        and values outside the range of a polynomial are set to NaN.
+
+        :param cfts: low and high temperature coefficients of the species
+        :type cfts: numpy.ndarray (nspc, 2, 7)
+        :param thm_temps: low, high and common temperatures of the species
+        :type thm_temps: numpy.ndarray (nspc, 3)
+        :param temps: temperatures to calculate Thermo quantities (K)
+        :type temps: list(float)
+        :return thm_vals: H(T), Cp(T), S(T), G(T) of all species
+        :rtype: numpy.ndarray (nspc, 4, ntemps)
+    """
+
+    cfts = np.asarray(cfts, dtype=float)
+    thm_temps = np.asarray(thm_temps, dtype=float)
+    temps = np.asarray(temps, dtype=float)
+
+    # Choose the coefficients at each temperature: (nspc, ntemps, 7)
+    use_high = temps[np.newaxis, :] > thm_temps[:, 2:3]
+    temp_cfts = np.where(
+        use_high[..., np.newaxis],
+        cfts[:, np.newaxis, 1], cfts[:, np.newaxis, 0])
+    in_range = ((temps[np.newaxis, :] >= thm_temps[:, 0:1]) &
+                (temps[np.newaxis, :] <= thm_temps[:, 1:2]))
+
+    # Powers of the temperatures: T^0 to T^4, (ntemps, 5)
+    temp_pows = temps[:, np.newaxis] ** np.arange(5)
+    poly_cfts = temp_cfts[..., :5]
+
+    cp_t = np.einsum('stk,tk->st', poly_cfts, temp_pows)
+    h_t = (np.einsum('stk,tk->st', poly_cfts, temp_pows / np.arange(1, 6)) +
+           temp_cfts[..., 5] / temps)
+    s_t = (temp_cfts[..., 0] * np.log(temps) +
+           np.einsum('stk,tk->st', poly_cfts[..., 1:],
+                     temp_pows[:, 1:] / np.arange(1, 5)) +
+           temp_cfts[..., 6])
+
+    h_t *= rval * temps
+    cp_t *= rval
+    s_t *= rval
+    g_t = h_t - s_t * temps
+
+    thm_vals = np.where(in_range[:, np.newaxis],
+                        np.stack((h_t, cp_t, s_t, g_t), axis=1), np.nan)
+
+    return thm_vals
+
+
+# Lazily evaluated thermo values of the species in a thermo block
+class ThermoTable(collections.abc.Mapping):
+    """ Read-only mapping of the species in a thermo block to their
+        thermochemical values [H(T), Cp(T), S(T), G(T)] at a set of
+        temperatures, with the same values as mechanism().
+
+        The NASA polynomials are parsed into one coefficient table when
+        the mapping is built, but the values of a species are only
+        evaluated when the species is first accessed. The values are kept
+        in a least-recently-used cache keyed by the species name and the
+        temperature grid, holding at most maxsize entries.
+
+        :param thm_tbl: thermo block string, or its parsed coefficients
+        :type thm_tbl: str or chemkin_io.parser.thermo.ThermoCoefficients
+        :param temps: temperatures to calculate Thermo quantities (K)
+        :type temps: list(float)
+        :param rval: ideal gas constant used for the thermo quantities
+        :type rval: float
+        :param maxsize: maximum number of (species, temps) entries cached
+        :type maxsize: int
+    """
+
+    def __init__(self, thm_tbl, temps, rval=phycon.RC, maxsize=4096):
+        if isinstance(thm_tbl, str):
+            thm_tbl = thm_parser.coefficient_table(thm_tbl)
+        self.coefficients = thm_tbl
+        self.temps = tuple(map(float, temps))
+        self.rval = rval
+        self.maxsize = maxsize
+        self._cache = collections.OrderedDict()
+        self._hits, self._misses = 0, 0
+
+    def __getitem__(self, name):
+        return self.evaluate(name)
+
+    def __iter__(self):
+        return iter(self.coefficients.index)
+
+    def __len__(self):
+        return len(self.coefficients.index)
+
+    def __contains__(self, name):
+        return name in self.coefficients.index
+
+    def evaluate(self, name, temps=None):
+        """ Thermochemical values of a species, evaluated at the
+            temperatures of the table unless others are given.
+
+            :param name: name of the species
+            :type name: str
+            :param temps: temperatures to calculate Thermo quantities (K)
+            :type temps: list(float)
+            :return: H(T), Cp(T), S(T), G(T) of the species (read-only)
+            :rtype: numpy.ndarray (4, ntemps)
+        """
+
+        temps = self.temps if temps is None else tuple(map(float, temps))
+        key = (name, temps)
+        if key in self._cache:
+            self._hits += 1
+            self._cache.move_to_end(key)
+            thm_vals = self._cache[key]
+        else:
+            self._misses += 1
+            row = self.coefficients.index[name]
+            thm_vals = properties(
+                self.coefficients.cfts[row:row+1],
+                self.coefficients.temps[row:row+1],
+                temps, rval=self.rval)[0]
+            thm_vals.setflags(write=False)
+            self._cache[key] = thm_vals
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+        return thm_vals
+
+    def cache_info(self):
+        """ Statistics of the cache, as for functools.lru_cache.
+
+            :return: hits, misses, maxsize and current size of the cache
+            :rtype: (int, int, int, int)
+        """
+        return (self._hits, self._misses, self.maxsize, len(self._cache))
+
+    def cache_clear(self):
+        """ Remove all of the evaluated values from the cache.
+        """
+        self._cache.clear()
+        self._hits, self._misses = 0, 0
+
+
 def enthalpy(thm_dstr, temp, rval=phycon.RC):
     """ Calculate the Enthalpy [H(T)] of a species using the
         coefficients of its NASA polynomial.
@@ -52,20 +203,7 @@ def enthalpy(thm_dstr, temp, rval=phycon.RC):
 
     cfts = _coefficients_for_specific_temperature(thm_dstr, temp)
 
-    if cfts is not None:
-        h_t = (
-            cfts[0] +
-            ((cfts[1] * temp) / 2.0) +
-            ((cfts[2] * temp**2) / 3.0) +
-            ((cfts[3] * temp**3) / 4.0) +
-            ((cfts[4] * temp**4) / 5.0) +
-            (cfts[5] / temp)
-        )
-        h_t *= (rval * temp)
-    else:
-        h_t = None
-
-    return h_t
+    return _enthalpy(cfts, temp, rval)
 
 
 def heat_capacity(thm_dstr, temp, rval=phycon.RC):
@@ -81,19 +219,7 @@ def heat_capacity(thm_dstr, temp, rval=phycon.RC):
     """
     cfts = _coefficients_for_specific_temperature(thm_dstr, temp)
 
-    if cfts is not None:
-        cp_t = (
-            cfts[0] +
-            (cfts[1] * temp) +
-            (cfts[2] * temp**2) +
-            (cfts[3] * temp**3) +
-            (cfts[4] * temp**4)
-        )
-        cp_t *= rval
-    else:
-        cp_t = None
-
-    return cp_t
+    return _heat_capacity(cfts, temp, rval)
 
 
 def entropy(thm_dstr, temp, rval=phycon.RC):
@@ -108,20 +234,7 @@ def entropy(thm_dstr, temp, rval=phycon.RC):
     """
     cfts = _coefficients_for_specific_temperature(thm_dstr, temp)
 
-    if cfts is not None:
-        s_t = (
-            (cfts[0] * np.log(temp)) +
-            (cfts[1] * temp) +
-            ((cfts[2] * temp**2) / 2.0) +
-            ((cfts[3] * temp**3) / 3.0) +
-            ((cfts[4] * temp**4) / 4.0) +
-            (cfts[6])
-        )
-        s_t *= rval
-    else:
-        s_t = None
-
-    return s_t
+    return _entropy(cfts, temp, rval)
 
 
 def gibbs(thm_dstr, temp, rval=phycon.RC):
@@ -136,14 +249,9 @@ def gibbs(thm_dstr, temp, rval=phycon.RC):
         :rtype: float
     """
 
-    h_t = enthalpy(thm_dstr, temp, rval=rval)
-    s_t = entropy(thm_dstr, temp, rval=rval)
-    if h_t is not None and s_t is not None:
-        g_t = h_t - (s_t * temp)
-    else:
-        g_t = None
+    cfts = _coefficients_for_specific_temperature(thm_dstr, temp)
 
-    return g_t
+    return _gibbs(cfts, temp, rval)
 
 
 def _coefficients_for_specific_temperature(thm_dstr, temp):
@@ -161,11 +269,85 @@ def _coefficients_for_specific_temperature(thm_dstr, temp):
     """
 
     temps = thm_parser.temperatures(thm_dstr)
-    if temps[0] <= temp <= temps[1]:
+    if temps[0] <= temp <= temps[2]:
         cfts = thm_parser.low_coefficients(thm_dstr)
-    elif temps[1] < temp < temps[2]:
+    elif temps[2] < temp <= temps[1]:
         cfts = thm_parser.high_coefficients(thm_dstr)
     else:
         cfts = None
 
     return cfts
+
+
+# Thermo expressions evaluated with the coefficients of a NASA polynomial
+def _enthalpy(cfts, temp, rval):
+    """ Enthalpy [H(T)] from NASA polynomial coefficients (None if absent)
+    """
+
+    if cfts is not None:
+        h_t = (
+            cfts[0] +
+            ((cfts[1] * temp) / 2.0) +
+            ((cfts[2] * temp**2) / 3.0) +
+            ((cfts[3] * temp**3) / 4.0) +
+            ((cfts[4] * temp**4) / 5.0) +
+            (cfts[5] / temp)
+        )
+        h_t *= (rval * temp)
+    else:
+        h_t = None
+
+    return h_t
+
+
+def _heat_capacity(cfts, temp, rval):
+    """ Heat Capacity [Cp(T)] from NASA polynomial coefficients
+    """
+
+    if cfts is not None:
+        cp_t = (
+            cfts[0] +
+            (cfts[1] * temp) +
+            (cfts[2] * temp**2) +
+            (cfts[3] * temp**3) +
+            (cfts[4] * temp**4)
+        )
+        cp_t *= rval
+    else:
+        cp_t = None
+
+    return cp_t
+
+
+def _entropy(cfts, temp, rval):
+    """ Entropy [S(T)] from NASA polynomial coefficients
+    """
+
+    if cfts is not None:
+        s_t = (
+            (cfts[0] * np.log(temp)) +
+            (cfts[1] * temp) +
+            ((cfts[2] * temp**2) / 2.0) +
+            ((cfts[3] * temp**3) / 3.0) +
+            ((cfts[4] * temp**4) / 4.0) +
+            (cfts[6])
+        )
+        s_t *= rval
+    else:
+        s_t = None
+
+    return s_t
+
+
+def _gibbs(cfts, temp, rval):
+    """ Gibbs Free Energy [G(T)] from NASA polynomial coefficients
+    """
+
+    h_t = _enthalpy(cfts, temp, rval)
+    s_t = _entropy(cfts, temp, rval)
+    if h_t is not None and s_t is not None:
+        g_t = h_t - (s_t * temp)
+    else:
+        g_t = None
+
+    return g_t
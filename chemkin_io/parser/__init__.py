@@ -5,11 +5,15 @@ from chemkin_io.parser import mechanism
 from chemkin_io.parser import species
 from chemkin_io.parser import reaction
 from chemkin_io.parser import thermo
+from chemkin_io.parser import conversion
+from chemkin_io.parser import cache
 
 
 __all__ = [
     'mechanism',
     'species',
     'reaction',
-    'thermo'
+    'thermo',
+    'conversion',
+    'cache'
 ]
@@ -0,0 +1,267 @@
+""" on-disk cache of the data parsed from mechanism and species files
+"""
+
+import os
+import pickle
+import hashlib
+import tempfile
+from ioformat import remove_whitespace
+from chemkin_io.parser import mechanism as mech_parser
+from chemkin_io.parser import reaction as rxn_parser
+from chemkin_io.parser import thermo as thm_parser
+from chemkin_io.parser import conversion
+
+
+# Bump whenever the layout of any of the cached objects changes
+PARSER_VERSION = '4'
+CACHE_EXT = '.pkl'
+DEFAULT_MAX_SIZE = 2**30
+
+
+# Cached parsers for the mechanism and species.csv strings
+def reaction_data(mech_str, remove_bad_fits=False,
+                  cache_dir=None, max_size=DEFAULT_MAX_SIZE):
+    """ Parses the Reaction records and parameter units from the
+        reaction block of a mechanism input file, reading them from
+        the cache if this mechanism has already been parsed.
+
+        :param mech_str: string of mechanism input file
+        :type mech_str: str
+        :param remove_bad_fits: remove reactions with bad fits
+        :type remove_bad_fits: bool
+        :param cache_dir: directory of the cache; no caching if None
+        :type cache_dir: str
+        :param max_size: maximum total size of the cache files (bytes)
+        :type max_size: int
+        :return: reaction records and units of the fitting parameters
+        :rtype: (dict[reaction: list(Reaction)], (str, str))
+    """
+
+    def _parse():
+        """ parse the reaction records and units
+        """
+        rxn_dct = rxn_parser.data_dct(
+            remove_whitespace(mech_parser.reaction_block(mech_str)),
+            data_entry='records', remove_bad_fits=remove_bad_fits)
+        return rxn_dct, mech_parser.reaction_units(mech_str)
+
+    return cached(_parse, ('reactions', remove_bad_fits), mech_str,
+                  cache_dir=cache_dir, max_size=max_size)
+
+
+def thermo_data(mech_str, cache_dir=None, max_size=DEFAULT_MAX_SIZE):
+    """ Parses the NASA polynomial temperatures and coefficients of
+        all species in the thermo block of a mechanism input file,
+        reading them from the cache if this mechanism was already parsed.
+
+        :param mech_str: string of mechanism input file
+        :type mech_str: str
+        :param cache_dir: directory of the cache; no caching if None
+        :type cache_dir: str
+        :param max_size: maximum total size of the cache files (bytes)
+        :type max_size: int
+        :return: names, temperatures and coefficients of all species
+            (None if the mechanism has no thermo block)
+        :rtype: chemkin_io.parser.thermo.ThermoCoefficients
+    """
+
+    def _parse():
+        """ parse the thermo data, if there is a thermo block
+        """
+        block_str = mech_parser.thermo_block(mech_str)
+        return (thm_parser.coefficient_table(remove_whitespace(block_str))
+                if block_str is not None else None)
+
+    return cached(_parse, ('thermo',), mech_str,
+                  cache_dir=cache_dir, max_size=max_size)
+
+
+def species_data(csv_str, entry, cache_dir=None, max_size=DEFAULT_MAX_SIZE):
+    """ Reads the species.csv file into a dictionary relating the
+        ChemKin mechanism name to the desired entry, reading the
+        dictionary from the cache if this file was already read.
+
+        :param csv_str: string of input csv file with species information
+        :type csv_str: str
+        :param entry: structural information that is desired
+        :type entry: str
+        :param cache_dir: directory of the cache; no caching if None
+        :type cache_dir: str
+        :param max_size: maximum total size of the cache files (bytes)
+        :type max_size: int
+        :return spc_dct: all species with desired structural information
+        :rtype: dict[name:entry]
+    """
+    return cached(lambda: mech_parser.spc_name_dct(
+                      csv_str, entry, cache_dir=cache_dir),
+                  ('species', entry), csv_str,
+                  cache_dir=cache_dir, max_size=max_size)
+
+
+def species_table(csv_str, cache_dir=None, max_size=DEFAULT_MAX_SIZE):
+    """ Reads the species.csv file into a SpeciesTable, reading the
+        table from the cache if this file was already read.
+
+        :param csv_str: string of input csv file with species information
+        :type csv_str: str
+        :param cache_dir: directory of the cache; no caching if None
+        :type cache_dir: str
+        :param max_size: maximum total size of the cache files (bytes)
+        :type max_size: int
+        :rtype: chemkin_io.parser.mechanism.SpeciesTable
+    """
+    return cached(lambda: mech_parser.SpeciesTable(
+                      csv_str, cache_dir=cache_dir),
+                  ('species_table',), csv_str,
+                  cache_dir=cache_dir, max_size=max_size)
+
+
+def warm(csv_str, cache_dir, workers=None):
+    """ Fills the SMILES/InChI conversion cache with all of the species of
+        a species.csv file in one batch: the SMILES strings are converted
+        to InChI strings and the InChI strings to SMILES strings. Only
+        the strings that are not in the cache yet are converted, by a
+        pool of processes if workers > 1.
+
+        :param csv_str: string of input csv file with species information
+        :type csv_str: str
+        :param cache_dir: directory of the cache
+        :type cache_dir: str
+        :param workers: number of processes used for the conversions
+        :type workers: int
+        :return: number of conversions stored in the cache of each kind
+        :rtype: dict[str: int]
+    """
+
+    columns = mech_parser.SpeciesTable(csv_str).columns
+    for col, kind in (('smiles', 'smiles_to_inchi'),
+                      ('inchi', 'inchi_to_smiles')):
+        if col in columns:
+            conversion.convert(
+                [val for val in columns[col] if isinstance(val, str)], kind,
+                cache_dir=cache_dir, workers=workers)
+
+    return conversion.cache_size(cache_dir)
+
+
+# Functions to store and load the objects in the cache directory
+def cached(parse_fxn, tags, string, cache_dir=None,
+           max_size=DEFAULT_MAX_SIZE):
+    """ Returns the object built by a parsing function, loading it
+        from the cache directory when an entry for the same string
+        content, tags and parser version exists. Otherwise, the function
+        is called and its result is written to the cache.
+
+        :param parse_fxn: function that parses the string (no arguments)
+        :type parse_fxn: function
+        :param tags: extra keys describing what is parsed from the string
+        :type tags: tuple
+        :param string: string that is parsed
+        :type string: str
+        :param cache_dir: directory of the cache; no caching if None
+        :type cache_dir: str
+        :param max_size: maximum total size of the cache files (bytes)
+        :type max_size: int
+        :return: the parsed object
+    """
+
+    if cache_dir is None:
+        return parse_fxn()
+
+    path = os.path.join(cache_dir, cache_key(string, tags) + CACHE_EXT)
+    obj = load(path)
+    if obj is None:
+        obj = parse_fxn()
+        store(path, obj)
+        evict(cache_dir, max_size)
+
+    return obj
+
+
+def cache_key(string, tags=()):
+    """ Builds the key of a cache entry from the SHA-256 hash of the
+        parser version, the tags and the string content.
+
+        :param string: string that is parsed
+        :type string: str
+        :param tags: extra keys describing what is parsed from the string
+        :type tags: tuple
+        :rtype: str
+    """
+
+    sha = hashlib.sha256()
+    sha.update(repr((PARSER_VERSION,) + tuple(tags)).encode())
+    sha.update(string.encode('utf8', errors='ignore'))
+
+    return sha.hexdigest()
+
+
+def load(path):
+    """ Loads an object from a cache file, updating its modification time
+        so that it counts as recently used. Returns None if the file does
+        not exist or cannot be read.
+
+        :param path: path to the cache file
+        :type path: str
+    """
+
+    try:
+        with open(path, 'rb') as cache_file:
+            obj = pickle.load(cache_file)
+        os.utime(path)
+    except (OSError, EOFError, pickle.UnpicklingError,
+            AttributeError, ImportError):
+        obj = None
+
+    return obj
+
+
+def store(path, obj):
+    """ Writes an object to a cache file. The object is written to a
+        temporary file first, so other processes never read partial files.
+
+        :param path: path to the cache file
+        :type path: str
+        :param obj: object to store
+    """
+
+    cache_dir = os.path.dirname(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    fdesc, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fdesc, 'wb') as tmp_file:
+            pickle.dump(obj, tmp_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def evict(cache_dir, max_size=DEFAULT_MAX_SIZE):
+    """ Removes the least recently used cache files until the total size
+        of the files in the cache directory is within the maximum size.
+
+        :param cache_dir: directory of the cache
+        :type cache_dir: str
+        :param max_size: maximum total size of the cache files (bytes)
+        :type max_size: int
+    """
+
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(CACHE_EXT):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total_size -= size
@@ -0,0 +1,180 @@
+""" conversions between the SMILES and InChI strings of species, stored
+    in a persistent on-disk cache shared by all processes
+"""
+
+import os
+import sqlite3
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from automol.smiles import inchi as _inchi
+from automol.inchi import smiles as _smiles
+
+
+# Bump whenever the conversion functions change their results
+CONVERSION_VERSION = '1'
+CONVERSION_DB_NAME = 'conversions.sqlite'
+CONVERTERS = {
+    'smiles_to_inchi': _inchi,
+    'inchi_to_smiles': _smiles,
+}
+
+
+def smiles_to_inchi(smiles_lst, cache_dir=None, workers=None):
+    """ Converts many SMILES strings into InChI strings.
+
+        :param smiles_lst: SMILES strings
+        :type smiles_lst: list(str)
+        :param cache_dir: directory of the cache; no caching if None
+        :type cache_dir: str
+        :param workers: number of processes used for the conversions that
+            are not in the cache
+        :type workers: int
+        :rtype: list(str)
+    """
+    return convert(smiles_lst, 'smiles_to_inchi',
+                   cache_dir=cache_dir, workers=workers)
+
+
+def inchi_to_smiles(ichs, cache_dir=None, workers=None):
+    """ Converts many InChI strings into SMILES strings.
+
+        :param ichs: InChI strings
+        :type ichs: list(str)
+        :param cache_dir: directory of the cache; no caching if None
+        :type cache_dir: str
+        :param workers: number of processes used for the conversions that
+            are not in the cache
+        :type workers: int
+        :rtype: list(str)
+    """
+    return convert(ichs, 'inchi_to_smiles',
+                   cache_dir=cache_dir, workers=workers)
+
+
+def convert(strings, kind, cache_dir=None, workers=None):
+    """ Converts many strings with one of the converters, looking up all of
+        them in the cache with one query. The strings that are missing
+        are converted together (by a pool of processes if workers > 1)
+        and are then added to the cache.
+
+        The cache is keyed by the content of the strings, so it is shared
+        by all mechanisms and species files. Values that are not strings
+        (e.g., NaN for empty cells) are passed to the converter as they
+        are and are not cached.
+
+        :param strings: strings to convert
+        :type strings: list(str)
+        :param kind: 'smiles_to_inchi' or 'inchi_to_smiles'
+        :type kind: str
+        :param cache_dir: directory of the cache; no caching if None
+        :type cache_dir: str
+        :param workers: number of processes used for the conversions that
+            are not in the cache
+        :type workers: int
+        :rtype: list(str)
+    """
+
+    if kind not in CONVERTERS:
+        raise NotImplementedError
+
+    strings = list(strings)
+    keys = list(dict.fromkeys(
+        string for string in strings if isinstance(string, str)))
+
+    conv_dct = {}
+    if cache_dir is not None and keys:
+        with _connect(cache_dir) as conn:
+            conv_dct = _lookup(conn, kind, keys)
+
+    # Convert the misses in one batch and store them
+    misses = [key for key in keys if key not in conv_dct]
+    if misses:
+        new_conv_dct = dict(zip(misses, _map(CONVERTERS[kind], misses,
+                                             workers=workers)))
+        if cache_dir is not None:
+            with _connect(cache_dir) as conn:
+                conn.executemany(
+                    'INSERT OR IGNORE INTO conversions VALUES (?, ?, ?, ?)',
+                    [(CONVERSION_VERSION, kind, key, val)
+                     for key, val in new_conv_dct.items()])
+        conv_dct.update(new_conv_dct)
+
+    return [conv_dct[string] if isinstance(string, str)
+            else CONVERTERS[kind](string)
+            for string in strings]
+
+
+def cache_size(cache_dir):
+    """ Number of conversions stored in the cache of each kind.
+
+        :param cache_dir: directory of the cache
+        :type cache_dir: str
+        :rtype: dict[str: int]
+    """
+
+    with _connect(cache_dir) as conn:
+        rows = conn.execute(
+            'SELECT kind, COUNT(*) FROM conversions WHERE version = ? '
+            'GROUP BY kind', (CONVERSION_VERSION,)).fetchall()
+
+    return dict(rows)
+
+
+@contextlib.contextmanager
+def _connect(cache_dir):
+    """ Opens the cache database, creating it if it does not exist yet.
+        The changes are committed if the block succeeds and rolled back
+        otherwise. Writers take turns through the locks of SQLite, and
+        readers are not blocked by them.
+
+        :param cache_dir: directory of the cache
+        :type cache_dir: str
+        :rtype: sqlite3.Connection
+    """
+
+    os.makedirs(cache_dir, exist_ok=True)
+    conn = sqlite3.connect(
+        os.path.join(cache_dir, CONVERSION_DB_NAME), timeout=60.0)
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        with conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS conversions ('
+                'version TEXT, kind TEXT, key TEXT, value TEXT, '
+                'PRIMARY KEY (version, kind, key))')
+            yield conn
+    finally:
+        conn.close()
+
+
+def _lookup(conn, kind, keys, batch_size=500):
+    """ Reads the cached conversions of many strings, in batches that fit
+        into the limits of SQLite on the number of query parameters.
+    """
+
+    conv_dct = {}
+    for start in range(0, len(keys), batch_size):
+        batch = keys[start:start+batch_size]
+        marks = ', '.join('?' * len(batch))
+        rows = conn.execute(
+            'SELECT key, value FROM conversions '
+            f'WHERE version = ? AND kind = ? AND key IN ({marks})',
+            [CONVERSION_VERSION, kind] + batch).fetchall()
+        conv_dct.update(rows)
+
+    return conv_dct
+
+
+def _map(fxn, strings, workers=None):
+    """ Applies a conversion function to many strings, with a pool of
+        processes if workers > 1.
+    """
+
+    if workers is not None and workers > 1 and len(strings) > 1:
+        chunksize = max(1, len(strings) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            vals = list(executor.map(fxn, strings, chunksize=chunksize))
+    else:
+        vals = list(map(fxn, strings))
+
+    return vals
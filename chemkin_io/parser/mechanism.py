@@ -1,14 +1,21 @@
 """ functions operating on the mechanism string
 """
 
+import re
+import mmap
+import types
 from io import StringIO
 import pandas
 import autoparse.pattern as app
 import autoparse.find as apf
-from automol.smiles import inchi as _inchi
-from automol.inchi import smiles as _smiles
 from ioformat import remove_comment_lines
 from ioformat import remove_whitespace
+from chemkin_io.parser import reaction as rxn_parser
+from chemkin_io.parser import conversion
+
+
+END_REGEX = re.compile(rb'(?<!\S)END(?!\S)')
+FIT_INFO_REGEX = re.compile(r'![ \t]+Pressure:')
 
 
 def species_block(mech_str, remove_comments=True):
@@ -72,6 +79,72 @@ def thermo_block(mech_str, remove_comments=True):
     return block_str
 
 
+def iter_reactions(mech_path, data_entry='records', remove_bad_fits=False):
+    """ Streams the reactions block of a mechanism input file line-by-line
+        and yields the reactions one at a time, so that the full mechanism
+        never needs to be held in memory.
+
+        Comments are removed and the auxiliary lines following a chemical
+        equation are kept with that reaction as the file is read. As in
+        reaction_block, the '! Pressure:' lines describing the rate
+        constant fits are kept, so bad fits can be removed.
+
+        :param mech_path: path to the mechanism input file
+        :type mech_path: str
+        :param data_entry: type of object yielded for each reaction
+        :type data_entry: str
+        :param remove_bad_fits: skip reactions with bad fits
+        :type remove_bad_fits: bool
+        :return: data string or Reaction record for each reaction
+        :rtype: generator(str or Reaction)
+    """
+
+    if data_entry == 'strings':
+        _build = str
+    elif data_entry == 'records':
+        _build = rxn_parser.reaction_record
+    else:
+        raise NotImplementedError
+
+    def _finish(rxn_lines):
+        """ join the lines of the current reaction, or None if it is bad
+        """
+        rxn_dstr = '\n'.join(rxn_lines)
+        if remove_bad_fits and any(string in rxn_dstr
+                                   for string in rxn_parser.BAD_STRS):
+            rxn_dstr = None
+        return rxn_dstr
+
+    with open(mech_path, encoding='utf8', errors='ignore') as mech_file:
+        # Skip ahead to the line that begins the reactions block
+        for line in mech_file:
+            words = line.split('!')[0].split()
+            if words and words[0].upper().startswith('REAC'):
+                break
+
+        rxn_lines = []
+        for line in mech_file:
+            line = FIT_INFO_REGEX.sub('Pressure:', line)
+            line = line.split('!')[0].strip()
+            if not line:
+                continue
+            if line.split()[0].upper() == 'END':
+                break
+            if '=' in line:
+                if rxn_lines:
+                    rxn_dstr = _finish(rxn_lines)
+                    if rxn_dstr is not None:
+                        yield _build(rxn_dstr)
+                rxn_lines = [line]
+            elif rxn_lines:
+                rxn_lines.append(line)
+
+        if rxn_lines:
+            rxn_dstr = _finish(rxn_lines)
+            if rxn_dstr is not None:
+                yield _build(rxn_dstr)
+
+
 def _block(string, start_pattern, end_pattern):
     """ return a block delimited by start and end patterns
     """
@@ -144,6 +217,187 @@ def reaction_units(mech_str):
     return units
 
 
+# Memory-mapped index of the blocks and reactions in a mechanism file
+class MechanismIndex():
+    """ Memory-maps a mechanism input file and records, in one pass,
+        the byte offsets of the SPECIES, THERMO and REACTIONS blocks and
+        of the header line of every reaction. Blocks and single reactions
+        are then served from slices of the map, so that reaction N can be
+        read without parsing any of the reactions before it.
+
+        Only block_view and reaction_view are zero-copy: they return
+        memoryviews of the raw bytes. block and reaction decode their
+        slice and clean it up as the string parsers do, which copies it;
+        cleaned blocks are kept for later calls, but reaction cleans up
+        the reaction again on every call.
+
+        The map cannot be closed while any memoryview returned by the
+        *_view methods is alive: close() then raises BufferError. Release
+        the views first (view.release(), or use them in a with block).
+
+        :param mech_path: path to the mechanism input file
+        :type mech_path: str
+    """
+
+    BLOCK_KEYS = ((b'SPEC', 'species'), (b'THER', 'thermo'),
+                  (b'REAC', 'reactions'))
+
+    def __init__(self, mech_path):
+        with open(mech_path, 'rb') as mech_file:
+            self._map = mmap.mmap(
+                mech_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.block_offsets = {}
+        self.reaction_offsets = []
+        self._units_line = ''
+        self._cleaned_blocks = {}
+        self._index()
+
+    def _index(self):
+        """ Scan the file once to find the offsets of the blocks and of
+            the reaction headers within the REACTIONS block.
+        """
+
+        current, start = None, None
+        headers = []
+        pos = 0
+        for line in iter(self._map.readline, b''):
+            code = line.split(b'!')[0].upper()
+            words = code.split()
+
+            # Check if the line opens one of the blocks
+            skip = 0
+            if current is None and words:
+                for key, name in self.BLOCK_KEYS:
+                    if (words[0].startswith(key) and
+                            name not in self.block_offsets):
+                        current = name
+                        skip = code.index(words[0]) + len(words[0])
+                        if name == 'thermo' and words[1:2] == [b'ALL']:
+                            skip = code.index(b'ALL', skip) + 3
+                        if name == 'reactions':
+                            self._units_line = _decode(line)
+                        start = pos + skip
+                        break
+
+            # Check if the line closes the block or opens a reaction
+            if current is not None:
+                end_match = END_REGEX.search(code, skip)
+                if end_match is not None:
+                    self.block_offsets[current] = (
+                        start, pos + end_match.start())
+                    current = None
+                elif current == 'reactions' and b'=' in code:
+                    headers.append(pos)
+
+            pos += len(line)
+
+        if current is not None:
+            self.block_offsets[current] = (start, pos)
+
+        if headers:
+            rxn_end = self.block_offsets['reactions'][1]
+            self.reaction_offsets = list(
+                zip(headers, headers[1:] + [rxn_end]))
+
+    def __len__(self):
+        return len(self.reaction_offsets)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """ Release the memory map of the mechanism file. All of the views
+            returned by block_view and reaction_view must be released
+            first, otherwise BufferError is raised.
+        """
+        self._map.close()
+
+    def block_view(self, name):
+        """ Zero-copy view of the raw bytes of a block.
+
+            :param name: 'species', 'thermo' or 'reactions'
+            :type name: str
+            :rtype: memoryview
+        """
+        if name not in self.block_offsets:
+            return None
+        start, end = self.block_offsets[name]
+        return memoryview(self._map)[start:end]
+
+    def block(self, name, remove_comments=True):
+        """ String of a block, cleaned up as by the block parsers
+            (e.g., species_block) of this module. Only the block itself
+            is decoded and cleaned (a copy), and the result is kept for
+            later calls.
+
+            :param name: 'species', 'thermo' or 'reactions'
+            :type name: str
+            :param remove_comments: elect to remove comment liness from string
+            :type remove_comments: bool
+            :rtype: str
+        """
+        key = (name, remove_comments)
+        if key not in self._cleaned_blocks:
+            view = self.block_view(name)
+            self._cleaned_blocks[key] = (
+                _clean_up(_decode(view), remove_comments=remove_comments)
+                if view is not None else None)
+        return self._cleaned_blocks[key]
+
+    def reaction_units(self):
+        """ Units of the A and Ea fitting parameters, read only from the
+            line that opens the REACTIONS block.
+
+            :rtype: (str, str)
+        """
+        return reaction_units(self._units_line)
+
+    def reaction_view(self, idx):
+        """ Zero-copy view of the raw bytes of reaction idx.
+
+            :param idx: index of the reaction in the REACTIONS block
+            :type idx: int
+            :rtype: memoryview
+        """
+        start, end = self.reaction_offsets[idx]
+        return memoryview(self._map)[start:end]
+
+    def reaction(self, idx):
+        """ Cleaned-up data string of reaction idx, as returned
+            by chemkin_io.parser.reaction.data_strings. The reaction is
+            decoded and cleaned on every call.
+
+            :param idx: index of the reaction in the REACTIONS block
+            :type idx: int
+            :rtype: str
+        """
+        return _clean_up(_decode(self.reaction_view(idx))).strip()
+
+    def reaction_record(self, idx):
+        """ Parsed Reaction record of reaction idx.
+
+            :param idx: index of the reaction in the REACTIONS block
+            :type idx: int
+            :rtype: chemkin_io.parser.reaction.Reaction
+        """
+        return rxn_parser.reaction_record(self.reaction(idx))
+
+
+def _decode(view):
+    """ Decode the bytes of a slice of the mechanism file into a string,
+        reading the newlines in the same way as a text-mode file.
+
+        :param view: bytes from the mechanism file
+        :type view: bytes or memoryview
+        :rtype: str
+    """
+    string = bytes(view).decode('utf8', errors='ignore')
+    return string.replace('\r\n', '\n').replace('\r', '\n')
+
+
 # Clean up the ChemKin mechanism strings
 def _clean_up(mech_str, remove_comments=True):
     """ Cleans up mechanism input string by converting specific comment
@@ -191,7 +445,7 @@ def _convert_comment_lines(mech_str):
 
 
 # Parse species from mechanism
-def spc_name_dct(csv_str, entry):
+def spc_name_dct(csv_str, entry, cache_dir=None):
     """ Read the species.csv file and generate a dictionary that relates
         structural information to the ChemKin mechanism name.
 
@@ -199,35 +453,118 @@ def spc_name_dct(csv_str, entry):
         :type csv_str: str
         :param entry: structural information that is desired
         :type entry: str
+        :param cache_dir: directory of the SMILES/InChI conversion cache
+        :type cache_dir: str
         :return spc_dct: all species with desired structural information
         :rtype: dict[name:entry]
     """
 
-    data = _read_csv(csv_str)
-
-    if entry == 'inchi':
-        spc_dct = _read_name_inchi(data)
-    elif entry == 'smiles':
-        spc_dct = _read_name_smiles(data)
-    elif entry == 'mult':
-        spc_dct = _read_name_mult(data)
-    elif entry == 'charge':
-        spc_dct = _read_name_charge(data)
-    elif entry == 'sens':
-        spc_dct = _read_name_sensitivity(data)
-    else:
-        raise NotImplementedError
+    return SpeciesTable(csv_str, cache_dir=cache_dir).name_dct(entry)
 
-    return spc_dct
 
+class SpeciesTable():
+    """ Species information of a species.csv file, read only once into
+        columnar arrays (one per column of the file, with lowercase
+        names). The dictionaries relating the ChemKin names to each entry,
+        and the InChI or SMILES strings back to the names, are built the
+        first time they are requested and are then kept.
+
+        The SMILES or InChI strings that are missing from the file are
+        converted from the other column in one batch, using the persistent
+        conversion cache in cache_dir and a pool of processes for the
+        strings that are not in the cache yet.
+
+        :param csv_str: string of input csv file with species information
+        :type csv_str: str
+        :param cache_dir: directory of the SMILES/InChI conversion cache;
+            no caching if None
+        :type cache_dir: str
+        :param workers: number of processes used for the conversions
+        :type workers: int
+    """
+
+    def __init__(self, csv_str, cache_dir=None, workers=None):
+        data = _read_csv(csv_str)
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.columns = {col: data[col].to_numpy() for col in data.columns}
+        self.names = tuple(self.columns['name'])
+        self.index = {name: idx for idx, name in enumerate(self.names)}
+        self._dcts = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __repr__(self):
+        return (f'SpeciesTable(nspc={len(self.names)}, '
+                f'columns={list(self.columns)})')
+
+    def name_dct(self, entry):
+        """ Dictionary relating the ChemKin mechanism names to the desired
+            structural information, as from spc_name_dct.
+
+            :param entry: 'inchi', 'smiles', 'mult', 'charge' or 'sens'
+            :type entry: str
+            :rtype: dict[name: entry]
+        """
+
+        if entry not in self._dcts:
+            data = types.SimpleNamespace(**self.columns)
+            if entry == 'inchi':
+                spc_dct = _read_name_inchi(
+                    data, cache_dir=self.cache_dir, workers=self.workers)
+            elif entry == 'smiles':
+                spc_dct = _read_name_smiles(
+                    data, cache_dir=self.cache_dir, workers=self.workers)
+            elif entry == 'mult':
+                spc_dct = _read_name_mult(data)
+            elif entry == 'charge':
+                spc_dct = _read_name_charge(data)
+            elif entry == 'sens':
+                spc_dct = _read_name_sensitivity(data)
+            else:
+                raise NotImplementedError
+            self._dcts[entry] = spc_dct
+
+        return self._dcts[entry]
 
-def _read_name_inchi(data):
+    def entry_dct(self, entry):
+        """ Dictionary relating the InChI or SMILES strings of the species
+            to their ChemKin mechanism names.
+
+            :param entry: 'inchi' or 'smiles'
+            :type entry: str
+            :rtype: dict[entry: name]
+        """
+
+        if entry not in ('inchi', 'smiles'):
+            raise NotImplementedError
+
+        key = (entry, 'name')
+        if key not in self._dcts:
+            self._dcts[key] = {
+                val: name for name, val in self.name_dct(entry).items()}
+
+        return self._dcts[key]
+
+
+def _read_name_inchi(data, cache_dir=None, workers=None):
     """ Build the species dictionary relating ChemKin name to InChI string.
         The InChI strings are read directly from the data object if available.
         Otherwise they are generated using the SMILES strings.
 
         :param data: information from input species.csv file
-        :type data: pandas
+        :type data: pandas or columns of a SpeciesTable
+        :param cache_dir: directory of the SMILES/InChI conversion cache
+        :type cache_dir: str
+        :param workers: number of processes used for the conversions
+        :type workers: int
         :return spc_dct: output dictionary for all species
         :rtype spc_dct: dict[name: InChI]
     """
@@ -236,27 +573,37 @@ def _read_name_inchi(data):
         spc_dct = dict(zip(data.name, data.inchi))
     elif hasattr(data, 'smiles'):
         print('No inchi column in csv file, getting inchi from SMILES')
-        ichs = [_inchi(smiles) for smiles in data.smiles]
+        ichs = conversion.smiles_to_inchi(
+            data.smiles, cache_dir=cache_dir, workers=workers)
         spc_dct = dict(zip(data.name, ichs))
     else:
         spc_dct = {}
         print('No "inchi" or "SMILES" column in csv file')
 
     # Fill remaining inchi entries if inchi
-    for i, name in enumerate(data.name):
-        if str(spc_dct[name]) == 'nan':
-            spc_dct[name] = _inchi(data.smiles[i])
+    idxs = [i for i, name in enumerate(data.name)
+            if str(spc_dct[name]) == 'nan']
+    if idxs:
+        ichs = conversion.smiles_to_inchi(
+            [data.smiles[i] for i in idxs],
+            cache_dir=cache_dir, workers=workers)
+        for i, ich in zip(idxs, ichs):
+            spc_dct[data.name[i]] = ich
 
     return spc_dct
 
 
-def _read_name_smiles(data):
+def _read_name_smiles(data, cache_dir=None, workers=None):
     """ Build the species dictionary relating ChemKin name to SMILES string.
         The SMILES strings are read directly from the data object if available.
         Otherwise they are generated using the InChI strings.
 
         :param data: information from input species.csv file
-        :type data: pandas
+        :type data: pandas or columns of a SpeciesTable
+        :param cache_dir: directory of the SMILES/InChI conversion cache
+        :type cache_dir: str
+        :param workers: number of processes used for the conversions
+        :type workers: int
         :return spc_dct: output dictionary for all species
         :rtype spc_dct: dict[name: SMILES]
     """
@@ -265,7 +612,8 @@ def _read_name_smiles(data):
     if hasattr(data, 'smiles'):
         spc_dct = dict(zip(data.name, data.smiles))
     elif hasattr(data, 'inchi'):
-        smiles = [_smiles(ich) for ich in data.inchi]
+        smiles = conversion.inchi_to_smiles(
+            data.inchi, cache_dir=cache_dir, workers=workers)
         spc_dct = dict(zip(data.name, smiles))
     else:
         spc_dct = {}
@@ -338,28 +686,19 @@ def _read_name_sensitivity(data):
     return spc_dct
 
 
-def spc_inchi_dct(csv_str):
+def spc_inchi_dct(csv_str, cache_dir=None):
     """ Read the species.csv file and generate a dictionary that relates
         ChemKin mechanism name to InChI string.
 
         :param csv_str: string of input csv file with species information
         :type csv_str: str
+        :param cache_dir: directory of the SMILES/InChI conversion cache
+        :type cache_dir: str
         :return spc_dct: all species with names and InChI strings
         :rtype: dict[InChI: name]
     """
 
-    data = _read_csv(csv_str)
-
-    spc_dct = {}
-    if hasattr(data, 'inchi'):
-        spc_dct = dict(zip(data.name, data.inchi))
-    elif hasattr(data, 'smiles'):
-        ichs = [_inchi(smiles) for smiles in data.smiles]
-        spc_dct = dict(zip(ichs, data.name))
-    else:
-        spc_dct = {}
-
-    return spc_dct
+    return SpeciesTable(csv_str, cache_dir=cache_dir).entry_dct('inchi')
 
 
 def _read_csv(csv_str):
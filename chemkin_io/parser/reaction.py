@@ -2,11 +2,14 @@
 """
 
 
+import re
 import itertools
+import functools
+import collections
+from concurrent.futures import ProcessPoolExecutor
 import numpy
 import autoparse.pattern as app
 import autoparse.find as apf
-from autoparse import cast as ap_cast
 from ioformat import headlined_sections
 
 
@@ -33,6 +36,18 @@ COEFF_PATTERN = (app.NUMBER + app.LINESPACES + app.NUMBER +
 
 BAD_STRS = ['inf', 'INF', 'nan']
 
+# Compiled patterns used by the single-pass reaction tokenizer
+ARROW_REGEX = re.compile(r'<=>|=>|=')
+THIRD_BODY_REGEX = re.compile(r'\(\+[^)]+\)')
+REAGENT_SPLIT_REGEX = re.compile(r'(?<!\()\+(?!\+)')
+
+# Compact record of a parsed reaction used in place of its data string
+Reaction = collections.namedtuple(
+    'Reaction',
+    ('reactants', 'products', 'reversible', 'duplicate', 'pressure_region',
+     'highp', 'lowp', 'troe', 'plog', 'cheb_limits', 'cheb_alpha',
+     'colliders'))
+
 
 # Functions which use thermo parsers to collate the data
 def data_block(block_str):
@@ -47,62 +62,88 @@ def data_block(block_str):
         :rtype: list(list(str))
     """
 
-    rxn_dstr_lst = data_strings(block_str)
-    rxn_dat_lst = tuple(zip(
-        map(reactant_names, rxn_dstr_lst),
-        map(product_names, rxn_dstr_lst),
-        map(high_p_parameters, rxn_dstr_lst),
-        map(low_p_parameters, rxn_dstr_lst),
-        map(troe_parameters, rxn_dstr_lst),
-        map(chebyshev_parameters, rxn_dstr_lst),
-        map(plog_parameters, rxn_dstr_lst),
-        map(collision_enhance_factors, rxn_dstr_lst)))
+    rxn_dat_lst = tuple(
+        (rec['reactants'], rec['products'],
+         rec['high_p_params'], rec['low_p_params'], rec['troe_params'],
+         rec['chebyshev_params'], rec['plog_params'],
+         rec['collider_factors'])
+        for rec in parse_reactions(block_str))
 
     return rxn_dat_lst
 
 
-def data_dct(block_str, data_entry='strings', remove_bad_fits=False):
+def data_dct(block_str, data_entry='strings', remove_bad_fits=False,
+             workers=None):
     """ Parses all of the chemical equations and corresponding fitting
         parameters in the reactions block of the mechanism input file
         and stores them in a dictionary.
 
+        With data_entry='strings', the values are the raw data strings,
+        where the strings of duplicate reactions are joined by newlines;
+        with data_entry='records', the values are lists holding a
+        Reaction record for each of the duplicate entries of the reaction,
+        in the order they appear in the block.
+
+        If workers > 1, the data strings are parsed in chunks by a pool of
+        processes. The parsed entries are grouped in the order of the block,
+        so the dictionary is the same as the one from a serial parse, even
+        for duplicates that end up in different chunks.
+
         :param block_str: string for reactions block
         :type block_str: str
+        :param data_entry: type of value stored for each reaction
+        :type data_entry: str
+        :param workers: number of processes used to parse the reactions
+        :type workers: int
         :return data_dct: dictionary of all the reaction data strings
         :rtype: dict[reaction: data string]
     """
 
+    if data_entry not in ('strings', 'records'):
+        raise NotImplementedError
+
     rxn_dstr_lst = data_strings(block_str, remove_bad_fits=remove_bad_fits)
+    entry_fxn = functools.partial(_data_entry, data_entry=data_entry)
+    if workers is not None and workers > 1 and len(rxn_dstr_lst) > 1:
+        chunksize = max(1, len(rxn_dstr_lst) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            entries = list(executor.map(
+                entry_fxn, rxn_dstr_lst, chunksize=chunksize))
+    else:
+        entries = list(map(entry_fxn, rxn_dstr_lst))
+
+    rxn_dct = {}
+    for key, val in entries:
+        rxn_dct.setdefault(key, []).append(val)
+
     if data_entry == 'strings':
-        rxn_dct = {}
-        for string in rxn_dstr_lst:
-            # print(string)
-            rct_names = reactant_names(string)
-            prd_names = product_names(string)
-            key = (rct_names, prd_names)
-            # if key not in rxn_dct:
-            #     rxn_dct[key] = [string]
-            # else:
-            #     rxn_dct[key].append(string)
-            if key not in rxn_dct:
-                rxn_dct[key] = string
-            else:
-                rxn_dct[key] += '\n'+string
-    # elif data_entry == 'block':
-    #     rxn_dct = {}
-    #     for block in rxn_block_lst:
-    #         param_blocks = []
-    #         rct_names = rxn_block_lst[0]
-    #         prd_names = rxn_block_lst[1]
-    #         key = (rct_names, prd_names)
-    #         if key not in rxn_dct.keys():
-    #             rxn_dct[key] = block[2:]
-    #         else:
-    #             rxn_dct[key]
+        rxn_dct = {key: '\n'.join(vals) for key, vals in rxn_dct.items()}
 
     return rxn_dct
 
 
+def _data_entry(rxn_dstr, data_entry='strings'):
+    """ Parses a reaction data string into the key and value of its
+        entry in the reaction data dictionary.
+
+        :param rxn_dstr: data string for species in reaction block
+        :type rxn_dstr: str
+        :param data_entry: type of value stored for each reaction
+        :type data_entry: str
+        :return: reactant and product names, and the value of the entry
+        :rtype: ((tuple(str), tuple(str)), str/Reaction)
+    """
+
+    rxn_rec = parse_reaction(rxn_dstr)
+    key = (rxn_rec['reactants'], rxn_rec['products'])
+    if data_entry == 'strings':
+        val = rxn_dstr
+    else:
+        val = _reaction_from_rec(rxn_rec)
+
+    return key, val
+
+
 # Functions for parsing the reactuins block or single reaction string #
 def data_strings(block_str, remove_bad_fits=False):
     """ Parses all of the chemical equations and corresponding fitting
@@ -128,6 +169,173 @@ def data_strings(block_str, remove_bad_fits=False):
     return rxn_dstrs
 
 
+# Single-pass parsing engine for the reaction data strings #
+def parse_reactions(block_str, remove_bad_fits=False):
+    """ Parses every reaction in the reactions block of the mechanism
+        input file, reading each data string only once.
+
+        :param block_str: string for reactions block
+        :type block_str: str
+        :param remove_bad_fits: remove reactions with bad fits
+        :type remove_bad_fits: bool
+        :return rxn_recs: parsed records for all reactions
+        :rtype: list(dict[field: value])
+    """
+
+    rxn_dstrs = data_strings(block_str, remove_bad_fits=remove_bad_fits)
+    rxn_recs = [parse_reaction(rxn_dstr) for rxn_dstr in rxn_dstrs]
+
+    return rxn_recs
+
+
+def parse_reaction(rxn_dstr):
+    """ Tokenizes the data string for a reaction (or a group of duplicate
+        reactions) line-by-line in a single pass and collects all of the
+        species names and fitting parameters into one record.
+
+        The record holds the fields returned by the individual accessors:
+        reactants, products, pressure_region, high_p_params, low_p_params,
+        troe_params, chebyshev_params, plog_params, collider_factors,
+        along with the reversible and duplicate flags.
+
+        :param rxn_dstr: data string for species in reaction block
+        :type rxn_dstr: str
+        :return rxn_rec: all of the data read from the data string
+        :rtype: dict[field: value]
+    """
+
+    equation = None
+    highp_params = []
+    lowp_params, troe_params = None, None
+    cheb_temps, cheb_pressures, cheb_dims, cheb_vals = None, None, None, []
+    plog_params = {}
+    factors = {}
+    duplicate = False
+
+    for line in rxn_dstr.splitlines():
+        line = line.split('!')[0].strip()
+        if not line:
+            continue
+
+        # Header line with the chemical equation and high-P parameters
+        if '=' in line:
+            eqn, params = _split_header_line(line)
+            if equation is None:
+                equation = eqn
+            if params is not None:
+                highp_params.append(params)
+            continue
+
+        # Auxiliary lines of KEY/ vals/ pairs and bare keywords
+        fields = line.split('/')
+        for idx in range(0, len(fields), 2):
+            words = fields[idx].split()
+            if not words:
+                continue
+            for word in words[:-1]:
+                duplicate = duplicate or _is_duplicate_keyword(word)
+            key = words[-1]
+            if idx + 1 == len(fields):
+                duplicate = duplicate or _is_duplicate_keyword(key)
+                continue
+            vals = fields[idx+1].split()
+            ukey = key.upper()
+            if ukey == 'LOW':
+                if lowp_params is None:
+                    lowp_params = [_floats(vals)]
+            elif ukey == 'TROE':
+                if troe_params is None:
+                    troe_params = _floats(vals)
+                    troe_params += [None] * (4 - len(troe_params))
+            elif ukey == 'PLOG':
+                pressure, *arr_vals = _floats(vals)
+                plog_params.setdefault(pressure, []).append(arr_vals)
+            elif ukey == 'TCHEB':
+                cheb_temps = _floats(vals)
+            elif ukey == 'PCHEB':
+                cheb_pressures = _floats(vals)
+            elif ukey == 'CHEB':
+                if cheb_dims is None:
+                    cheb_dims = [int(float(val)) for val in vals[:2]]
+                    vals = vals[2:]
+                cheb_vals.extend(_floats(vals))
+            elif len(vals) == 1:
+                try:
+                    factors[key] = float(vals[0])
+                except ValueError:
+                    pass
+
+    # Assemble the Chebyshev parameters once all lines are read
+    if all(vals is not None for vals in (cheb_temps, cheb_pressures,
+                                         cheb_dims)) and cheb_vals:
+        ncols = cheb_dims[1]
+        chebyshev_params = {
+            't_limits': cheb_temps,
+            'p_limits': cheb_pressures,
+            'alpha_dim': cheb_dims,
+            'alpha_elm': [cheb_vals[i:i+ncols]
+                          for i in range(0, len(cheb_vals), ncols)]
+        }
+    else:
+        chebyshev_params = None
+
+    # Read the species and pressure region from the chemical equation
+    if equation is not None:
+        arrow = ARROW_REGEX.search(equation)
+        rct_str, prd_str = (equation[:arrow.start()],
+                            equation[arrow.end():])
+        reactants = _split_reagent_string(
+            THIRD_BODY_REGEX.sub('', rct_str))
+        products = _split_reagent_string(
+            THIRD_BODY_REGEX.sub('', prd_str))
+        reversible = arrow.group() != '=>'
+        if THIRD_BODY_REGEX.search(equation):
+            pressure_region = 'falloff'
+        elif any(rgt.strip() == 'M'
+                 for side in (rct_str, prd_str)
+                 for rgt in REAGENT_SPLIT_REGEX.split(side)):
+            pressure_region = 'lowp'
+        elif plog_params or chebyshev_params is not None:
+            pressure_region = 'all'
+        else:
+            pressure_region = 'indep'
+    else:
+        reactants, products, reversible = None, None, None
+        pressure_region = None
+
+    rxn_rec = {
+        'reactants': reactants,
+        'products': products,
+        'reversible': reversible,
+        'duplicate': duplicate,
+        'pressure_region': pressure_region,
+        'high_p_params': highp_params if highp_params else None,
+        'low_p_params': lowp_params,
+        'troe_params': troe_params,
+        'chebyshev_params': chebyshev_params,
+        'plog_params': plog_params if plog_params else None,
+        'collider_factors': factors
+    }
+
+    return rxn_rec
+
+
+def reaction_record(rxn_dstr):
+    """ Parses the data string for a reaction into a compact Reaction
+        record, with all of the fitting parameters stored as numpy arrays:
+        highp and lowp are (nsets, 3) arrays of [A, n, Ea], troe is
+        [alpha, T***, T*, T**] (T** is NaN if not given), plog is an
+        (nsets, 4) array of [P, A, n, Ea] sorted by pressure, cheb_limits
+        is [Tmin, Tmax, Pmin, Pmax] and cheb_alpha is the coefficient matrix.
+
+        :param rxn_dstr: data string for species in reaction block
+        :type rxn_dstr: str
+        :return rxn: record of the parsed reaction data
+        :rtype: Reaction
+    """
+    return _reaction_from_rec(parse_reaction(rxn_dstr))
+
+
 def reactant_names(rxn_dstr):
     """ Parses the data string for a reaction in the reactions block
         for the line containing the chemical equation in order to
@@ -139,13 +347,7 @@ def reactant_names(rxn_dstr):
         :rtype: list(str)
     """
 
-    pattern = _first_line_pattern(
-        rct_ptt=app.capturing(SPECIES_NAMES_PATTERN),
-        prd_ptt=SPECIES_NAMES_PATTERN,
-        param_ptt=COEFF_PATTERN
-    )
-    string = apf.first_capture(pattern, rxn_dstr)
-    names = _split_reagent_string(string)
+    names = parse_reaction(rxn_dstr)['reactants']
 
     return names
 
@@ -161,13 +363,7 @@ def product_names(rxn_dstr):
         :rtype: list(str)
     """
 
-    pattern = _first_line_pattern(
-        rct_ptt=SPECIES_NAMES_PATTERN,
-        prd_ptt=app.capturing(SPECIES_NAMES_PATTERN),
-        param_ptt=COEFF_PATTERN
-    )
-    string = apf.first_capture(pattern, rxn_dstr)
-    names = _split_reagent_string(string)
+    names = parse_reaction(rxn_dstr)['products']
 
     return names
 
@@ -183,31 +379,7 @@ def pressure_region_specification(rxn_dstr):
         :rtype: str
     """
 
-    pattern = app.capturing(
-        _first_line_pattern(
-            rct_ptt=SPECIES_NAMES_PATTERN,
-            prd_ptt=SPECIES_NAMES_PATTERN,
-            param_ptt=COEFF_PATTERN
-        )
-    )
-    string = apf.first_capture(pattern, rxn_dstr)
-
-    if string is not None:
-        string = string.strip()
-        if 'M' in string:
-            # Presence of M denotes specific region assumptions
-            if '(+M)' in string:
-                pressure_region = 'falloff'
-            else:
-                pressure_region = 'lowp'
-        else:
-            # No M can be independent or not, depending on subsequent info
-            if 'PLOG' in rxn_dstr or 'CHEB' in rxn_dstr:
-                pressure_region = 'all'
-            else:
-                pressure_region = 'indep'
-    else:
-        pressure_region = None
+    pressure_region = parse_reaction(rxn_dstr)['pressure_region']
 
     return pressure_region
 
@@ -223,19 +395,7 @@ def high_p_parameters(rxn_dstr):
         :rtype: list(float)
     """
 
-    pattern = _first_line_pattern(
-        rct_ptt=SPECIES_NAMES_PATTERN,
-        prd_ptt=SPECIES_NAMES_PATTERN,
-        param_ptt=app.capturing(COEFF_PATTERN)
-    )
-
-    string_lst = apf.all_captures(pattern, rxn_dstr)
-    if string_lst:
-        params = []
-        for string in string_lst:
-            params.append(list(ap_cast(string.split())))
-    else:
-        params = None
+    params = parse_reaction(rxn_dstr)['high_p_params']
 
     return params
 
@@ -264,19 +424,7 @@ def low_p_parameters(rxn_dstr):
         :rtype: list(float)
     """
 
-    pattern = (
-        'LOW' +
-        app.zero_or_more(app.SPACE) + app.escape('/') +
-        app.SPACES + app.capturing(app.NUMBER) +
-        app.SPACES + app.capturing(app.NUMBER) +
-        app.SPACES + app.capturing(app.NUMBER) +
-        app.zero_or_more(app.SPACE) + app.escape('/')
-    )
-    cap1 = apf.first_capture(pattern, rxn_dstr)
-    if cap1 is not None:
-        params = [[float(val) for val in cap1]]
-    else:
-        params = None
+    params = parse_reaction(rxn_dstr)['low_p_params']
 
     return params
 
@@ -291,43 +439,8 @@ def troe_parameters(rxn_dstr):
         :return params: Troe fitting parameters
         :rtype: list(float)
     """
-    pattern1 = (
-        'TROE' +
-        app.zero_or_more(app.SPACE) + app.escape('/') +
-        app.SPACES + app.capturing(app.NUMBER) +
-        app.SPACES + app.capturing(app.NUMBER) +
-        app.SPACES + app.capturing(app.NUMBER) +
-        app.maybe(app.SPACES + app.capturing(app.NUMBER)) +
-        app.zero_or_more(app.SPACE) + app.escape('/')
-    )
-    # pattern2 = (
-    #     'TROE' +
-    #     app.zero_or_more(app.SPACE) + app.escape('/') +
-    #     app.SPACES + app.capturing(app.NUMBER) +
-    #     app.SPACES + app.capturing(app.NUMBER) +
-    #     app.SPACES + app.capturing(app.NUMBER) +
-    #     app.zero_or_more(app.SPACE) + app.escape('/')
-    # )
-    cap1 = apf.first_capture(pattern1, rxn_dstr)
-    # cap2 = apf.first_capture(pattern2, rxn_dstr)
-    # print('cap1', cap1)
-    # print('cap2', cap1)
-    # cap2 = apf.first_capture(pattern2, rxn_dstr)
-    if cap1 is not None:
-        params = []
-        for val in cap1:
-            if val is not None:
-                params.append(float(val))
-            else:
-                params.append(None)
-    else:
-        params = None
-    # else:
-    #     if cap2 is not None:
-    #         params = [float(val) for val in cap2]
-    #         params.append(None)
-    #     else:
-    #         params = None
+
+    params = parse_reaction(rxn_dstr)['troe_params']
 
     return params
 
@@ -343,49 +456,7 @@ def chebyshev_parameters(rxn_dstr):
         :rtype: dict[param: value]
     """
 
-    temp_pattern = (
-        'TCHEB' + app.zero_or_more(app.SPACE) + app.escape('/') +
-        app.SPACES + app.capturing(app.FLOAT) +
-        app.SPACES + app.capturing(app.FLOAT) +
-        app.zero_or_more(app.SPACE) + app.escape('/')
-    )
-    pressure_pattern = (
-        'PCHEB' + app.zero_or_more(app.SPACE) + app.escape('/') +
-        app.SPACES + app.capturing(app.FLOAT) +
-        app.SPACES + app.capturing(app.FLOAT) +
-        app.zero_or_more(app.SPACE) + app.escape('/')
-    )
-    alpha_dimension_pattern = (
-        'CHEB' + app.zero_or_more(app.SPACE) + app.escape('/') +
-        app.SPACES + app.capturing(app.INTEGER) +
-        app.SPACES + app.capturing(app.INTEGER) +
-        app.zero_or_more(app.SPACE) + app.escape('/')
-    )
-    alpha_elements_pattern = (
-        'CHEB' + app.zero_or_more(app.SPACE) + app.escape('/') +
-        app.series(
-            app.capturing(app.SPACES + app.capturing(app.EXPONENTIAL_FLOAT)),
-            app.SPACES
-        ) +
-        app.zero_or_more(app.SPACE) + app.escape('/')
-    )
-
-    cheb_temps = apf.first_capture(temp_pattern, rxn_dstr)
-    cheb_pressures = apf.first_capture(pressure_pattern, rxn_dstr)
-    alpha_dims = apf.first_capture(alpha_dimension_pattern, rxn_dstr)
-    alpha_elm = apf.all_captures(alpha_elements_pattern, rxn_dstr)
-    if not alpha_elm:
-        alpha_elm = None
-
-    params_dct = {}
-    if all(vals is not None
-           for vals in (cheb_temps, cheb_pressures, alpha_dims, alpha_elm)):
-        params_dct['t_limits'] = [float(val) for val in cheb_temps]
-        params_dct['p_limits'] = [float(val) for val in cheb_pressures]
-        params_dct['alpha_dim'] = [int(val) for val in alpha_dims]
-        params_dct['alpha_elm'] = [list(map(float, row)) for row in alpha_elm]
-    else:
-        params_dct = None
+    params_dct = parse_reaction(rxn_dstr)['chebyshev_params']
 
     return params_dct
 
@@ -401,29 +472,7 @@ def plog_parameters(rxn_dstr):
         :rtype: dict[pressure: params]
     """
 
-    pattern = (
-        'PLOG' +
-        app.zero_or_more(app.SPACE) + app.escape('/') +
-        app.zero_or_more(app.SPACE) + app.capturing(app.NUMBER) +
-        app.one_or_more(app.SPACE) + app.capturing(app.NUMBER) +
-        app.one_or_more(app.SPACE) + app.capturing(app.NUMBER) +
-        app.one_or_more(app.SPACE) + app.capturing(app.NUMBER) +
-        app.zero_or_more(app.SPACE) + app.escape('/')
-    )
-    params_lst = apf.all_captures(pattern, rxn_dstr)
-
-    # Build dictionary of parameters, indexed by parameter
-    if params_lst:
-        params_dct = {}
-        for params in params_lst:
-            pressure = float(params[0])
-            vals = list(map(float, params[1:]))
-            if pressure not in params_dct:
-                params_dct[pressure] = [vals]
-            else:
-                params_dct[pressure].append(vals)
-    else:
-        params_dct = None
+    params_dct = parse_reaction(rxn_dstr)['plog_params']
 
     return params_dct
 
@@ -439,34 +488,7 @@ def collider_enhance_factors(rxn_dstr):
         :rtype: dict[bath name: enhancement factors]
     """
 
-    first_str = _first_line_pattern(
-        rct_ptt=SPECIES_NAMES_PATTERN,
-        prd_ptt=SPECIES_NAMES_PATTERN,
-        param_ptt=COEFF_PATTERN)
-    bad_strings = ('DUP', 'LOW', 'TROE', 'CHEB', 'PLOG', first_str)
-
-    species_char = app.one_of_these([
-        app.LETTER, app.DIGIT,
-        app.escape('('), app.escape(')'),
-        app.UNDERSCORE])
-    species_name = app.one_or_more(species_char)
-
-    # Loop over the lines and search for string with collider facts
-    factors = {}
-    if apf.has_match('LOW', rxn_dstr) or apf.has_match('TROE', rxn_dstr):
-        for line in rxn_dstr.splitlines():
-            if not any(apf.has_match(string, line) for string in bad_strings):
-                factor_pattern = (
-                    app.capturing(species_name) +
-                    app.escape('/') + app.maybe(app.SPACE) +
-                    app.capturing(app.NUMBER) +
-                    app.escape('/')
-                )
-                baths = apf.all_captures(factor_pattern, line)
-                if baths:
-                    factors = {}
-                    for bath in baths:
-                        factors[bath[0]] = float(bath[1])
+    factors = parse_reaction(rxn_dstr)['collider_factors']
 
     return factors
 
@@ -532,21 +554,101 @@ def ratek_fit_info(rxn_dstr):
 
 
 # HELPER FUNCTIONS #
-def _first_line_pattern(rct_ptt, prd_ptt, param_ptt):
-    """ Defines the pattern for the first line in a reaction data
-        string that contains the chemical equation and high-pressure
-        fitting parameters for the reaction.
-
-        :param rct_ptt: string pattern for the reactant species
-        :type rct_ptt: str
-        :param prd_ptt: string pattern for the product species
-        :type prd_ptt: str
-        :param param_ptt: string pattern for high-pressure parameters
-        :type param_ptt: str
-        :rtype: str
+def _reaction_from_rec(rxn_rec):
+    """ Converts the record dictionary built by parse_reaction into
+        a Reaction record with the parameters stored as numpy arrays.
+
+        :param rxn_rec: all of the data read from the data string
+        :type rxn_rec: dict[field: value]
+        :rtype: Reaction
+    """
+
+    def _array(params):
+        """ convert a list of parameter sets into a 2D float array
+        """
+        return (numpy.array(params, dtype=float).reshape(len(params), -1)
+                if params is not None else None)
+
+    troe = rxn_rec['troe_params']
+    if troe is not None:
+        troe = numpy.array(
+            [val if val is not None else numpy.nan for val in troe],
+            dtype=float)
+
+    plog_dct = rxn_rec['plog_params']
+    if plog_dct is not None:
+        plog = _array([[pressure] + vals
+                       for pressure in sorted(plog_dct)
+                       for vals in plog_dct[pressure]])
+    else:
+        plog = None
+
+    cheb_dct = rxn_rec['chebyshev_params']
+    if cheb_dct is not None:
+        cheb_limits = numpy.array(
+            cheb_dct['t_limits'] + cheb_dct['p_limits'], dtype=float)
+        cheb_alpha = numpy.array(
+            cheb_dct['alpha_elm'], dtype=float).reshape(cheb_dct['alpha_dim'])
+    else:
+        cheb_limits, cheb_alpha = None, None
+
+    return Reaction(
+        reactants=rxn_rec['reactants'],
+        products=rxn_rec['products'],
+        reversible=rxn_rec['reversible'],
+        duplicate=rxn_rec['duplicate'],
+        pressure_region=rxn_rec['pressure_region'],
+        highp=_array(rxn_rec['high_p_params']),
+        lowp=_array(rxn_rec['low_p_params']),
+        troe=troe,
+        plog=plog,
+        cheb_limits=cheb_limits,
+        cheb_alpha=cheb_alpha,
+        colliders=rxn_rec['collider_factors'])
+
+
+def _split_header_line(line):
+    """ Splits the first line of a reaction data string into the
+        chemical equation and the high-pressure fitting parameters.
+
+        :param line: line containing the chemical equation
+        :type line: str
+        :return: equation string and Arrhenius parameters (None if absent)
+        :rtype: (str, list(float))
+    """
+
+    words = line.rsplit(None, 3)
+    try:
+        params = _floats(words[1:]) if len(words) == 4 else None
+    except ValueError:
+        params = None
+
+    if params is not None:
+        equation = words[0]
+    else:
+        equation = line
+
+    return equation, params
+
+
+def _floats(vals):
+    """ Converts a sequence of number strings into a list of floats.
+
+        :param vals: number strings
+        :type vals: list(str)
+        :rtype: list(float)
+    """
+    return [float(val) for val in vals]
+
+
+def _is_duplicate_keyword(word):
+    """ Checks if a word is the DUPLICATE keyword (or its abbreviation).
+
+        :param word: word read from an auxiliary reaction line
+        :type word: str
+        :rtype: bool
     """
-    return (rct_ptt + app.padded(CHEMKIN_ARROW) + prd_ptt +
-            app.LINESPACES + param_ptt)
+    return word.upper() in ('DUP', 'DUPLICATE')
 
 
 def _split_reagent_string(rgt_str):
@@ -578,8 +680,7 @@ def _split_reagent_string(rgt_str):
     rgt_str = apf.remove(app.LINESPACES, rgt_str)
     rgt_str = apf.remove(CHEMKIN_PAREN_PLUS_EM, rgt_str)
     rgt_str = apf.remove(CHEMKIN_PLUS_EM, rgt_str)
-    pattern = app.PLUS + app.not_followed_by(app.PLUS)
-    rgt_cnt_strs = apf.split(pattern, rgt_str)
+    rgt_cnt_strs = REAGENT_SPLIT_REGEX.split(rgt_str)
     rgts = tuple(itertools.chain(*map(_interpret_reagent_count, rgt_cnt_strs)))
 
     return rgts
@@ -2,11 +2,23 @@
 """
 
 
+import collections
+import numpy
 import autoparse.pattern as app
 import autoparse.find as apf
 from ioformat import headlined_sections
 
 
+# Width of the fixed-column fields of the NASA polynomial lines
+LINE_WIDTH = 80
+CFT_WIDTH = 15
+TEMP_COLUMNS = ((45, 55), (55, 65), (65, 73))
+TEMP_COMMON_DEFAULT = 1000.0
+
+ThermoCoefficients = collections.namedtuple(
+    'ThermoCoefficients', ('names', 'index', 'temps', 'cfts'))
+
+
 # Functions which use thermo parsers to collate the data
 def data_block(block_str):
     """ Parses all of the NASA polynomials in the species block of the
@@ -19,16 +31,58 @@ def data_block(block_str):
         :rtype: list(list(str/float))
     """
 
-    thm_dstr_lst = data_strings(block_str)
+    thm_tbl = coefficient_table(block_str)
     thm_dat_lst = tuple(zip(
-        map(species_name, thm_dstr_lst),
-        map(temperatures, thm_dstr_lst),
-        map(low_coefficients, thm_dstr_lst),
-        map(high_coefficients, thm_dstr_lst)))
+        thm_tbl.names,
+        map(tuple, thm_tbl.temps.tolist()),
+        map(tuple, thm_tbl.cfts[:, 0].tolist()),
+        map(tuple, thm_tbl.cfts[:, 1].tolist())))
 
     return thm_dat_lst
 
 
+def coefficient_table(block_str):
+    """ Parses all of the NASA polynomials in the thermo block of the
+        mechanism file in a single pass, reading the temperatures and
+        coefficients from their fixed-width columns.
+
+        The coefficients of all species are returned in one array, where
+        cfts[i, 0] and cfts[i, 1] hold the low- and high-temperature
+        coefficients of species i, and temps[i] holds its (low, high,
+        common) temperatures. The index maps each name to its row.
+        Species with a blank common temperature field take the default
+        common temperature of the block (1000 K if it has none).
+
+        :param block_str: string for thermo block
+        :type block_str: str
+        :rtype: ThermoCoefficients
+    """
+
+    lines = block_str.splitlines()
+    temp_common = _block_temp_common(lines)
+    names, temps, cfts = [], [], []
+    idx = 0
+    while idx + 3 < len(lines):
+        headline = lines[idx].rstrip()
+        if (headline.endswith('1') and
+                headline[:1] not in ' 0123456789+=' and
+                all(lines[idx+num].rstrip().endswith(str(num+1))
+                    for num in (1, 2, 3))):
+            names.append(headline.split(None, 1)[0])
+            temps.append(_fixed_column_temperatures(headline, temp_common))
+            cfts.append(_fixed_column_coefficients(lines[idx+1:idx+4]))
+            idx += 4
+        else:
+            idx += 1
+
+    temps = numpy.array(temps, dtype=float).reshape((-1, 3))
+    cfts = numpy.array(cfts, dtype=float).reshape((-1, 2, 7))
+    index = {name: row for row, name in enumerate(names)}
+
+    return ThermoCoefficients(
+        names=tuple(names), index=index, temps=temps, cfts=cfts)
+
+
 def data_dct(block_str, data_entry='strings'):
     """ Parse all of the NASA polynomials given in the thermo block
         of the mechanism input file and stores them in a dictionary.
@@ -167,3 +221,74 @@ def temp_common_default(block_str):
     tmp_com_def = float(capture)
 
     return tmp_com_def
+
+
+def _fixed_column_temperatures(headline, temp_common=TEMP_COMMON_DEFAULT):
+    """ Reads the low, high and common temperatures from the fixed
+        columns of the first line of a NASA polynomial, falling back
+        to a search for the three values in nonstandard lines.
+
+        :param headline: first line of the NASA polynomial
+        :type headline: str
+        :param temp_common: common temperature used if its field is blank
+        :type temp_common: float
+        :return temps: temperatures (K)
+        :rtype: tuple(float)
+    """
+
+    fields = [headline[start:end].strip() for start, end in TEMP_COLUMNS]
+    if not fields[2]:
+        fields[2] = temp_common
+    try:
+        temps = tuple(map(float, fields))
+    except ValueError:
+        temps = temperatures(headline)
+
+    return temps
+
+
+def _block_temp_common(lines):
+    """ Reads the default common temperature from the line of default
+        temperatures (low, common, high) that can open the thermo block.
+
+        :param lines: lines of the thermo block
+        :type lines: list(str)
+        :rtype: float
+    """
+
+    temp_common = TEMP_COMMON_DEFAULT
+    for line in lines:
+        words = line.split('!')[0].split()
+        if words:
+            try:
+                _, temp_common, _ = map(float, words)
+            except ValueError:
+                pass
+            break
+
+    return temp_common
+
+
+def _fixed_column_coefficients(cft_lines):
+    """ Reads the 14 coefficients from the 15-character fields of the
+        last three lines of a NASA polynomial. Lines that lost their
+        leading spaces are realigned on the line number in column 80.
+
+        :param cft_lines: second, third and fourth lines of the polynomial
+        :type cft_lines: list(str)
+        :return: low and high temperature coefficients
+        :rtype: (tuple(float), tuple(float))
+    """
+
+    vals = []
+    for line, nvals in zip(cft_lines, (5, 5, 4)):
+        line = line.rstrip().rjust(LINE_WIDTH)
+        try:
+            line_vals = [float(line[num*CFT_WIDTH:(num+1)*CFT_WIDTH])
+                         for num in range(nvals)]
+        except ValueError:
+            line_vals = list(map(float, apf.all_captures(
+                app.EXPONENTIAL_FLOAT, line)[:nvals]))
+        vals.extend(line_vals)
+
+    return tuple(vals[7:14]), tuple(vals[:7])
@@ -0,0 +1,218 @@
+""" test chemkin_io.calculator.kernel
+"""
+
+from __future__ import unicode_literals
+from builtins import open
+import os
+import numpy
+from ioformat import phycon
+import chemkin_io
+
+
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+# Set paths
+PATH = os.path.dirname(os.path.realpath(__file__))
+DATA_PATH = os.path.join(PATH, 'data')
+FAKE1_MECH_NAME = 'fake1_mech.txt'
+
+# Read mechanism files
+FAKE1_MECH_STR = _read_file(
+    os.path.join(DATA_PATH, FAKE1_MECH_NAME))
+
+# Build the reactions blocks and record dictionaries
+FAKE1_REACTION_BLOCK = chemkin_io.parser.mechanism.reaction_block(
+    FAKE1_MECH_STR)
+FAKE1_RECORD_DCT = chemkin_io.parser.reaction.data_dct(
+    FAKE1_REACTION_BLOCK, data_entry='records')
+FAKE1_RECORDS = list(FAKE1_RECORD_DCT.values())
+
+# Set temperatures and pressures
+T_REF = 1.0
+UNITS = ('cal/mole', 'moles')
+TEMPS = numpy.array([500.0, 1000.0, 1500.0, 2000.0])
+
+
+def test__arrhenius():
+    """ test chemkin_io.calculator.kernel.arrhenius_kernel
+        test chemkin_io.calculator.kernel.arrhenius
+    """
+
+    # Single sets, duplicate sets, and a set with a negative A
+    params_lst = [
+        FAKE1_RECORDS[0][0].highp,
+        numpy.vstack([rxn.highp for rxn in FAKE1_RECORDS[1]]),
+        [[1.0e13, 0.0, 1000.0], [-2.0e12, 0.5, 0.0], [3.0e10, 1.0, 500.0]]
+    ]
+    krn = chemkin_io.calculator.kernel.arrhenius_kernel(
+        params_lst, UNITS, t_ref=T_REF)
+    assert numpy.array_equal(krn.offsets, [0, 1, 3])
+
+    kts = chemkin_io.calculator.kernel.arrhenius(krn, TEMPS)
+    assert kts.shape == (3, 4)
+
+    a_conv, ea_conv = chemkin_io.calculator.kernel.unit_factors(UNITS)
+    for params, rxn_kts in zip(params_lst, kts):
+        ref_kts = sum(
+            a_par * a_conv * (TEMPS / T_REF)**n_par *
+            numpy.exp(-ea_par * ea_conv / (phycon.RC * TEMPS))
+            for a_par, n_par, ea_par in params)
+        assert numpy.allclose(rxn_kts, ref_kts, rtol=1e-12)
+
+    # Same values as the per-reaction rate calculator
+    ref_ktp_dct = chemkin_io.calculator.rates.records(
+        FAKE1_RECORDS[1], UNITS, T_REF, TEMPS, pressures=['high'])
+    assert numpy.allclose(kts[1], ref_ktp_dct['high'], rtol=1e-12)
+
+    # A reaction without any parameter sets cannot be packed
+    try:
+        chemkin_io.calculator.kernel.arrhenius_kernel(
+            [params_lst[0], numpy.zeros((0, 3))], UNITS)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError
+
+
+def test__plog():
+    """ test chemkin_io.calculator.kernel.plog_kernel
+        test chemkin_io.calculator.kernel.plog_brackets
+        test chemkin_io.calculator.kernel.plog
+    """
+
+    # Single set per pressure, and two duplicate entries of a reaction
+    # given at the same pressures (two sets per pressure)
+    plog_lst = [
+        FAKE1_RECORDS[5][0].plog,
+        numpy.vstack([rxn.plog for rxn in FAKE1_RECORDS[6]])
+    ]
+    krn = chemkin_io.calculator.kernel.plog_kernel(
+        plog_lst, UNITS, t_ref=T_REF)
+    assert numpy.array_equal(krn.nlevels, [12, 8])
+    assert numpy.array_equal(krn.level_offsets, [0, 12])
+
+    # Exact, interpolated, out-of-range and high pressures
+    pressures = [0.001, 0.1, 0.5, 1.0, 5.0, 500.0, 'high']
+    brackets = chemkin_io.calculator.kernel.plog_brackets(krn, pressures)
+    assert numpy.array_equal(
+        brackets.valid,
+        [[True, True, True, True, True, True, False],
+         [False, True, True, True, True, False, False]])
+    assert numpy.array_equal(
+        brackets.exact,
+        [[True, False, False, False, False, False, False],
+         [False, True, False, True, False, False, False]])
+
+    ktps = chemkin_io.calculator.kernel.plog(
+        krn, TEMPS, pressures, brackets=brackets)
+    assert ktps.shape == (2, 7, 4)
+    assert numpy.all(numpy.isnan(ktps[~brackets.valid]))
+
+    # Same values as the per-reaction rate calculator
+    for rxn_ktps, rxn_valid, recs in zip(ktps, brackets.valid,
+                                         FAKE1_RECORDS[5:7]):
+        ref_ktp_dct = chemkin_io.calculator.rates.records(
+            recs, UNITS, T_REF, TEMPS, pressures=pressures)
+        assert set(ref_ktp_dct) == set(
+            pressure for pressure, valid in zip(pressures, rxn_valid)
+            if valid)
+        for pressure, ktp in zip(pressures, rxn_ktps):
+            if pressure in ref_ktp_dct:
+                assert numpy.allclose(ktp, ref_ktp_dct[pressure],
+                                      rtol=1e-10)
+
+
+def test__chebyshev():
+    """ test chemkin_io.calculator.kernel.chebyshev_kernel
+        test chemkin_io.calculator.kernel.chebyshev
+    """
+
+    # Two matrix shapes; the same matrix is also used with other limits
+    cheb_rxn = FAKE1_RECORDS[7][0]
+    alpha_lst = [
+        cheb_rxn.cheb_alpha,
+        [[8.0, 0.5], [-0.3, 0.1], [0.05, -0.02]],
+        cheb_rxn.cheb_alpha
+    ]
+    limits_lst = [
+        cheb_rxn.cheb_limits,
+        [400.0, 2500.0, 0.1, 100.0],
+        [300.0, 3000.0, 0.001, 10.0]
+    ]
+    krn = chemkin_io.calculator.kernel.chebyshev_kernel(
+        alpha_lst, limits_lst)
+    assert len(krn.alphas) == 2
+    assert numpy.array_equal(krn.indices[0], [0, 2])
+
+    pressures = [0.1, 1.0, 10.0, 'high']
+    ktps = chemkin_io.calculator.kernel.chebyshev(krn, TEMPS, pressures)
+    assert ktps.shape == (3, 4, 4)
+    assert numpy.all(numpy.isnan(ktps[:, 3]))
+
+    # Same values as the per-reaction rate calculator
+    for alpha, limits, rxn_ktps in zip(alpha_lst, limits_lst, ktps):
+        rxn = cheb_rxn._replace(cheb_alpha=numpy.array(alpha),
+                                cheb_limits=numpy.array(limits))
+        ref_ktp_dct = chemkin_io.calculator.rates.record(
+            rxn, UNITS, T_REF, TEMPS, pressures=pressures[:3])
+        for pressure, ktp in zip(pressures[:3], rxn_ktps):
+            assert numpy.allclose(ktp, ref_ktp_dct[pressure], rtol=1e-10)
+
+
+def test__falloff():
+    """ test chemkin_io.calculator.kernel.falloff_kernel
+        test chemkin_io.calculator.kernel.collision_efficiencies
+        test chemkin_io.calculator.kernel.falloff
+    """
+
+    # Lindemann, Troe without T**, and Troe with T**
+    fall_rxns = [FAKE1_RECORDS[idx][0] for idx in (2, 3, 4)]
+    krn = chemkin_io.calculator.kernel.falloff_kernel(
+        [rxn.highp for rxn in fall_rxns], [rxn.lowp for rxn in fall_rxns],
+        [rxn.troe for rxn in fall_rxns], [rxn.colliders for rxn in fall_rxns],
+        UNITS, t_ref=T_REF)
+    assert numpy.array_equal(krn.is_troe, [False, True, True])
+
+    # Effective efficiencies of a mixture, unlisted gases count as one
+    mixture = {'N2': 0.7, 'H2O': 0.2, 'AR': 0.1}
+    effs = chemkin_io.calculator.kernel.collision_efficiencies(
+        krn.efficiencies, mixture=mixture)
+    assert numpy.allclose(
+        effs, [1.0, 0.7*1.5 + 0.2*7.65 + 0.1, 0.7*1.33 + 0.2*6.63 + 0.1])
+    assert numpy.allclose(
+        chemkin_io.calculator.kernel.collision_efficiencies(
+            krn.efficiencies, mixture={'N2': 7.0, 'H2O': 2.0, 'AR': 1.0}),
+        effs)
+
+    pressures = [0.1, 1.0, 10.0, 'high']
+    ktps = chemkin_io.calculator.kernel.falloff(
+        krn, TEMPS, pressures, mixture=mixture)
+    assert ktps.shape == (3, 4, 4)
+
+    # Same values as the per-reaction rate calculator, with a mixture
+    # and with a single collider
+    for rxn, rxn_ktps in zip(fall_rxns, ktps):
+        ref_ktp_dct = chemkin_io.calculator.rates.record(
+            rxn, UNITS, T_REF, TEMPS, pressures=pressures, mixture=mixture)
+        assert set(ref_ktp_dct) == set(pressures[:3])
+        for pressure, ktp in zip(pressures[:3], rxn_ktps):
+            assert numpy.allclose(ktp, ref_ktp_dct[pressure], rtol=1e-10)
+
+    ktps = chemkin_io.calculator.kernel.falloff(
+        krn, TEMPS, pressures, mixture={'H2O': 1.0})
+    for rxn, rxn_ktps in zip(fall_rxns, ktps):
+        ref_ktp_dct = chemkin_io.calculator.rates.record(
+            rxn, UNITS, T_REF, TEMPS, pressures=pressures, collider='H2O')
+        for pressure, ktp in zip(pressures[:3], rxn_ktps):
+            assert numpy.allclose(ktp, ref_ktp_dct[pressure], rtol=1e-10)
+
+
+if __name__ == '__main__':
+    test__arrhenius()
+    test__plog()
+    test__chebyshev()
+    test__falloff()
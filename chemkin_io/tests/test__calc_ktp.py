@@ -0,0 +1,124 @@
+""" test chemkin_io.calculator.ktp
+"""
+
+from __future__ import unicode_literals
+from builtins import open
+import os
+import numpy
+import chemkin_io
+
+
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+# Set paths
+PATH = os.path.dirname(os.path.realpath(__file__))
+DATA_PATH = os.path.join(PATH, 'data')
+FAKE1_MECH_NAME = 'fake1_mech.txt'
+
+# Read mechanism files
+FAKE1_MECH_STR = _read_file(
+    os.path.join(DATA_PATH, FAKE1_MECH_NAME))
+
+# Build the reactions blocks and record dictionaries
+FAKE1_REACTION_BLOCK = chemkin_io.parser.mechanism.reaction_block(
+    FAKE1_MECH_STR)
+FAKE1_RECORD_DCT = chemkin_io.parser.reaction.data_dct(
+    FAKE1_REACTION_BLOCK, data_entry='records')
+
+# Set temperatures and pressures
+T_REF = 1.0
+UNITS = ('cal/mole', 'moles')
+TEMPS = numpy.array([500.0, 1000.0, 1500.0, 2000.0])
+PRESSURES = [0.005, 1.0, 10.0, 'high']
+
+
+def test__mechanism_tensor():
+    """ test chemkin_io.calculator.rates.mechanism_tensor
+        test chemkin_io.calculator.ktp.KTPTensor.dct
+        test chemkin_io.calculator.ktp.KTPTensor.from_dct
+        test chemkin_io.calculator.rates.mechanism_from_records
+    """
+
+    mech_tensor = chemkin_io.calculator.rates.mechanism_tensor(
+        FAKE1_RECORD_DCT, UNITS, T_REF, TEMPS, PRESSURES)
+    assert mech_tensor.shape == (len(FAKE1_RECORD_DCT), 4, 4)
+    assert mech_tensor.reactions == tuple(FAKE1_RECORD_DCT)
+    assert mech_tensor.pressures == tuple(PRESSURES)
+
+    # The dictionary view has the values of the per-reaction calculator,
+    # without the pressures where a reaction is not defined
+    assert list(mech_tensor.dct) == list(FAKE1_RECORD_DCT)
+    for rxn, rxn_recs in FAKE1_RECORD_DCT.items():
+        ref_ktp_dct = chemkin_io.calculator.rates.records(
+            rxn_recs, UNITS, T_REF, TEMPS, pressures=PRESSURES)
+        ktp_dct = mech_tensor.dct[rxn]
+        assert set(ktp_dct) == set(ref_ktp_dct)
+        for pressure, ktps in ref_ktp_dct.items():
+            assert numpy.allclose(ktp_dct[pressure], ktps, rtol=1e-10)
+
+    defined = mech_tensor.defined
+    assert not defined[0, 0] and defined[0, 3]
+    assert numpy.ma.count_masked(mech_tensor.masked()) == (
+        (~defined).sum() * len(TEMPS))
+
+    # Round trip through the dictionary layout
+    new_tensor = chemkin_io.calculator.ktp.KTPTensor.from_dct(
+        mech_tensor.to_dct(), TEMPS, pressures=PRESSURES)
+    assert numpy.array_equal(
+        new_tensor.values, mech_tensor.values, equal_nan=True)
+
+    # The view cannot modify the tensor, but the copies can be modified
+    dct_view = mech_tensor.dct
+    assert mech_tensor.dct is dct_view
+    rxn = list(FAKE1_RECORD_DCT)[0]
+    values = mech_tensor.values.copy()
+    try:
+        mech_tensor.dct[rxn]['high'] *= 10.0
+    except ValueError:
+        pass
+    else:
+        raise AssertionError
+    mech_dct = mech_tensor.to_dct()
+    mech_dct[rxn]['high'] *= 10.0
+    assert numpy.array_equal(mech_tensor.values, values, equal_nan=True)
+
+    # The rate dictionaries of a mechanism are writable copies as well
+    mech_dct = chemkin_io.calculator.rates.mechanism_from_records(
+        FAKE1_RECORD_DCT, UNITS, T_REF, TEMPS, PRESSURES)
+    mech_dct[rxn]['high'] *= 10.0
+    assert numpy.allclose(mech_dct[rxn]['high'],
+                          10.0 * mech_tensor.dct[rxn]['high'])
+
+
+def test__select():
+    """ test chemkin_io.calculator.ktp.KTPTensor.sel
+        test chemkin_io.calculator.ktp.KTPTensor.isel
+    """
+
+    mech_tensor = chemkin_io.calculator.rates.mechanism_tensor(
+        FAKE1_RECORD_DCT, UNITS, T_REF, TEMPS, PRESSURES)
+    rxns = list(FAKE1_RECORD_DCT)
+
+    sub_tensor = mech_tensor.sel(reactions=rxns[5:7], pressures=[10.0, 1.0])
+    assert sub_tensor.shape == (2, 2, 4)
+    assert sub_tensor.reactions == tuple(rxns[5:7])
+    assert sub_tensor.pressures == (10.0, 1.0)
+    assert numpy.array_equal(sub_tensor.values[1, 0],
+                             mech_tensor.dct[rxns[6]][10.0])
+
+    sub_tensor = mech_tensor.isel(reactions=slice(0, 2), pressures=-1,
+                                  temps=[True, False, True, False])
+    assert sub_tensor.shape == (2, 1, 2)
+    assert sub_tensor.pressures == ('high',)
+    assert numpy.array_equal(sub_tensor.temps, [500.0, 1500.0])
+    assert numpy.array_equal(sub_tensor.values[:, 0],
+                             mech_tensor.values[:2, 3, ::2])
+
+
+if __name__ == '__main__':
+    test__mechanism_tensor()
+    test__select()
@@ -0,0 +1,238 @@
+""" test chemkin_io.calculator.rates.mechanism
+"""
+
+from __future__ import unicode_literals
+from builtins import open
+import os
+import numpy
+import chemkin_io
+
+
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+# Set paths
+PATH = os.path.dirname(os.path.realpath(__file__))
+DATA_PATH = os.path.join(PATH, 'data')
+FAKE1_MECH_NAME = 'fake1_mech.txt'
+SYNGAS_MECH_NAME = 'syngas_mechanism.txt'
+
+# Read mechanism files
+FAKE1_MECH_STR = _read_file(
+    os.path.join(DATA_PATH, FAKE1_MECH_NAME))
+SYNGAS_MECH_STR = _read_file(
+    os.path.join(DATA_PATH, SYNGAS_MECH_NAME))
+
+# Build the reactions blocks and record dictionaries
+FAKE1_REACTION_BLOCK = chemkin_io.parser.mechanism.reaction_block(
+    FAKE1_MECH_STR)
+FAKE1_RECORD_DCT = chemkin_io.parser.reaction.data_dct(
+    FAKE1_REACTION_BLOCK, data_entry='records')
+SYNGAS_REACTION_BLOCK = chemkin_io.parser.mechanism.reaction_block(
+    SYNGAS_MECH_STR)
+SYNGAS_RECORD_DCT = chemkin_io.parser.reaction.data_dct(
+    SYNGAS_REACTION_BLOCK, data_entry='records')
+
+# Set temperatures and pressures
+T_REF = 1.0
+UNITS = ('cal/mole', 'moles')
+TEMPS = numpy.array([500.0, 1000.0, 1500.0, 2000.0])
+PRESSURES = [1.0, 10.0, 'high']
+
+
+def test__duplicate_records():
+    """ test chemkin_io.calculator.rates.records
+    """
+
+    # Arrhenius and PLOG duplicates: sum of the separate entries
+    for rxn in (list(FAKE1_RECORD_DCT.values())[1],
+                list(FAKE1_RECORD_DCT.values())[6]):
+        ktp_dct = chemkin_io.calculator.rates.records(
+            rxn, UNITS, T_REF, TEMPS, pressures=PRESSURES)
+        ktp_dcts = [
+            chemkin_io.calculator.rates.record(
+                dup_rxn, UNITS, T_REF, TEMPS, pressures=PRESSURES)
+            for dup_rxn in rxn]
+        assert list(ktp_dct) == list(ktp_dcts[0]) == list(ktp_dcts[1])
+        for pressure, ktps in ktp_dct.items():
+            assert numpy.allclose(
+                ktps, ktp_dcts[0][pressure] + ktp_dcts[1][pressure])
+
+    # Arrhenius entry and a Chebyshev entry with the same reaction:
+    # the k(T)s are added to the k(T,P)s at every pressure
+    rxn = SYNGAS_RECORD_DCT[(('CO(1)', 'HO2(10)'), ('OH(6)', 'CO2(12)'))]
+    units = chemkin_io.parser.mechanism.reaction_units(SYNGAS_MECH_STR)
+    ktp_dct = chemkin_io.calculator.rates.records(
+        rxn, units, T_REF, TEMPS, pressures=PRESSURES)
+    indep_ktp_dct = chemkin_io.calculator.rates.record(
+        rxn[0], units, T_REF, TEMPS, pressures=PRESSURES)
+    pdep_ktp_dct = chemkin_io.calculator.rates.record(
+        rxn[1], units, T_REF, TEMPS, pressures=PRESSURES)
+    assert list(ktp_dct) == [1.0, 10.0]
+    for pressure, ktps in ktp_dct.items():
+        assert numpy.allclose(
+            ktps, pdep_ktp_dct[pressure] + indep_ktp_dct['high'])
+
+
+def test__normalize_units():
+    """ test chemkin_io.calculator.rates.normalize_units
+    """
+
+    rxns = list(FAKE1_RECORD_DCT)
+    highp = FAKE1_RECORD_DCT[rxns[1]][0].highp.copy()
+    norm_dct = chemkin_io.calculator.rates.normalize_units(
+        FAKE1_RECORD_DCT, UNITS)
+    assert list(norm_dct) == rxns
+
+    # Every parameter set is converted, and the records are not modified
+    a_factor, ea_factor = chemkin_io.calculator.kernel.unit_factors(UNITS)
+    for rxn, rxn_recs in FAKE1_RECORD_DCT.items():
+        for rec, norm_rec in zip(rxn_recs, norm_dct[rxn]):
+            if not chemkin_io.parser.reaction.are_highp_fake(rec.highp):
+                assert numpy.allclose(
+                    norm_rec.highp, rec.highp * [a_factor, 1.0, ea_factor])
+            if rec.plog is not None:
+                assert numpy.allclose(
+                    norm_rec.plog,
+                    rec.plog * [1.0, a_factor, 1.0, ea_factor])
+    assert numpy.array_equal(FAKE1_RECORD_DCT[rxns[1]][0].highp, highp)
+
+    # Same rate constants, without converting again, however many times
+    # the records are evaluated
+    for _ in range(2):
+        for rxn, rxn_recs in FAKE1_RECORD_DCT.items():
+            ktp_dct = chemkin_io.calculator.rates.records(
+                rxn_recs, UNITS, T_REF, TEMPS, pressures=PRESSURES)
+            norm_ktp_dct = chemkin_io.calculator.rates.records(
+                norm_dct[rxn], None, T_REF, TEMPS, pressures=PRESSURES)
+            assert list(norm_ktp_dct) == list(ktp_dct)
+            for pressure, ktps in ktp_dct.items():
+                assert numpy.allclose(norm_ktp_dct[pressure], ktps)
+
+    # Duplicates with more than two parameter sets
+    rec = FAKE1_RECORD_DCT[rxns[1]][0]
+    rec3 = rec._replace(highp=numpy.vstack([rec.highp] * 3))
+    ktp_dct = chemkin_io.calculator.rates.record(
+        rec3, UNITS, T_REF, TEMPS, pressures=PRESSURES)
+    ref_ktp_dct = chemkin_io.calculator.rates.record(
+        rec, UNITS, T_REF, TEMPS, pressures=PRESSURES)
+    assert numpy.allclose(ktp_dct['high'], 3.0 * ref_ktp_dct['high'])
+
+
+def test__mechanism():
+    """ test chemkin_io.calculator.rates.mechanism
+        test chemkin_io.calculator.rates.mechanism_from_records
+    """
+
+    mech_dct = chemkin_io.calculator.rates.mechanism(
+        FAKE1_REACTION_BLOCK, UNITS, T_REF, TEMPS, PRESSURES)
+    assert list(mech_dct) == list(FAKE1_RECORD_DCT)
+
+    par_mech_dct = chemkin_io.calculator.rates.mechanism_from_records(
+        FAKE1_RECORD_DCT, UNITS, T_REF, TEMPS, PRESSURES, workers=2)
+    assert list(par_mech_dct) == list(mech_dct)
+    for rxn, ktp_dct in mech_dct.items():
+        assert list(par_mech_dct[rxn]) == list(ktp_dct)
+        for pressure, ktps in ktp_dct.items():
+            assert numpy.array_equal(par_mech_dct[rxn][pressure], ktps)
+
+
+def test__mechanism_rates():
+    """ test chemkin_io.calculator.rates.MechanismRates
+    """
+
+    mech_dct = chemkin_io.calculator.rates.mechanism_from_records(
+        FAKE1_RECORD_DCT, UNITS, T_REF, TEMPS, PRESSURES)
+    mech_rates = chemkin_io.calculator.rates.MechanismRates.from_block(
+        FAKE1_REACTION_BLOCK, UNITS, T_REF, TEMPS, PRESSURES)
+    assert list(mech_rates) == list(mech_dct)
+    assert len(mech_rates) == len(mech_dct)
+    assert not mech_rates.evaluated
+
+    # Only the accessed reactions are calculated
+    rxns = list(mech_dct)
+    ktp_dct = mech_rates[rxns[3]]
+    assert mech_rates.evaluated == (rxns[3],)
+    assert mech_rates[rxns[3]] is ktp_dct
+    assert rxns[5] in mech_rates and rxns[5] not in mech_rates.evaluated
+    try:
+        mech_rates[(('X',), ('Y',))]
+    except KeyError:
+        pass
+    else:
+        raise AssertionError
+
+    mech_rates.prefetch(rxns[:6], workers=2)
+    assert set(mech_rates.evaluated) == set(rxns[:6])
+    mech_rates.prefetch()
+    assert set(mech_rates.evaluated) == set(rxns)
+    for rxn, ktp_dct in mech_dct.items():
+        assert list(mech_rates[rxn]) == list(ktp_dct)
+        for pressure, ktps in ktp_dct.items():
+            assert numpy.allclose(mech_rates[rxn][pressure], ktps,
+                                  rtol=1e-12)
+
+
+def test__branching_fractions():
+    """ test chemkin_io.calculator.rates.branching_fractions
+        test chemkin_io.calculator.rates.branching_fraction_tensors
+    """
+
+    pressures = [0.005, 1.0, 10.0, 'high']
+    units = chemkin_io.parser.mechanism.reaction_units(SYNGAS_MECH_STR)
+    mech_tensor = chemkin_io.calculator.rates.mechanism_tensor(
+        SYNGAS_RECORD_DCT, units, T_REF, TEMPS, pressures)
+    branch_tensor, total_tensor = (
+        chemkin_io.calculator.rates.branching_fraction_tensors(mech_tensor))
+    assert branch_tensor.shape == mech_tensor.shape
+    assert total_tensor.reactions == tuple(
+        dict.fromkeys(rxn[0] for rxn in SYNGAS_RECORD_DCT))
+
+    # Totals are the sums over the reactions of each set of reactants
+    for rct, total_vals in zip(total_tensor.reactions, total_tensor.values):
+        rct_vals = sum(vals for rxn, vals
+                       in zip(mech_tensor.reactions, mech_tensor.values)
+                       if rxn[0] == rct)
+        assert numpy.allclose(total_vals, rct_vals, equal_nan=True)
+    rct_idxs = [total_tensor.reaction_index[rxn[0]]
+                for rxn in mech_tensor.reactions]
+    assert numpy.allclose(
+        branch_tensor.values,
+        mech_tensor.values / total_tensor.values[rct_idxs], equal_nan=True)
+
+    # Dictionary layout, from the dictionaries or from the tensor
+    mech_dct = mech_tensor.to_dct()
+    branch_dct, total_rate_dct = (
+        chemkin_io.calculator.rates.branching_fractions(mech_dct, pressures))
+    tbranch_dct, ttotal_rate_dct = (
+        chemkin_io.calculator.rates.branching_fractions(
+            mech_tensor, pressures))
+    assert list(branch_dct) == list(tbranch_dct)
+    assert list(total_rate_dct) == list(ttotal_rate_dct)
+    assert list(total_rate_dct) == sorted(total_rate_dct)
+    for rct, total_dct in total_rate_dct.items():
+        rxns = [rxn for rxn in mech_dct if rxn[0] == rct]
+        assert len(rxns) > 1
+        for pressure in pressures:
+            if all(pressure in mech_dct[rxn] for rxn in rxns):
+                assert numpy.allclose(
+                    total_dct[pressure],
+                    sum(mech_dct[rxn][pressure] for rxn in rxns))
+                for rxn in rxns:
+                    assert numpy.allclose(
+                        branch_dct[rxn][pressure],
+                        mech_dct[rxn][pressure] / total_dct[pressure])
+            else:
+                assert total_dct[pressure] is None
+                assert all(branch_dct[rxn][pressure] is None for rxn in rxns)
+
+
+if __name__ == '__main__':
+    test__duplicate_records()
+    test__normalize_units()
+    test__mechanism()
+    test__mechanism_rates()
+    test__branching_fractions()
@@ -0,0 +1,126 @@
+""" test chemkin_io.calculator.sensitivity
+"""
+
+from __future__ import unicode_literals
+from builtins import open
+import os
+import numpy
+import chemkin_io
+
+
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+# Set paths
+PATH = os.path.dirname(os.path.realpath(__file__))
+DATA_PATH = os.path.join(PATH, 'data')
+SYNGAS_MECH_NAME = 'syngas_mechanism.txt'
+
+# Read mechanism files
+SYNGAS_MECH_STR = _read_file(
+    os.path.join(DATA_PATH, SYNGAS_MECH_NAME))
+
+# Build the rate constants tensor
+T_REF = 1.0
+TEMPS = numpy.array([500.0, 1000.0, 1500.0, 2000.0])
+PRESSURES = [1.0, 10.0, 'high']
+SYNGAS_RECORD_DCT = chemkin_io.parser.reaction.data_dct(
+    chemkin_io.parser.mechanism.reaction_block(SYNGAS_MECH_STR),
+    data_entry='records')
+SYNGAS_TENSOR = chemkin_io.calculator.rates.mechanism_tensor(
+    SYNGAS_RECORD_DCT,
+    chemkin_io.parser.mechanism.reaction_units(SYNGAS_MECH_STR),
+    T_REF, TEMPS, PRESSURES)
+
+
+def _scaled_branching_fractions(rxn, factor):
+    """ branching fractions after scaling the rate constants of a reaction
+    """
+    values = SYNGAS_TENSOR.values.copy()
+    values[SYNGAS_TENSOR.reaction_index[rxn]] *= factor
+    branch_tensor, total_tensor = (
+        chemkin_io.calculator.rates.branching_fraction_tensors(
+            chemkin_io.calculator.ktp.KTPTensor(
+                values, SYNGAS_TENSOR.reactions, PRESSURES, TEMPS)))
+    return branch_tensor, total_tensor
+
+
+def test__branching_fraction_sensitivities():
+    """ test chemkin_io.calculator.sensitivity.branching_fraction_sensitivities
+        test chemkin_io.calculator.sensitivity.sensitivity_tensor
+    """
+
+    sens_pairs = (
+        chemkin_io.calculator.sensitivity.branching_fraction_sensitivities(
+            SYNGAS_TENSOR))
+
+    # Pairs are all the reactions with the same reactants
+    rxns = SYNGAS_TENSOR.reactions
+    assert sorted(zip(sens_pairs.perturbed, sens_pairs.responding)) == sorted(
+        (idx1, idx2) for idx1, rxn1 in enumerate(rxns)
+        for idx2, rxn2 in enumerate(rxns) if rxn1[0] == rxn2[0])
+
+    # Compare with finite differences of the brute-force calculation
+    step = 1.0e-6
+    rxn = (('H(4)', 'HO2(10)'), ('OH(6)', 'OH(6)'))
+    sens_tensor = chemkin_io.calculator.sensitivity.sensitivity_tensor(
+        SYNGAS_TENSOR, sens_pairs, rxn)
+    assert len(sens_tensor) == sum(rxn2[0] == rxn[0] for rxn2 in rxns) > 1
+    branch_tensor, _ = chemkin_io.calculator.rates.branching_fraction_tensors(
+        SYNGAS_TENSOR)
+    pert_tensor, _ = _scaled_branching_fractions(rxn, numpy.exp(step))
+    for resp_rxn, sens_vals in zip(sens_tensor.reactions, sens_tensor.values):
+        idx = SYNGAS_TENSOR.reaction_index[resp_rxn]
+        assert numpy.allclose(
+            sens_vals,
+            (pert_tensor.values[idx] - branch_tensor.values[idx]) / step,
+            atol=1.0e-6, equal_nan=True)
+
+    # Branching fractions of the same reactants still sum to one
+    for rxn in rxns:
+        sens_tensor = chemkin_io.calculator.sensitivity.sensitivity_tensor(
+            SYNGAS_TENSOR, sens_pairs, rxn)
+        sens_sum = sens_tensor.values.sum(axis=0)
+        assert numpy.allclose(sens_sum[~numpy.isnan(sens_sum)], 0.0)
+
+
+def test__perturbed_branching_fractions():
+    """ test chemkin_io.calculator.sensitivity.perturbed_branching_fractions
+        test chemkin_io.calculator.sensitivity.total_rate_sensitivities
+    """
+
+    pert_pairs = (
+        chemkin_io.calculator.sensitivity.perturbed_branching_fractions(
+            SYNGAS_TENSOR, 2.0))
+    total_sens_tensor = (
+        chemkin_io.calculator.sensitivity.total_rate_sensitivities(
+            SYNGAS_TENSOR))
+    _, total_tensor = chemkin_io.calculator.rates.branching_fraction_tensors(
+        SYNGAS_TENSOR)
+
+    step = 1.0e-6
+    for rxn in SYNGAS_TENSOR.reactions:
+        branch_tensor, _ = _scaled_branching_fractions(rxn, 2.0)
+        pert_tensor = chemkin_io.calculator.sensitivity.sensitivity_tensor(
+            SYNGAS_TENSOR, pert_pairs, rxn)
+        assert numpy.allclose(
+            pert_tensor.values,
+            branch_tensor.sel(reactions=pert_tensor.reactions).values,
+            equal_nan=True)
+
+        _, pert_total_tensor = _scaled_branching_fractions(
+            rxn, numpy.exp(step))
+        rct_idx = total_tensor.reaction_index[rxn[0]]
+        assert numpy.allclose(
+            total_sens_tensor.values[SYNGAS_TENSOR.reaction_index[rxn]],
+            numpy.log(pert_total_tensor.values[rct_idx] /
+                      total_tensor.values[rct_idx]) / step,
+            atol=1.0e-6, equal_nan=True)
+
+
+if __name__ == '__main__':
+    test__branching_fraction_sensitivities()
+    test__perturbed_branching_fractions()
@@ -5,6 +5,7 @@ from __future__ import unicode_literals
 from builtins import open
 import os
 import numpy as np
+from ioformat import phycon
 import chemkin_io
 
 
@@ -45,6 +46,77 @@ def test__mechanism():
         SYNGAS_THERMO_BLOCK, [TEMP1, TEMP2])
     print(therm_dct)
 
+    assert len(therm_dct) == 19
+    assert all(vals.shape == (4, 2) for vals in therm_dct.values())
+
+
+def test__properties():
+    """ test chemkin_io.calculator.thermo.properties
+    """
+    temps = [100.0, 300.0, 1000.0, 1500.0, 3000.0, 7000.0]
+    thm_tbl = chemkin_io.parser.thermo.coefficient_table(
+        SYNGAS_THERMO_BLOCK)
+    thm_vals = chemkin_io.calculator.thermo.properties(
+        thm_tbl.cfts, thm_tbl.temps, temps)
+    assert thm_vals.shape == (19, 4, 6)
+
+    # Compare against the single-species, single-temperature functions
+    for thm_dstr, spc_vals in zip(SYNGAS_BLOCK_STRS, thm_vals):
+        for temp, vals in zip(temps, spc_vals.T):
+            ref_vals = [
+                chemkin_io.calculator.thermo.enthalpy(thm_dstr, temp),
+                chemkin_io.calculator.thermo.heat_capacity(thm_dstr, temp),
+                chemkin_io.calculator.thermo.entropy(thm_dstr, temp),
+                chemkin_io.calculator.thermo.gibbs(thm_dstr, temp)]
+            if ref_vals[0] is None:
+                assert np.all(np.isnan(vals))
+            else:
+                assert np.allclose(vals, ref_vals)
+
+    # High-temperature coefficients are used above the common temperature
+    row = thm_tbl.index['H2O2(11)']
+    high_cfts = thm_tbl.cfts[row, 1]
+    ref_cp = phycon.RC * sum(
+        cft * 1500.0**pow_ for pow_, cft in enumerate(high_cfts[:5]))
+    assert np.isclose(thm_vals[row, 1, 3], ref_cp)
+
+
+def test__thermo_table():
+    """ test chemkin_io.calculator.thermo.ThermoTable
+    """
+    temps = [300.0, 1000.0, 2000.0]
+    therm_dct = chemkin_io.calculator.thermo.mechanism(
+        SYNGAS_THERMO_BLOCK, temps)
+    therm_tbl = chemkin_io.calculator.thermo.ThermoTable(
+        SYNGAS_THERMO_BLOCK, temps, maxsize=2)
+
+    # Nothing is evaluated until a species is accessed
+    assert list(therm_tbl) == list(therm_dct)
+    assert therm_tbl.cache_info() == (0, 0, 2, 0)
+
+    assert np.array_equal(therm_tbl['H2O2(11)'], therm_dct['H2O2(11)'])
+    assert np.array_equal(therm_tbl['H2O2(11)'], therm_dct['H2O2(11)'])
+    assert therm_tbl.cache_info() == (1, 1, 2, 1)
+
+    # Other temperature grids are cached under their own keys
+    vals = therm_tbl.evaluate('H2O2(11)', [TEMP1, TEMP2])
+    assert np.allclose(
+        vals[0], [chemkin_io.calculator.thermo.enthalpy(
+            SPECIES_POLYNOMIAL, temp) for temp in (TEMP1, TEMP2)])
+    assert therm_tbl.cache_info() == (1, 2, 2, 2)
+
+    # The least recently used entry is evicted
+    assert np.array_equal(therm_tbl['N2'], therm_dct['N2'])
+    assert therm_tbl.cache_info() == (1, 3, 2, 2)
+    therm_tbl.evaluate('H2O2(11)', [TEMP1, TEMP2])
+    assert therm_tbl.cache_info() == (2, 3, 2, 2)
+    assert therm_tbl['H2O2(11)'] is not None
+    assert therm_tbl.cache_info() == (2, 4, 2, 2)
+
+    assert 'NOTASPECIES' not in therm_tbl
+    assert therm_tbl.get('NOTASPECIES') is None
+    assert not therm_tbl['N2'].flags.writeable
+
 
 def test__enthalpy():
     """ test chemkin_io.calculator.thermo.enthalpy
@@ -108,6 +180,8 @@ def test__heat_capacity():
 
 if __name__ == '__main__':
     test__mechanism()
+    test__properties()
+    test__thermo_table()
     test__enthalpy()
     test__entropy()
     test__gibbs()
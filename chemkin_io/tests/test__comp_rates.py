@@ -3,10 +3,15 @@ compare thermo
 """
 
 import os
+import warnings
+import collections
+import concurrent.futures
 import numpy
 from ioformat import remove_whitespace
+from ioformat import phycon
 from chemkin_io import parser
 from chemkin_io.calculator import combine
+from chemkin_io.calculator import ktp
 
 
 # Get mechanism information
@@ -22,6 +27,7 @@ DATA_PATH = os.path.join(PATH, 'data')
 FAKE1_MECH_NAME = 'fake1_mech.txt'
 FAKE2_MECH_NAME = 'fake2_mech.txt'
 FAKE_CSV_NAME = 'fake_species.csv'
+SYNGAS_MECH_NAME = 'syngas_mechanism.txt'
 
 # Read mechanism and csv strings
 FAKE1_MECH_STR = _read_file(
@@ -30,6 +36,8 @@ FAKE2_MECH_STR = _read_file(
     os.path.join(DATA_PATH, FAKE2_MECH_NAME))
 FAKE_CSV_STR = _read_file(
     os.path.join(DATA_PATH, FAKE_CSV_NAME))
+SYNGAS_MECH_STR = _read_file(
+    os.path.join(DATA_PATH, SYNGAS_MECH_NAME))
 
 # Read species blocks
 FAKE1_THERMO_BLOCK = parser.mechanism.thermo_block(
@@ -98,5 +106,227 @@ def test__compare_rates():
     print(ktp_dct)
 
 
+def test__reverse_rates():
+    """ test chemkin_io.calculator.combine.reverse_rates
+        test chemkin_io.calculator.combine.equilibrium_constants
+    """
+
+    thermo_dct, _ = combine.build_thermo_name_dcts(
+        SYNGAS_MECH_STR, SYNGAS_MECH_STR, TEMPS)
+    ktp_dct, _ = combine.build_reaction_name_dcts(
+        SYNGAS_MECH_STR, SYNGAS_MECH_STR, T_REF, TEMPS, PRESSURES)
+    ktp_copy = {rxn: {pressure: numpy.copy(ktps)
+                      for pressure, ktps in rxn_ktp_dct.items()}
+                for rxn, rxn_ktp_dct in ktp_dct.items()}
+
+    rev_tensor = combine.reverse_rates(ktp_dct, thermo_dct, TEMPS)
+    assert rev_tensor.reactions == tuple(ktp_dct)
+
+    # Compare with the equilibrium constants of each reaction, with the
+    # k(T,P)s of molecularity-changing reactions in concentration units
+    for rxn, rxn_ktp_dct in ktp_dct.items():
+        rcts, prds = rxn
+        rxn_gibbs = (sum(thermo_dct[prd][3] for prd in prds) -
+                     sum(thermo_dct[rct][3] for rct in rcts))
+        k_equils = numpy.exp(-rxn_gibbs / (phycon.RC * TEMPS))
+        k_equils *= (1.0 / (phycon.RC2 * TEMPS))**(len(prds) - len(rcts))
+        assert list(rev_tensor.dct[rxn]) == list(rxn_ktp_dct)
+        for pressure, ktps in rxn_ktp_dct.items():
+            assert numpy.allclose(
+                rev_tensor.dct[rxn][pressure], ktps / k_equils)
+
+        # The forward rate constants are left as they were
+        for pressure, ktps in rxn_ktp_dct.items():
+            assert numpy.array_equal(ktps, ktp_copy[rxn][pressure])
+
+    # Subset of the reactions, one of them with unknown species
+    rxns = list(ktp_dct)[:3]
+    k_equils = combine.equilibrium_constants(
+        rxns + [(('X',), ('Y', 'Z'))], thermo_dct, TEMPS)
+    assert k_equils.shape == (4, len(TEMPS))
+    assert numpy.isnan(k_equils[3]).all()
+    rev_tensor = combine.reverse_rates(ktp_dct, thermo_dct, TEMPS, rxns=rxns)
+    assert rev_tensor.reactions == tuple(rxns)
+    assert numpy.allclose(
+        rev_tensor.values * k_equils[:3, numpy.newaxis],
+        ktp.KTPTensor.from_dct(
+            {rxn: ktp_dct[rxn] for rxn in rxns}, TEMPS).values,
+        equal_nan=True)
+
+
+def test__reaction_match():
+    """ test chemkin_io.calculator.combine.reaction_key
+        test chemkin_io.calculator.combine.reaction_index
+    """
+
+    rxn = (('H', 'O2'), ('OH', 'O'))
+    assert combine.reaction_key(rxn) == combine.reaction_key(
+        (('O', 'OH'), ('O2', 'H')))
+    assert combine.reaction_key((('H', 'H'), ('H2',))) != combine.reaction_key(
+        (('H',), ('H2',)))
+
+    mech2_dct = {
+        (('H2O2', 'H'), ('H2O', 'OH')): None,
+        (('O', 'OH'), ('H', 'O2')): None,
+        (('H', 'O2'), ('O', 'OH')): None,
+        (('OH', 'OH'), ('H2O2',)): None,
+    }
+    mech2_idx = combine.reaction_index(mech2_dct)
+    assert len(mech2_idx) == 3
+
+    # First mech2 reaction with the same species, in either direction
+    assert mech2_idx[combine.reaction_key(rxn)] == (
+        ('O', 'OH'), ('H', 'O2'))
+    assert mech2_idx[combine.reaction_key(
+        (('H', 'H2O2'), ('OH', 'H2O')))] == (('H2O2', 'H'), ('H2O', 'OH'))
+    assert mech2_idx[combine.reaction_key((('H2O2',), ('OH', 'OH')))] == (
+        ('OH', 'OH'), ('H2O2',))
+    assert combine.reaction_key((('OH',), ('H2O2',))) not in mech2_idx
+    assert all(mech2_idx[combine.reaction_key(mech2_rxn)] in mech2_dct
+               for mech2_rxn in mech2_dct)
+
+
+def test__combine_rates():
+    """ test chemkin_io.calculator.combine.combine_rates
+        test chemkin_io.calculator.combine.combine_thermo
+        test chemkin_io.calculator.combine.build_comparison
+    """
+
+    thermo_dct, _ = combine.build_thermo_name_dcts(
+        SYNGAS_MECH_STR, SYNGAS_MECH_STR, TEMPS)
+    ktp_dct, _ = combine.build_reaction_name_dcts(
+        SYNGAS_MECH_STR, SYNGAS_MECH_STR, T_REF, TEMPS, PRESSURES)
+
+    # Second mechanism: every other reaction written in reverse, except
+    # those that the mechanism also has in reverse;
+    # third mechanism: half of the reactions, plus a new one
+    rxns = list(ktp_dct)
+    key_counts = collections.Counter(map(combine.reaction_key, rxns))
+    flips = [idx % 2 and key_counts[combine.reaction_key(rxn)] == 1
+             for idx, rxn in enumerate(rxns)]
+    ktp_dct2 = {(rxn[1], rxn[0]) if flip else rxn: ktp_dct[rxn]
+                for rxn, flip in zip(rxns, flips)}
+    new_rxn = (('X',), ('Y', 'Z'))
+    ktp_dct3 = {rxn: ktp_dct[rxn] for rxn in rxns[::2]}
+    ktp_dct3[new_rxn] = {1.0: numpy.ones(len(TEMPS))}
+
+    rate_cmp = combine.combine_rates(
+        [ktp_dct, ktp_dct2, ktp_dct3], TEMPS,
+        mech_thermo_dcts=[thermo_dct, thermo_dct, None])
+    assert rate_cmp.mechanisms == ('mech1', 'mech2', 'mech3')
+    assert rate_cmp.reactions == tuple(rxns) + (new_rxn,)
+    assert rate_cmp.values.shape == (
+        3, len(rxns) + 1, len(rate_cmp.pressures), len(TEMPS))
+    ref_tensor = ktp.KTPTensor.from_dct(
+        ktp_dct, TEMPS, pressures=rate_cmp.pressures)
+    assert numpy.array_equal(
+        rate_cmp.values[0, :-1], ref_tensor.values, equal_nan=True)
+    assert numpy.isnan(rate_cmp.values[:2, -1]).all()
+    assert numpy.isnan(rate_cmp.values[2, 1:-1:2]).all()
+
+    # Same values as the pairwise comparison, with the reversed reactions
+    pair_ktp_dct = combine.mechanism_rates(
+        ktp_dct, ktp_dct2, TEMPS, mech2_thermo_dct=thermo_dct)
+    assert any(flips)
+    for rxn_idx, rxn in enumerate(rxns):
+        if key_counts[combine.reaction_key(rxn)] > 1:
+            continue
+        for pressure, ktps in pair_ktp_dct[rxn]['mech2'].items():
+            pres_idx = rate_cmp.pressures.index(pressure)
+            assert numpy.allclose(
+                rate_cmp.values[1, rxn_idx, pres_idx], ktps)
+
+    # Pairwise ratios are slices of the array
+    ratios = rate_cmp.values[0] / rate_cmp.values[2]
+    assert numpy.allclose(ratios[::2][:-1][~numpy.isnan(ratios[::2][:-1])],
+                          1.0)
+
+    thermo_cmp = combine.combine_thermo(
+        {'a': thermo_dct, 'b': {'H(4)': thermo_dct['H(4)']}})
+    assert thermo_cmp.mechanisms == ('a', 'b')
+    assert thermo_cmp.species == tuple(thermo_dct)
+    assert thermo_cmp.values.shape == (2, len(thermo_dct), 4, len(TEMPS))
+    spc_idx = thermo_cmp.species.index('H(4)')
+    assert numpy.array_equal(thermo_cmp.values[1, spc_idx],
+                             thermo_cmp.values[0, spc_idx])
+    assert numpy.isnan(numpy.delete(thermo_cmp.values[1], spc_idx, 0)).all()
+
+    # Each mechanism is evaluated once, from the mechanism strings
+    rate_cmp2, thermo_cmp2 = combine.build_comparison(
+        [SYNGAS_MECH_STR, SYNGAS_MECH_STR], T_REF, TEMPS, PRESSURES)
+    assert rate_cmp2.reactions == tuple(rxns)
+    assert numpy.array_equal(rate_cmp2.values[0], rate_cmp2.values[1],
+                             equal_nan=True)
+    assert numpy.allclose(
+        rate_cmp2.values[0], ktp.KTPTensor.from_dct(
+            ktp_dct, TEMPS, pressures=rate_cmp2.pressures).values,
+        equal_nan=True)
+    assert thermo_cmp2.species == tuple(thermo_dct)
+
+
+def test__concurrent_build():
+    """ test chemkin_io.calculator.combine.build_reaction_name_dcts
+        test chemkin_io.calculator.combine.build_thermo_name_dcts
+        with the mechanisms evaluated in separate processes
+    """
+
+    ref_ktp_dcts = combine.build_reaction_name_dcts(
+        SYNGAS_MECH_STR, FAKE1_MECH_STR, T_REF, TEMPS, PRESSURES)
+    ref_thermo_dcts = combine.build_thermo_name_dcts(
+        SYNGAS_MECH_STR, FAKE1_MECH_STR, TEMPS)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        for kwargs in ({'workers': 2}, {'executor': executor}):
+            ktp_dcts = combine.build_reaction_name_dcts(
+                SYNGAS_MECH_STR, FAKE1_MECH_STR, T_REF, TEMPS, PRESSURES,
+                **kwargs)
+            thermo_dcts = combine.build_thermo_name_dcts(
+                SYNGAS_MECH_STR, FAKE1_MECH_STR, TEMPS, **kwargs)
+
+            # Same results, in the order of the mechanisms
+            for ktp_dct, ref_ktp_dct in zip(ktp_dcts, ref_ktp_dcts):
+                assert list(ktp_dct) == list(ref_ktp_dct)
+                for rxn, pres_dct in ref_ktp_dct.items():
+                    assert list(ktp_dct[rxn]) == list(pres_dct)
+                    for pressure, ktps in pres_dct.items():
+                        assert numpy.array_equal(
+                            ktp_dct[rxn][pressure], ktps)
+            for thermo_dct, ref_thermo_dct in zip(thermo_dcts,
+                                                  ref_thermo_dcts):
+                assert list(thermo_dct) == list(ref_thermo_dct)
+                for spc, thm_vals in ref_thermo_dct.items():
+                    assert numpy.allclose(thermo_dct[spc], thm_vals)
+
+        # Lazy rates are not evaluated in other processes
+        for kwargs in ({'workers': 2}, {'executor': executor}):
+            try:
+                combine.build_reaction_name_dcts(
+                    SYNGAS_MECH_STR, FAKE1_MECH_STR, T_REF, TEMPS, PRESSURES,
+                    lazy=True, **kwargs)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError
+
+    # No second mechanism
+    _, mech2_ktp_dct = combine.build_reaction_name_dcts(
+        SYNGAS_MECH_STR, '', T_REF, TEMPS, PRESSURES, workers=2)
+    assert mech2_ktp_dct == {}
+
+    # The deprecated ignore_reverse keyword is accepted, but has no effect
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        ktp_dct, _ = combine.build_reaction_name_dcts(
+            SYNGAS_MECH_STR, '', T_REF, TEMPS, PRESSURES,
+            ignore_reverse=True)
+    assert any(issubclass(warn.category, DeprecationWarning)
+               for warn in caught)
+    assert list(ktp_dct) == list(ref_ktp_dcts[0])
+
+
 if __name__ == '__main__':
     test__compare_rates()
+    test__reverse_rates()
+    test__reaction_match()
+    test__combine_rates()
+    test__concurrent_build()
@@ -0,0 +1,158 @@
+"""
+test chemkin_io.parser.cache
+"""
+
+import os
+import tempfile
+import numpy
+from chemkin_io.parser import cache
+from chemkin_io.parser import conversion
+from chemkin_io.parser import mechanism
+from chemkin_io.calculator import combine
+
+
+# Get mechanism information
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+# Set paths
+PATH = os.path.dirname(os.path.realpath(__file__))
+DATA_PATH = os.path.join(PATH, 'data')
+SYNGAS_MECH_NAME = 'syngas_mechanism.txt'
+SYNGAS_CSV_NAME = 'syngas_species.csv'
+
+# Read mechanism and csv strings
+SYNGAS_MECH_STR = _read_file(
+    os.path.join(DATA_PATH, SYNGAS_MECH_NAME))
+SYNGAS_CSV_STR = _read_file(
+    os.path.join(DATA_PATH, SYNGAS_CSV_NAME))
+
+# Temperatures and Pressures to run
+T_REF = 1.0
+TEMPS = numpy.array([500.0, 1000.0, 1500.0])
+PRESSURES = numpy.array([1.0, 10.0])
+
+
+def _cache_files(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir)
+                  if name.endswith(cache.CACHE_EXT))
+
+
+def test__reaction_data():
+    """ test chemkin_io.parser.cache.reaction_data
+    """
+
+    ref_rxn_dct, ref_units = cache.reaction_data(SYNGAS_MECH_STR)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold_rxn_dct, cold_units = cache.reaction_data(
+            SYNGAS_MECH_STR, cache_dir=cache_dir)
+        assert len(_cache_files(cache_dir)) == 1
+        warm_rxn_dct, warm_units = cache.reaction_data(
+            SYNGAS_MECH_STR, cache_dir=cache_dir)
+        assert len(_cache_files(cache_dir)) == 1
+
+        # Different parse options are stored under different keys
+        cache.reaction_data(
+            SYNGAS_MECH_STR, remove_bad_fits=True, cache_dir=cache_dir)
+        assert len(_cache_files(cache_dir)) == 2
+
+    assert ref_units == cold_units == warm_units
+    assert list(ref_rxn_dct) == list(cold_rxn_dct) == list(warm_rxn_dct)
+    for rxn, ref_recs in ref_rxn_dct.items():
+        for ref_rec, warm_rec in zip(ref_recs, warm_rxn_dct[rxn]):
+            assert ref_rec.duplicate == warm_rec.duplicate
+            assert numpy.allclose(ref_rec.highp, warm_rec.highp)
+
+
+def test__build_dcts():
+    """ test chemkin_io.calculator.combine.build_*_dcts with a cache
+    """
+
+    ref_ktp_dct, _ = combine.build_reaction_name_dcts(
+        SYNGAS_MECH_STR, None, T_REF, TEMPS, PRESSURES)
+    ref_thm_dct, _ = combine.build_thermo_name_dcts(
+        SYNGAS_MECH_STR, SYNGAS_MECH_STR, TEMPS)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for _ in range(2):
+            ktp_dct, _ = combine.build_reaction_name_dcts(
+                SYNGAS_MECH_STR, None, T_REF, TEMPS, PRESSURES,
+                cache_dir=cache_dir)
+            thm_dct, _ = combine.build_thermo_name_dcts(
+                SYNGAS_MECH_STR, SYNGAS_MECH_STR, TEMPS,
+                cache_dir=cache_dir)
+        assert len(_cache_files(cache_dir)) == 2
+
+    assert list(thm_dct) == list(ref_thm_dct)
+    for name, ref_thm_vals in ref_thm_dct.items():
+        assert numpy.array_equal(thm_dct[name], ref_thm_vals)
+    assert list(ktp_dct) == list(ref_ktp_dct)
+    for rxn, ref_ktp in ref_ktp_dct.items():
+        assert list(ktp_dct[rxn]) == list(ref_ktp)
+        for pressure, ref_ks in ref_ktp.items():
+            assert numpy.allclose(ktp_dct[rxn][pressure], ref_ks)
+
+
+def test__evict():
+    """ test chemkin_io.parser.cache.evict
+    """
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        rxn_path = os.path.join(
+            cache_dir, cache.cache_key('rxn') + cache.CACHE_EXT)
+        thm_path = os.path.join(
+            cache_dir, cache.cache_key('thm') + cache.CACHE_EXT)
+        cache.store(rxn_path, list(range(1000)))
+        cache.store(thm_path, list(range(1000)))
+        os.utime(rxn_path, (1.0, 1.0))
+
+        # Loading an entry marks it as the most recently used one
+        assert cache.load(rxn_path) == list(range(1000))
+        cache.evict(cache_dir, max_size=os.path.getsize(rxn_path))
+        assert _cache_files(cache_dir) == [os.path.basename(rxn_path)]
+
+        cache.evict(cache_dir, max_size=0)
+        assert not _cache_files(cache_dir)
+        assert cache.load(rxn_path) is None
+
+
+def test__conversion_cache():
+    """ test chemkin_io.parser.cache.warm
+        test chemkin_io.parser.conversion.convert
+    """
+
+    ref_ich_dct = mechanism.spc_name_dct(SYNGAS_CSV_STR, 'inchi')
+    smiles_lst = list(
+        mechanism.spc_name_dct(SYNGAS_CSV_STR, 'smiles').values())
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        size_dct = cache.warm(SYNGAS_CSV_STR, cache_dir, workers=2)
+        assert size_dct == {'smiles_to_inchi': len(set(smiles_lst))}
+        assert cache.warm(SYNGAS_CSV_STR, cache_dir) == size_dct
+
+        # Species tables read the conversions from the cache
+        ich_dct = mechanism.SpeciesTable(
+            SYNGAS_CSV_STR, cache_dir=cache_dir).name_dct('inchi')
+        assert ich_dct == ref_ich_dct
+        ichs = list(ich_dct.values())
+        assert conversion.smiles_to_inchi(
+            smiles_lst, cache_dir=cache_dir) == ichs
+
+        # New conversions are added, with the ones in both directions
+        # kept apart
+        assert conversion.inchi_to_smiles(
+            ichs[:3], cache_dir=cache_dir) == conversion.inchi_to_smiles(
+                ichs[:3])
+        assert conversion.cache_size(cache_dir) == dict(
+            size_dct, inchi_to_smiles=3)
+
+
+if __name__ == '__main__':
+    test__reaction_data()
+    test__build_dcts()
+    test__evict()
+    test__conversion_cache()
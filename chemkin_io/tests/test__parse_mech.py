@@ -2,6 +2,7 @@
 """
 
 import os
+import tempfile
 import chemkin_io
 
 
@@ -19,6 +20,7 @@ SYNGAS_MECH_NAME = 'syngas_mechanism.txt'
 FAKE1_MECH_NAME = 'fake1_mech.txt'
 FAKE3_MECH_NAME = 'fake3_mech.txt'
 HEPTANE_CSV_NAME = 'heptane_species.csv'
+FAKE_CSV_NAME = 'fake_species.csv'
 
 # Read mechanism and csv files
 HEPTANE_MECH_STR = _read_file(
@@ -31,6 +33,8 @@ FAKE3_MECH_STR = _read_file(
     os.path.join(DATA_PATH, FAKE3_MECH_NAME))
 HEPTANE_CSV_STR = _read_file(
     os.path.join(DATA_PATH, HEPTANE_CSV_NAME))
+FAKE_CSV_STR = _read_file(
+    os.path.join(DATA_PATH, FAKE_CSV_NAME))
 
 
 def test__species_block():
@@ -51,6 +55,87 @@ def test__reaction_block():
     assert len(block_str.splitlines()) == 8186
 
 
+def test__iter_reactions():
+    """ test chemkin_io.parser.mechanism.iter_reactions
+    """
+
+    mech_path = os.path.join(DATA_PATH, FAKE1_MECH_NAME)
+    rxns = list(chemkin_io.parser.mechanism.iter_reactions(mech_path))
+    assert len(rxns) == 13
+    assert rxns[0].reactants == ('H2O2', 'H')
+    assert rxns[-1].products == ('S',)
+
+    rxn_strs = chemkin_io.parser.mechanism.iter_reactions(
+        mech_path, data_entry='strings')
+    block_strs = chemkin_io.parser.reaction.data_strings(
+        chemkin_io.parser.mechanism.reaction_block(FAKE1_MECH_STR))
+    assert [string.splitlines()[0] for string in rxn_strs] == [
+        string.splitlines()[0] for string in block_strs]
+
+    # Fit info comment lines are kept, and the bad fits are removed
+    bad_fit_str = (
+        'H+O2=OH+O   1.0E+13  0.0  1000.0\n'
+        '! Pressure: High      Temps:   100-1500 K,  '
+        'MeanAbsErr:   nan%,  MaxErr:  nan%\n')
+    mech_str = (bad_fit_str + 'END').join(FAKE1_MECH_STR.rsplit('END', 1))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        mech_path = os.path.join(tmp_dir, 'mech.txt')
+        with open(mech_path, 'w', encoding='utf8') as mech_file:
+            mech_file.write(mech_str)
+        for remove_bad_fits in (False, True):
+            rxn_strs = list(chemkin_io.parser.mechanism.iter_reactions(
+                mech_path, data_entry='strings',
+                remove_bad_fits=remove_bad_fits))
+            block_strs = chemkin_io.parser.reaction.data_strings(
+                chemkin_io.parser.mechanism.reaction_block(mech_str),
+                remove_bad_fits=remove_bad_fits)
+            assert [string.split() for string in rxn_strs] == [
+                string.split() for string in block_strs]
+            assert len(rxn_strs) == 13 + (not remove_bad_fits)
+        assert (chemkin_io.parser.reaction.ratek_fit_info(rxn_strs[7]) ==
+                chemkin_io.parser.reaction.ratek_fit_info(block_strs[7]))
+
+
+def test__mechanism_index():
+    """ test chemkin_io.parser.mechanism.MechanismIndex
+    """
+
+    mech_path = os.path.join(DATA_PATH, SYNGAS_MECH_NAME)
+    with chemkin_io.parser.mechanism.MechanismIndex(mech_path) as mech_idx:
+        assert set(mech_idx.block_offsets) == {
+            'species', 'thermo', 'reactions'}
+        assert mech_idx.block('thermo').strip() == (
+            chemkin_io.parser.mechanism.thermo_block(SYNGAS_MECH_STR).strip())
+        assert mech_idx.block('species').split() == list(
+            chemkin_io.parser.mechanism.species_block(
+                SYNGAS_MECH_STR).split())
+        assert mech_idx.reaction_units() == ('kcal/mole', 'moles')
+
+        rxn_strs = chemkin_io.parser.reaction.data_strings(
+            chemkin_io.parser.mechanism.reaction_block(SYNGAS_MECH_STR))
+        assert len(mech_idx) == len(rxn_strs) == 78
+        assert mech_idx.reaction(77) == rxn_strs[77]
+        assert mech_idx.reaction(3) == rxn_strs[3]
+        assert mech_idx.reaction_record(0).reactants == ('H2(2)',)
+
+        # The map is only closed once the views are released
+        view = mech_idx.reaction_view(3)
+        assert bytes(view).decode().split()[0] == rxn_strs[3].split()[0]
+        try:
+            mech_idx.close()
+        except BufferError:
+            pass
+        else:
+            raise AssertionError
+        view.release()
+        mech_idx.close()
+
+    mech_path = os.path.join(DATA_PATH, HEPTANE_MECH_NAME)
+    with chemkin_io.parser.mechanism.MechanismIndex(mech_path) as mech_idx:
+        assert mech_idx.block('thermo') is None
+        assert len(mech_idx) == 5336
+
+
 def test__thermo_block():
     """ test chemkin_io.parser.mechanism.thermo_block
     """
@@ -89,10 +174,43 @@ def test__species_inchi_dct():
     assert len(spc_ich_dct) == 1261
 
 
+def test__species_table():
+    """ test chemkin_io.parser.mechanism.SpeciesTable
+    """
+
+    spc_tbl = chemkin_io.parser.mechanism.SpeciesTable(FAKE_CSV_STR)
+    assert len(spc_tbl) == 16
+    assert spc_tbl.names[:3] == ('N2', 'Ne', 'CO')
+    assert 'HO2' in spc_tbl and 'X' not in spc_tbl
+    assert set(spc_tbl.columns) == {'name', 'smiles', 'mult'}
+
+    # Same dictionaries as spc_name_dct, built only once
+    for entry in ('inchi', 'smiles', 'mult', 'charge', 'sens'):
+        spc_dct = spc_tbl.name_dct(entry)
+        ref_spc_dct = chemkin_io.parser.mechanism.spc_name_dct(
+            FAKE_CSV_STR, entry)
+        assert list(spc_dct) == list(ref_spc_dct)
+        assert all(str(val) == str(ref_spc_dct[name])
+                   for name, val in spc_dct.items())
+        assert spc_tbl.name_dct(entry) is spc_dct
+    assert spc_tbl.name_dct('mult')['O2'] == 3
+
+    # Reverse lookups of the names
+    ich_dct = spc_tbl.entry_dct('inchi')
+    assert all(ich_dct[ich] == name
+               for name, ich in spc_tbl.name_dct('inchi').items())
+    assert spc_tbl.entry_dct('smiles')['O[O]'] == 'HO2'
+    assert chemkin_io.calculator.combine.spc_name_from_inchi(
+        spc_tbl, FAKE_CSV_STR, spc_tbl.name_dct('inchi')['OH']) == 'OH'
+
+
 if __name__ == '__main__':
     test__species_block()
     test__reaction_block()
+    test__iter_reactions()
+    test__mechanism_index()
     test__thermo_block()
     test__reaction_units()
     test__species_name_dct()
     test__species_inchi_dct()
+    test__species_table()
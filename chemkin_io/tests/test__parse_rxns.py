@@ -58,6 +58,94 @@ def test__data_objs():
     assert len(rxn_dct) == 10
 
 
+def test__parse_reactions():
+    """ test chemkin_io.parser.reaction.parse_reactions
+        test chemkin_io.parser.reaction.parse_reaction
+    """
+    rxn_recs = chemkin_io.parser.reaction.parse_reactions(
+        FAKE1_REACTION_BLOCK)
+    assert len(rxn_recs) == 13
+    assert [rec['duplicate'] for rec in rxn_recs].count(True) == 5
+
+    rec = chemkin_io.parser.reaction.parse_reaction(TROE1_REACTION)
+    assert rec['reactants'] == ('H2O2',)
+    assert rec['products'] == ('H', 'HO2')
+    assert rec['reversible']
+    assert rec['pressure_region'] == 'falloff'
+    assert numpy.allclose(rec['high_p_params'], [[2.0e12, 0.9, 48749.0]])
+    assert numpy.allclose(rec['low_p_params'], [[2.49e24, -2.3, 48749.0]])
+    assert len(rec['collider_factors']) == 8
+
+    rec = chemkin_io.parser.reaction.parse_reaction(DUP_PLOG_REACTION)
+    assert rec['duplicate']
+    assert rec['pressure_region'] == 'all'
+    assert len(rec['high_p_params']) == 2
+    assert all(len(vals) == 2 for vals in rec['plog_params'].values())
+
+    # An ionic species is not a third body
+    rec = chemkin_io.parser.reaction.parse_reaction(
+        'H3O(+)+E=H2O+H 1.0E13 0.0 0.0')
+    assert rec['reactants'] == ('H3O(+)', 'E')
+    assert rec['products'] == ('H2O', 'H')
+    assert rec['pressure_region'] == 'indep'
+
+    rec = chemkin_io.parser.reaction.parse_reaction(
+        'H3O(+)+E(+M)=H2O+H(+M) 1.0E13 0.0 0.0')
+    assert rec['reactants'] == ('H3O(+)', 'E')
+    assert rec['pressure_region'] == 'falloff'
+
+
+def test__reaction_records():
+    """ test chemkin_io.parser.reaction.data_dct
+        test chemkin_io.parser.reaction.reaction_record
+    """
+    rxn_dct = chemkin_io.parser.reaction.data_dct(
+        FAKE1_REACTION_BLOCK, data_entry='records')
+    assert list(rxn_dct.keys()) == list(FAKE1_REACTION_DCT.keys())
+
+    rxns = list(rxn_dct.values())
+    assert ([len(dup_rxns) for dup_rxns in rxns] ==
+            [1, 2, 1, 1, 1, 1, 2, 1, 1, 2])
+    assert all(rxn.duplicate and rxn.highp.shape == (1, 3)
+               for rxn in rxns[1])
+    assert rxns[3][0].troe.shape == (4,) and numpy.isnan(rxns[3][0].troe[3])
+    assert rxns[5][0].plog.shape == (12, 4)
+    assert all(rxn.plog.shape == (8, 4) for rxn in rxns[6])
+    assert numpy.all(numpy.diff(rxns[6][0].plog[:, 0]) >= 0.0)
+    assert rxns[7][0].cheb_alpha.shape == (6, 4)
+    assert numpy.allclose(rxns[7][0].cheb_limits,
+                          [300.0, 2200.0, 0.01, 98.702])
+
+    rxn = chemkin_io.parser.reaction.reaction_record(LINDEMANN_REACTION)
+    assert rxn.reactants == ('H', 'O2') and rxn.products == ('HO2',)
+    assert rxn.reversible and not rxn.duplicate
+    assert numpy.allclose(rxn.lowp, [[1.737e+19, -1.23, 0.0]])
+    assert rxn.plog is None and rxn.cheb_alpha is None
+
+
+def test__data_dct_workers():
+    """ test chemkin_io.parser.reaction.data_dct with a process pool
+    """
+    rxn_dct = chemkin_io.parser.reaction.data_dct(
+        FAKE1_REACTION_BLOCK, workers=3)
+    assert list(rxn_dct.items()) == list(FAKE1_REACTION_DCT.items())
+
+    ref_rec_dct = chemkin_io.parser.reaction.data_dct(
+        FAKE1_REACTION_BLOCK, data_entry='records')
+    rec_dct = chemkin_io.parser.reaction.data_dct(
+        FAKE1_REACTION_BLOCK, data_entry='records', workers=3)
+    assert list(rec_dct.keys()) == list(ref_rec_dct.keys())
+    for rxn, ref_recs in ref_rec_dct.items():
+        assert len(rec_dct[rxn]) == len(ref_recs)
+        for rec, ref_rec in zip(rec_dct[rxn], ref_recs):
+            assert rec.duplicate == ref_rec.duplicate
+            for field in ('highp', 'lowp', 'plog'):
+                params = getattr(rec, field)
+                ref_params = getattr(ref_rec, field)
+                assert (params is None and ref_params is None or
+                        numpy.array_equal(params, ref_params))
+
+
 def test__reactant_names():
     """ test chemkin_io.parser.reaction.reactant_names
     """
@@ -279,12 +367,12 @@ def test__chebyshev_parameters():
         't_limits': [300.0, 2200.0],
         'p_limits': [0.01, 98.702],
         'alpha_dim': [6, 4],
-        'alpha_elm': [[8.684, 8.684, 1.879e-15, 1.879e-15],
-                      [-0.2159, -0.2159, 2.929e-17, 2.929e-17],
-                      [-1.557e-15, -1.557e-15, -8.346e-31, -8.346e-31],
-                      [0.2159, 0.2159, -2.929e-17, -2.929e-17],
-                      [-2.684, -2.684, -1.879e-15, -1.879e-15],
-                      [0.2159, 0.2159, -2.929e-17, -2.929e-17]]
+        'alpha_elm': [[8.684, 0.75, -0.07486, 1.879e-15],
+                      [-0.2159, 0.09899, 0.02292, 2.929e-17],
+                      [-1.557e-15, -3.331e-16, 3.324e-17, -8.346e-31],
+                      [0.2159, -0.09899, -0.02292, -2.929e-17],
+                      [-2.684, -0.75, 0.07486, -1.879e-15],
+                      [0.2159, -0.09899, -0.02292, -2.929e-17]]
     }
 
     assert params['t_limits'] == ref_params['t_limits']
@@ -316,6 +404,9 @@ def test__ratek_fit_info():
 
 if __name__ == '__main__':
     test__data_objs()
+    test__parse_reactions()
+    test__reaction_records()
+    test__data_dct_workers()
     test__reactant_names()
     test__product_names()
     test__high_p_parameters()
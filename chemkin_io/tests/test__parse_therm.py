@@ -5,6 +5,7 @@ from __future__ import unicode_literals
 from builtins import open
 import os
 import numpy
+from ioformat import remove_whitespace
 import chemkin_io
 
 
@@ -68,6 +69,66 @@ def test__data_block():
     assert numpy.allclose(spc_block[3], ref_block[3])
 
 
+def test__coefficient_table():
+    """ test chemkin_io.parser.thermo.coefficient_table
+    """
+    thm_tbl = chemkin_io.parser.thermo.coefficient_table(
+        SYNGAS_THERMO_BLOCK)
+
+    assert len(thm_tbl.names) == 19
+    assert thm_tbl.temps.shape == (19, 3)
+    assert thm_tbl.cfts.shape == (19, 2, 7)
+
+    row = thm_tbl.index['H2O2(11)']
+    assert row == SPECIES_IDX
+    assert numpy.allclose(thm_tbl.temps[row], (200.0, 6000.0, 1000.0))
+    assert numpy.allclose(
+        thm_tbl.cfts[row, 0],
+        (4.31515, -0.000847391, 1.76404e-05, -2.26763e-08,
+         9.0895e-12, -17706.7, 3.27373))
+    assert numpy.allclose(
+        thm_tbl.cfts[row, 1],
+        (4.57977, 0.00405326, -1.29845e-06, 1.98211e-10,
+         -1.13969e-14, -18007.2, 0.664971))
+
+    # Lines without their leading spaces are realigned on column 80
+    ws_thm_tbl = chemkin_io.parser.thermo.coefficient_table(
+        remove_whitespace(SYNGAS_THERMO_BLOCK))
+    assert ws_thm_tbl.names == thm_tbl.names
+    assert numpy.array_equal(ws_thm_tbl.temps, thm_tbl.temps)
+    assert numpy.array_equal(ws_thm_tbl.cfts, thm_tbl.cfts)
+
+
+def test__blank_temp_common():
+    """ test chemkin_io.parser.thermo.coefficient_table
+        with a blank common temperature field
+    """
+
+    poly_str = (
+        'H2                TPIS78H   2               G   200.000  3500.000'
+        '              1\n'
+        ' 3.33727920E+00-4.94024731E-05 4.99456778E-07-1.79566394E-10'
+        ' 2.00255376E-14    2\n'
+        '-9.50158922E+02-3.20502331E+00 2.34433112E+00 7.98052075E-03'
+        '-1.94781510E-05    3\n'
+        ' 2.01572094E-08-7.37611761E-12-9.17935173E+02 6.83010238E-01'
+        '                   4\n')
+    assert all(len(line) == 80 for line in poly_str.splitlines())
+
+    # Block default, if there is one, or 1000 K
+    for block_str, ref_temp_common in (
+            (poly_str, 1000.0),
+            ('300.000  1200.000  5000.000\n' + poly_str, 1200.0)):
+        thm_tbl = chemkin_io.parser.thermo.coefficient_table(block_str)
+        assert thm_tbl.names == ('H2',)
+        assert numpy.allclose(
+            thm_tbl.temps[0], (200.0, 3500.0, ref_temp_common))
+        assert numpy.allclose(
+            thm_tbl.cfts[0, 0],
+            (2.34433112, 7.98052075e-03, -1.94781510e-05, 2.01572094e-08,
+             -7.37611761e-12, -9.17935173e+02, 6.83010238e-01))
+
+
 def test__species_name():
     """ test chemkin_io.parser.thermo.species_name
     """
@@ -118,6 +179,8 @@ def test__high_coefficients():
 if __name__ == '__main__':
     test__data_strings()
     test__data_block()
+    test__coefficient_table()
+    test__blank_temp_common()
     test__temp_common_default()
     test__species_name()
     test__temperatures()
@@ -6,6 +6,7 @@ from qcelemental import constants as qcc
 # physical constants
 NAVO = 6.0221409e+23
 RC = 1.98720425864083e-3  # gas constant R in kcal/mol.K
+RC2 = 82.0573  # gas constant R in cm^3.atm/mol.K
 
 # conversion factors
 CAL2KCAL = qcc.conversion_factor('cal/mol', 'kcal/mol')